@@ -0,0 +1,47 @@
+"""Create processed_commands table
+
+Revision ID: 9d4a7c31e2b8
+Revises: 5b8e2f0a7d14
+Create Date: 2026-10-18 11:40:07.518390
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4a7c31e2b8"
+down_revision: Union[str, Sequence[str], None] = "5b8e2f0a7d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "processed_commands",
+        sa.Column("command_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "processed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("command_id"),
+    )
+    op.create_index(
+        op.f("ix_processed_commands_processed_at"),
+        "processed_commands",
+        ["processed_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_processed_commands_processed_at"), table_name="processed_commands"
+    )
+    op.drop_table("processed_commands")
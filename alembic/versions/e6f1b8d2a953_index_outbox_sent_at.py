@@ -0,0 +1,40 @@
+"""Index outbox sent_at for the purge
+
+Revision ID: e6f1b8d2a953
+Revises: 9d4a7c31e2b8
+Create Date: 2026-10-18 16:05:41.203117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6f1b8d2a953"
+down_revision: Union[str, Sequence[str], None] = "9d4a7c31e2b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built without blocking the relay's inserts and updates on a live table
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_outbox_sent_at",
+            "outbox",
+            ["sent_at"],
+            unique=False,
+            postgresql_where=sa.text("sent_at IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_outbox_sent_at", table_name="outbox", postgresql_concurrently=True
+        )
@@ -0,0 +1,75 @@
+import gc
+import inspect
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Union
+
+Benchmarked = Union[Callable[[], object], Callable[[], Awaitable[object]]]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rounds: int
+    iterations: int
+    mean_ns: float
+    median_ns: float
+    min_ns: float
+    stdev_ns: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1e9 / self.median_ns if self.median_ns else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "ops_per_second": self.ops_per_second}
+
+
+def _summarize(
+    name: str, iterations: int, round_times_ns: list[int]
+) -> BenchmarkResult:
+    per_call = [elapsed / iterations for elapsed in round_times_ns]
+    return BenchmarkResult(
+        name=name,
+        rounds=len(per_call),
+        iterations=iterations,
+        mean_ns=statistics.fmean(per_call),
+        median_ns=statistics.median(per_call),
+        min_ns=min(per_call),
+        stdev_ns=statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    )
+
+
+async def measure(
+    name: str, func: Benchmarked, iterations: int, rounds: int, warmup: int = 1
+) -> BenchmarkResult:
+    """
+    Times `rounds` runs of `iterations` calls each and reports the time per call.
+    Coroutine functions are awaited inline, so the event loop adds no scheduling
+    noise beyond what the code under test does itself.
+    """
+    is_async = inspect.iscoroutinefunction(func)
+    round_times_ns = []
+    # The collector is paused while timing, as it would otherwise land in random rounds
+    gc_was_enabled = gc.isenabled()
+    try:
+        for round_index in range(warmup + rounds):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter_ns()
+            if is_async:
+                for _ in range(iterations):
+                    await func()
+            else:
+                for _ in range(iterations):
+                    func()
+            elapsed = time.perf_counter_ns() - start
+            if gc_was_enabled:
+                gc.enable()
+            if round_index >= warmup:
+                round_times_ns.append(elapsed)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return _summarize(name, iterations, round_times_ns)
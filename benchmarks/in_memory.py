@@ -0,0 +1,108 @@
+import bisect
+import hashlib
+import uuid
+from typing import AsyncIterator, Optional, Sequence
+
+from src.contexts.users.application.password_hasher import PasswordHasher
+from src.contexts.users.application.user_query_repository import UserQueryRepository
+from src.contexts.users.application.user_repository import UserRepository
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.user import User
+from src.contexts.users.domain.users_page import UserSortKey
+
+
+class InMemoryUserStore:
+    """
+    Users indexed by id and by email, plus sorted keys for keyset pagination.
+    Shared by the command and query adapters, like the users table is.
+    """
+
+    def __init__(self):
+        self.by_id: dict[uuid.UUID, User] = {}
+        self.by_email: dict[str, User] = {}
+        self.sorted_keys: dict[UserSortKey, list[tuple[str, uuid.UUID]]] = {
+            sort_key: [] for sort_key in UserSortKey
+        }
+
+    def add(self, user: User) -> bool:
+        if user.email in self.by_email:
+            return False
+        self.by_id[user.id] = user
+        self.by_email[user.email] = user
+        # UUIDs order like their canonical text form, as in Postgres
+        bisect.insort(self.sorted_keys[UserSortKey.ID], (str(user.id), user.id))
+        bisect.insort(self.sorted_keys[UserSortKey.EMAIL], (user.email, user.id))
+        return True
+
+
+def _to_read_model(user: User) -> ReadUser:
+    return ReadUser.model_construct(id=user.id, name=user.name, email=user.email)
+
+
+class InMemoryUserRepository(UserRepository):
+    def __init__(self, store: InMemoryUserStore):
+        self._store = store
+
+    async def save(self, user: User) -> None:
+        if not self._store.add(user):
+            raise ValueError(f"Duplicate email {user.email}.")
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        return self._store.by_email.get(email)
+
+    async def find_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        return {email for email in emails if email in self._store.by_email}
+
+    async def save_many(self, users: Sequence[User]) -> set[str]:
+        return {user.email for user in users if self._store.add(user)}
+
+
+class InMemoryUserQueryRepository(UserQueryRepository):
+    def __init__(self, store: InMemoryUserStore):
+        self._store = store
+
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[ReadUser]:
+        user = self._store.by_id.get(user_id)
+        return _to_read_model(user) if user else None
+
+    async def find_by_ids(self, user_ids: Sequence[uuid.UUID]) -> list[ReadUser]:
+        return [
+            _to_read_model(self._store.by_id[user_id])
+            for user_id in user_ids
+            if user_id in self._store.by_id
+        ]
+
+    async def find_page(
+        self, sort_key: UserSortKey, after: Optional[str], limit: int
+    ) -> list[ReadUser]:
+        keys = self._store.sorted_keys[sort_key]
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(keys, (after, uuid.UUID(int=2**128 - 1)))
+        return [
+            _to_read_model(self._store.by_id[user_id])
+            for _, user_id in keys[start : start + limit]  # noqa: E203
+        ]
+
+    async def stream_all(
+        self, sort_key: UserSortKey, chunk_size: int
+    ) -> AsyncIterator[list[ReadUser]]:
+        keys = self._store.sorted_keys[sort_key]
+        for start in range(0, len(keys), chunk_size):
+            yield [
+                _to_read_model(self._store.by_id[user_id])
+                for _, user_id in keys[start : start + chunk_size]  # noqa: E203
+            ]
+
+
+class Sha256PasswordHasher(PasswordHasher):
+    """
+    Stand-in for bcrypt, so that the measurements show the cost of the code
+    around hashing rather than the deliberately slow hash itself.
+    """
+
+    async def hash(self, password: str) -> str:
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return hashlib.sha256(password.encode()).hexdigest() == hashed_password
@@ -0,0 +1,144 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+import aio_pika
+from aio_pika.abc import ExchangeType
+
+ExchangeSubscriber = Callable[["InMemoryIncomingMessage"], Awaitable[None]]
+
+
+class InMemoryIncomingMessage:
+    """The parts of an aio_pika incoming message that our consumers use."""
+
+    def __init__(
+        self, message: aio_pika.Message, queue: Optional["InMemoryQueue"] = None
+    ):
+        self.body = message.body
+        self.headers = dict(message.headers or {})
+        self.content_type = message.content_type
+        self.message_id = message.message_id
+        self.correlation_id = message.correlation_id
+        self.timestamp = message.timestamp
+        self.type = message.type
+        self._queue = queue
+        self._settled = False
+
+    async def ack(self, multiple: bool = False) -> None:
+        self._settle()
+
+    async def reject(self, requeue: bool = False) -> None:
+        self._settle()
+        if requeue and self._queue is not None:
+            self._queue.put(self)
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        await self.reject(requeue=requeue)
+
+    @asynccontextmanager
+    async def process(self, requeue: bool = False):
+        try:
+            yield self
+        except Exception:
+            await self.reject(requeue=requeue)
+            raise
+        else:
+            await self.ack()
+
+    def _settle(self) -> None:
+        if self._settled:
+            raise RuntimeError("Message already acknowledged.")
+        self._settled = True
+        if self._queue is not None:
+            self._queue.task_done()
+
+
+class InMemoryQueue:
+    """A durable-queue stand-in whose `join` waits until every message is settled."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._messages: asyncio.Queue[InMemoryIncomingMessage] = asyncio.Queue()
+
+    def put(self, message: InMemoryIncomingMessage) -> None:
+        message._settled = False
+        self._messages.put_nowait(message)
+
+    def task_done(self) -> None:
+        self._messages.task_done()
+
+    def qsize(self) -> int:
+        return self._messages.qsize()
+
+    async def join(self) -> None:
+        await self._messages.join()
+
+    @asynccontextmanager
+    async def iterator(self) -> AsyncIterator[AsyncIterator[InMemoryIncomingMessage]]:
+        yield self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[InMemoryIncomingMessage]:
+        while True:
+            yield await self._messages.get()
+
+
+class InMemoryBroker:
+    """
+    Drop-in for RabbitMQPublisher that keeps queues in process: the default
+    exchange routes by queue name and named exchanges fan out to subscribers.
+    """
+
+    def __init__(self):
+        self._queues: dict[str, InMemoryQueue] = {}
+        self._subscribers: dict[str, list[ExchangeSubscriber]] = defaultdict(list)
+        self.published = 0
+
+    async def connect(self, queues: Iterable[str] = ()) -> None:
+        for queue_name in queues:
+            await self.declare_queue(queue_name)
+
+    async def close(self) -> None:
+        pass
+
+    async def warm_up(self, channels: int) -> None:
+        pass
+
+    async def declare_queue(
+        self, queue_name: str, arguments: Optional[dict] = None
+    ) -> None:
+        self.queue(queue_name)
+
+    async def declare_exchange(
+        self, exchange_name: str, exchange_type: ExchangeType = ExchangeType.FANOUT
+    ) -> None:
+        pass
+
+    def queue(self, queue_name: str) -> InMemoryQueue:
+        if queue_name not in self._queues:
+            self._queues[queue_name] = InMemoryQueue(queue_name)
+        return self._queues[queue_name]
+
+    def subscribe(self, exchange_name: str, subscriber: ExchangeSubscriber) -> None:
+        self._subscribers[exchange_name].append(subscriber)
+
+    async def publish(
+        self, message: aio_pika.Message, routing_key: str, exchange_name: str = ""
+    ) -> None:
+        self.published += 1
+        if not exchange_name:
+            queue = self.queue(routing_key)
+            queue.put(InMemoryIncomingMessage(message, queue))
+            return
+        # Every subscriber gets its own copy, like a fanout to exclusive queues
+        for subscriber in self._subscribers[exchange_name]:
+            await subscriber(InMemoryIncomingMessage(message))
+
+    async def publish_batch(
+        self,
+        messages: Iterable[aio_pika.Message],
+        routing_key: str,
+        exchange_name: str = "",
+    ) -> None:
+        for message in messages:
+            await self.publish(message, routing_key, exchange_name)
@@ -0,0 +1,350 @@
+import asyncio
+import itertools
+import statistics
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks.in_memory_broker import InMemoryBroker, InMemoryIncomingMessage
+from src.contexts.auth.infrastructure.hmac_token_service import HMACTokenService
+from src.contexts.commands.domain.command_status import CommandStatus
+from src.contexts.commands.infrastructure.command_status_publisher import (
+    COMMAND_STATUS_EVENT,
+    RabbitMQCommandStatusPublisher,
+)
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.infrastructure.cached_user_repository import UserCaches
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+)
+from src.contexts.users.infrastructure.idempotency_keys import IdempotencyKeys
+from src.contexts.users.infrastructure.password_hasher import (
+    ProcessPoolPasswordHasher,
+)
+from src.contexts.users.infrastructure.user_outbox import USER_CREATED_EVENT
+from src.contexts.users.infrastructure.user_query_repository import users_table
+from src.core.config.settings import settings
+from src.core.container import Container
+from src.core.database.database import (
+    Base,
+    create_read_engine,
+    create_write_engine,
+)
+from src.core.messaging.deduplication import CommandDeduplicator
+from src.core.messaging.retry import MessageRetrier, RetryTopology, backoff_delays
+from src.core.messaging.sharding import shard_queue_names
+from src.core.messaging.worker_pool import OrderedAckWorkerPool
+from src.core.outbox.relay import OutboxRelay
+from src.main import app
+from src.user_consumer import (
+    NON_RETRYABLE_ERRORS,
+    ConsumerDependencies,
+    consume,
+    handle_create_user,
+)
+
+PASSWORD = "a_very_strong_password"
+LAG_PROBE_INTERVAL = 0.01
+# sqlite has no LISTEN/NOTIFY, so the relay polls
+OUTBOX_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class PhaseReport:
+    name: str
+    requests: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    # How late the event loop woke a 10 ms sleeper: blocking code shows up here
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = LAG_PROBE_INTERVAL):
+        self._interval = interval
+        self.samples: list[float] = []
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+
+def _percentiles(values: list[float]) -> tuple[float, float, float]:
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value, value
+    cut_points = statistics.quantiles(values, n=100, method="inclusive")
+    return cut_points[49], cut_points[94], cut_points[98]
+
+
+async def run_phase(
+    name: str,
+    requests: int,
+    concurrency: int,
+    send: Callable[[int], Awaitable[httpx.Response]],
+    expected_status: int,
+    lag_monitor: LoopLagMonitor,
+) -> PhaseReport:
+    latencies: list[float] = []
+    errors = 0
+    indexes = iter(range(requests))
+    lag_monitor.samples.clear()
+
+    async def client_loop():
+        nonlocal errors
+        for index in indexes:
+            start = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected_status:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    p50, p95, p99 = _percentiles(latencies)
+    lag_p99 = _percentiles(lag_monitor.samples)[2]
+    return PhaseReport(
+        name=name,
+        requests=requests,
+        errors=errors,
+        seconds=seconds,
+        throughput=requests / seconds if seconds else 0.0,
+        p50_ms=p50 * 1000,
+        p95_ms=p95 * 1000,
+        p99_ms=p99 * 1000,
+        max_ms=max(latencies, default=0.0) * 1000,
+        loop_lag_p99_ms=lag_p99 * 1000,
+        loop_lag_max_ms=max(lag_monitor.samples, default=0.0) * 1000,
+    )
+
+
+async def run_load(
+    users: int, concurrency: int, consumer_concurrency: int, hashing_workers: int
+) -> list[PhaseReport]:
+    """
+    Runs the real API and the real consumer handler in this event loop:
+    POST /users until the consumer has created every user, then
+    GET /users/{id} and POST /auth/login for each of them.
+    """
+    broker = InMemoryBroker()
+    await broker.connect()
+    # The same container the lifespan would build, with the broker swapped out
+    container = Container(
+        write_engine=create_write_engine(),
+        read_engine=create_read_engine(),
+        publisher=broker,
+        password_hasher=ProcessPoolPasswordHasher(hashing_workers),
+        user_caches=UserCaches(
+            max_size=settings.USER_CACHE_MAX_SIZE,
+            ttl=settings.USER_CACHE_TTL_SECONDS,
+            negative_ttl=settings.USER_CACHE_NEGATIVE_TTL_SECONDS,
+        ),
+        email_filter=EmailExistenceFilter(
+            settings.EMAIL_FILTER_CAPACITY, settings.EMAIL_FILTER_ERROR_RATE
+        ),
+    )
+    async with container.write_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    password_hasher = container.password_hasher
+    user_caches = container.user_caches
+    api_email_filter = container.email_filter
+    consumer_email_filter = EmailExistenceFilter(
+        settings.EMAIL_FILTER_CAPACITY, settings.EMAIL_FILTER_ERROR_RATE
+    )
+    await api_email_filter.load(container.read_sessions)
+    await consumer_email_filter.load(container.sessions)
+    shards = settings.USER_CREATION_SHARDS
+    queue_names = shard_queue_names(settings.USER_CREATION_QUEUE, shards)
+    # Like the consumer: a shard is handled serially, one pool per shard
+    pool_concurrency = consumer_concurrency if shards <= 1 else 1
+    # Like both processes at startup: the phases below start warm
+    await container.warm_up(
+        read_connections=settings.DB_WARMUP_CONNECTIONS,
+        write_connections=min(
+            settings.DB_WARMUP_CONNECTIONS, pool_concurrency * len(queue_names)
+        ),
+        queues=queue_names,
+    )
+    app.state.container = container
+    app.state.idempotency_keys = IdempotencyKeys(
+        max_size=settings.IDEMPOTENCY_KEYS_MAX_SIZE,
+        ttl=settings.IDEMPOTENCY_KEYS_TTL_SECONDS,
+    )
+    command_status_store = InMemoryCommandStatusStore(
+        max_size=settings.COMMAND_STATUS_MAX_SIZE,
+        ttl=settings.COMMAND_STATUS_TTL_SECONDS,
+    )
+    app.state.command_status_store = command_status_store
+    app.state.token_service = HMACTokenService(
+        keys={"load": b"load-test-signing-key"},
+        active_key_id="load",
+        ttl=settings.AUTH_TOKEN_TTL_SECONDS,
+        cache_size=settings.AUTH_VERIFIED_TOKEN_CACHE_SIZE,
+        cache_ttl=settings.AUTH_VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+    )
+    event_handlers = [
+        user_caches.on_user_created,
+        api_email_filter.on_user_created,
+        consumer_email_filter.on_user_created,
+    ]
+
+    async def dispatch_user_event(message: InMemoryIncomingMessage) -> None:
+        async with message.process():
+            if message.type == USER_CREATED_EVENT:
+                event = UserCreated.model_validate_json(message.body)
+                for handler in event_handlers:
+                    handler(event)
+
+    broker.subscribe(settings.USER_EVENTS_EXCHANGE, dispatch_user_event)
+
+    async def dispatch_command_status(message: InMemoryIncomingMessage) -> None:
+        if message.type == COMMAND_STATUS_EVENT:
+            command_status_store.on_command_status(
+                CommandStatus.model_validate_json(message.body)
+            )
+
+    broker.subscribe(settings.COMMAND_EVENTS_EXCHANGE, dispatch_command_status)
+    status_publisher = RabbitMQCommandStatusPublisher(
+        broker, settings.COMMAND_EVENTS_EXCHANGE
+    )
+
+    deduplicator = CommandDeduplicator(
+        max_size=settings.CONSUMER_DEDUP_MAX_SIZE,
+        ttl=settings.CONSUMER_DEDUP_TTL_SECONDS,
+        use_table=False,
+    )
+    retry_delays = backoff_delays(
+        settings.CONSUMER_MAX_ATTEMPTS,
+        settings.CONSUMER_RETRY_BASE_DELAY_SECONDS,
+        settings.CONSUMER_RETRY_BACKOFF_FACTOR,
+    )
+    queues = [broker.queue(queue_name) for queue_name in queue_names]
+    pools = [
+        OrderedAckWorkerPool(
+            partial(
+                handle_create_user,
+                dependencies=ConsumerDependencies(
+                    queue=queue_name,
+                    password_hasher=password_hasher,
+                    email_filter=consumer_email_filter,
+                    deduplicator=deduplicator,
+                    # Retry queues are plain in-memory queues here: nothing
+                    # expires back
+                    retrier=MessageRetrier(
+                        broker,
+                        RetryTopology(queue_name, retry_delays),
+                        NON_RETRYABLE_ERRORS,
+                    ),
+                    status_publisher=status_publisher,
+                    sessions=container.sessions,
+                ),
+            ),
+            concurrency=pool_concurrency,
+            requeue_on_error=True,
+        )
+        for queue_name in queue_names
+    ]
+    relay = OutboxRelay(
+        container.sessions,
+        broker,
+        batch_size=settings.OUTBOX_RELAY_BATCH_SIZE,
+        poll_interval=OUTBOX_POLL_INTERVAL,
+    )
+    lag_monitor = LoopLagMonitor()
+    background = [
+        *(
+            asyncio.create_task(consume(queue, pool))
+            for queue, pool in zip(queues, pools)
+        ),
+        asyncio.create_task(relay.run()),
+        asyncio.create_task(status_publisher.run()),
+        asyncio.create_task(lag_monitor.run()),
+    ]
+
+    reports = []
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load-test"
+        ) as client:
+            emails = [f"load{i}@example.com" for i in range(users)]
+
+            reports.append(
+                await run_phase(
+                    "POST /users",
+                    users,
+                    concurrency,
+                    lambda i: client.post(
+                        "/users/",
+                        json={
+                            "name": f"Load User {i}",
+                            "email": emails[i],
+                            "password": PASSWORD,
+                        },
+                    ),
+                    expected_status=202,
+                    lag_monitor=lag_monitor,
+                )
+            )
+            consumer_start = time.perf_counter()
+            for queue, pool in zip(queues, pools):
+                await queue.join()
+                await pool.drain()
+            # Logins need the API's email filter to have seen every user event
+            while (await relay.backlog())[0]:
+                await asyncio.sleep(OUTBOX_POLL_INTERVAL)
+            print(
+                f" [*] Consumer finished {users} user(s) "
+                f"{time.perf_counter() - consumer_start:.2f}s after the last request"
+            )
+
+            async with container.read_sessions() as session:
+                user_ids = list(await session.scalars(select(users_table.c.id)))
+            ids = itertools.cycle(user_ids or [None])
+            reports.append(
+                await run_phase(
+                    "GET /users/{id}",
+                    users,
+                    concurrency,
+                    lambda i: client.get(f"/users/{next(ids)}"),
+                    expected_status=200,
+                    lag_monitor=lag_monitor,
+                )
+            )
+            reports.append(
+                await run_phase(
+                    "POST /auth/login",
+                    users,
+                    concurrency,
+                    lambda i: client.post(
+                        "/auth/login", json={"email": emails[i], "password": PASSWORD}
+                    ),
+                    expected_status=200,
+                    lag_monitor=lag_monitor,
+                )
+            )
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await container.close()
+    return reports
@@ -0,0 +1,225 @@
+"""
+Offline micro-benchmarks of the user hot path.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare results.json
+
+Use cases run against the in-memory adapters of `benchmarks.in_memory`, and
+bcrypt is replaced by SHA-256: the numbers are the cost of our own code, not
+of Postgres, RabbitMQ or the password hash.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Optional
+
+from benchmarks.harness import Benchmarked, BenchmarkResult, measure
+from benchmarks.in_memory import (
+    InMemoryUserQueryRepository,
+    InMemoryUserRepository,
+    InMemoryUserStore,
+    Sha256PasswordHasher,
+)
+from src.contexts.auth.application.login_use_case import LoginUseCase
+from src.contexts.auth.domain.login import Login
+from src.contexts.auth.infrastructure.hmac_token_service import HMACTokenService
+from src.contexts.users.application.create_user_use_case import CreateUserUseCase
+from src.contexts.users.application.get_user_use_case import GetUserUseCase
+from src.contexts.users.domain.create_user import CreateUser
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.user import User
+from src.contexts.users.infrastructure.user_mappers import (
+    user_domain_to_orm,
+    user_orm_to_domain,
+)
+from src.core.messaging.codecs import JsonCodec, MsgpackCodec
+
+PASSWORD = "a_very_strong_password"
+
+
+def build_cases(user_count: int) -> dict[str, Benchmarked]:
+    store = InMemoryUserStore()
+    password_hasher = Sha256PasswordHasher()
+    hashed_password = asyncio.run(password_hasher.hash(PASSWORD))
+    users = [
+        User(
+            name=f"User {i}",
+            email=f"user{i}@example.com",
+            hashed_password=hashed_password,
+        )
+        for i in range(user_count)
+    ]
+    for user in users:
+        store.add(user)
+
+    user_repository = InMemoryUserRepository(store)
+    get_user = GetUserUseCase(InMemoryUserQueryRepository(store))
+    create_user = CreateUserUseCase(user_repository, password_hasher)
+    login = LoginUseCase(
+        user_repository,
+        password_hasher,
+        HMACTokenService(
+            keys={"bench": b"benchmark-signing-key"},
+            active_key_id="bench",
+            ttl=3600,
+            cache_size=0,
+            cache_ttl=0,
+        ),
+    )
+
+    user_ids = itertools.cycle([user.id for user in users])
+    new_emails = (f"new{i}@example.com" for i in itertools.count())
+    logins = itertools.cycle(
+        [Login(email=user.email, password=PASSWORD) for user in users[:1000]]
+    )
+    orm_user = user_domain_to_orm(users[0])
+    read_user_data = {"id": users[0].id, "name": "User 0", "email": "user0@example.com"}
+    create_user_data = {
+        "name": "New User",
+        "email": "new.user@example.com",
+        "password": PASSWORD,
+    }
+    create_user_json = json.dumps(create_user_data)
+    create_user_command = CreateUser.model_validate(create_user_data)
+    json_codec = JsonCodec()
+    msgpack_codec = MsgpackCodec()
+    create_user_body = json_codec.encode(create_user_command)
+    create_user_msgpack = msgpack_codec.encode(create_user_command)
+
+    async def get_user_case():
+        await get_user.execute(next(user_ids))
+
+    async def create_user_case():
+        await create_user.execute(
+            CreateUser.model_construct(
+                name="New User", email=next(new_emails), password=PASSWORD
+            )
+        )
+
+    async def login_case():
+        await login.execute(next(logins))
+
+    return {
+        "get_user_use_case": get_user_case,
+        "create_user_use_case": create_user_case,
+        "login_use_case": login_case,
+        "user_domain_to_orm": lambda: user_domain_to_orm(users[0]),
+        "user_orm_to_domain": lambda: user_orm_to_domain(orm_user),
+        "read_user_validate": lambda: ReadUser.model_validate(read_user_data),
+        "create_user_validate": lambda: CreateUser.model_validate(create_user_data),
+        "create_user_validate_json": lambda: CreateUser.model_validate_json(
+            create_user_json
+        ),
+        # Per-message decode in the consumer: before codecs, and with each codec
+        "command_decode_legacy": lambda: CreateUser(
+            **json.loads(create_user_body.decode())
+        ),
+        "command_decode_json": lambda: json_codec.decode(create_user_body, CreateUser),
+        "command_decode_msgpack": lambda: msgpack_codec.decode(
+            create_user_msgpack, CreateUser
+        ),
+        "command_encode_json": lambda: json_codec.encode(create_user_command),
+        "command_encode_msgpack": lambda: msgpack_codec.encode(create_user_command),
+    }
+
+
+async def run_benchmarks(
+    cases: dict[str, Benchmarked], iterations: int, rounds: int
+) -> list[BenchmarkResult]:
+    results = []
+    for name, func in cases.items():
+        result = await measure(name, func, iterations=iterations, rounds=rounds)
+        print(
+            f"{name:<28} {result.median_ns / 1000:>10.2f} us/op "
+            f"{result.ops_per_second:>12.0f} ops/s  (±{result.stdev_ns / 1000:.2f} us)"
+        )
+        results.append(result)
+    return results
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: list[BenchmarkResult], baseline_path: str, threshold: float
+) -> bool:
+    """Prints the change against a previous run; returns False on any regression."""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit')}):")
+    ok = True
+    for result in results:
+        previous = baseline_results.get(result.name)
+        if previous is None:
+            print(f"{result.name:<28} new")
+            continue
+        change = result.median_ns / previous["median_ns"] - 1
+        regressed = change > threshold
+        ok = ok and not regressed
+        print(f"{result.name:<28} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--compare", help="JSON results of a previous run.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown (as a fraction) reported as a regression.",
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--filter", default="", help="Only run cases containing this.")
+    args = parser.parse_args()
+
+    cases = {
+        name: func
+        for name, func in build_cases(args.users).items()
+        if args.filter in name
+    }
+    results = asyncio.run(run_benchmarks(cases, args.iterations, args.rounds))
+
+    if args.output:
+        report = {
+            "meta": {
+                "commit": current_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "iterations": args.iterations,
+                "rounds": args.rounds,
+                "users": args.users,
+            },
+            "results": [result.to_dict() for result in results],
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
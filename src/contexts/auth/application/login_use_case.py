@@ -1,24 +1,32 @@
+from src.contexts.auth.application.token_service import TokenService
 from src.contexts.auth.domain.auth_token import AuthToken
 from src.contexts.auth.domain.login import Login
+from src.contexts.users.application.password_hasher import PasswordHasher
 from src.contexts.users.application.user_repository import UserRepository
 from src.core.exceptions.custom_exceptions import InvalidCredentialsException
 
 
 class LoginUseCase:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_hasher: PasswordHasher,
+        token_service: TokenService,
+    ):
         # We depend on the user repository to obtain user data
         self._user_repository = user_repository
+        self._password_hasher = password_hasher
+        self._token_service = token_service
 
     async def execute(self, command: Login) -> AuthToken:
         # Search for the user by their email
         user = await self._user_repository.find_by_email(command.email)
 
         # Verify if the user exists and if the password is correct
-        if not user or not user.verify_password(command.password):
+        if not user or not await self._password_hasher.verify(
+            command.password, user.hashed_password
+        ):
             raise InvalidCredentialsException("Invalid email or password.")
 
-        # (Simulated) Create an access token
-        # (a JWT would be generated here)
-        dummy_token = f"dummy-jwt-for-{user.name}"
-
-        return AuthToken(access_token=dummy_token, token_type="bearer")
+        # Create a signed access token carrying the identity of the user
+        return self._token_service.issue(user)
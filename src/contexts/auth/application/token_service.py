@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+from src.contexts.auth.domain.auth_token import AuthToken
+from src.contexts.auth.domain.token_claims import TokenClaims
+from src.contexts.users.domain.user import User
+
+
+class TokenService(ABC):
+    """
+    Port for issuing access tokens and verifying them without any lookup,
+    so authenticated requests do not need the database to know who is calling.
+    """
+
+    @abstractmethod
+    def issue(self, user: User) -> AuthToken:
+        raise NotImplementedError
+
+    @abstractmethod
+    def verify(self, token: str) -> TokenClaims:
+        """Returns the claims of a valid token or raises InvalidTokenException."""
+        raise NotImplementedError
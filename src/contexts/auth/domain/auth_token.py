@@ -1,6 +1,9 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class AuthToken(BaseModel):
     access_token: str
     token_type: str
+    expires_in: Optional[int] = None
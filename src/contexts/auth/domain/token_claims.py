@@ -0,0 +1,11 @@
+import uuid
+
+from pydantic import BaseModel, EmailStr
+
+
+class TokenClaims(BaseModel):
+    sub: uuid.UUID
+    name: str
+    email: EmailStr
+    iat: int
+    exp: int
@@ -3,7 +3,11 @@ from fastapi import APIRouter, Depends
 from src.contexts.auth.application.login_use_case import LoginUseCase
 from src.contexts.auth.domain.auth_token import AuthToken
 from src.contexts.auth.domain.login import Login
-from src.contexts.auth.infrastructure.auth_dependencies import get_login_use_case
+from src.contexts.auth.domain.token_claims import TokenClaims
+from src.contexts.auth.infrastructure.auth_dependencies import (
+    get_current_user_claims,
+    get_login_use_case,
+)
 
 router = APIRouter()
 
@@ -14,3 +18,8 @@ async def login(
     use_case: LoginUseCase = Depends(get_login_use_case),
 ):
     return await use_case.execute(command)
+
+
+@router.get("/me", response_model=TokenClaims)
+async def me(claims: TokenClaims = Depends(get_current_user_claims)):
+    return claims
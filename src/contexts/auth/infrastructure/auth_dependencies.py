@@ -1,11 +1,64 @@
-from fastapi import Depends
+from typing import Optional
+
+from fastapi import Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.contexts.auth.application.login_use_case import LoginUseCase
+from src.contexts.auth.application.token_service import TokenService
+from src.contexts.auth.domain.token_claims import TokenClaims
+from src.contexts.users.application.password_hasher import PasswordHasher
+from src.contexts.users.infrastructure.cached_user_repository import (
+    CachedUserRepository,
+    UserCaches,
+)
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+    FilteredUserRepository,
+)
+from src.contexts.users.infrastructure.user_dependencies import (
+    get_email_filter,
+    get_password_hasher,
+    get_user_caches,
+)
 from src.contexts.users.infrastructure.user_repository import UserRepository
-from src.core.database.database import get_db
+from src.core.dependencies.common import get_read_db
+from src.core.exceptions.custom_exceptions import InvalidTokenException
+from src.core.metrics.use_cases import timed_use_case
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def get_token_service(request: Request) -> TokenService:
+    # Built once in the application lifespan, with its keys already parsed
+    return request.app.state.token_service
+
+
+def get_login_use_case(
+    session: AsyncSession = Depends(get_read_db),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
+    caches: UserCaches = Depends(get_user_caches),
+    email_filter: EmailExistenceFilter = Depends(get_email_filter),
+    token_service: TokenService = Depends(get_token_service),
+) -> LoginUseCase:
+    # Unknown emails are answered by the filter, before the cache or the database
+    user_repository = FilteredUserRepository(
+        CachedUserRepository(UserRepository(session), caches.by_email), email_filter
+    )
+    return timed_use_case(
+        LoginUseCase(
+            user_repository=user_repository,
+            password_hasher=password_hasher,
+            token_service=token_service,
+        )
+    )
 
 
-def get_login_use_case(session: AsyncSession = Depends(get_db)) -> LoginUseCase:
-    user_repository = UserRepository(session)
-    return LoginUseCase(user_repository=user_repository)
+def get_current_user_claims(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    token_service: TokenService = Depends(get_token_service),
+) -> TokenClaims:
+    """Identifies the caller from the bearer token alone, without a database query."""
+    if credentials is None:
+        raise InvalidTokenException("Missing bearer token.")
+    return token_service.verify(credentials.credentials)
@@ -0,0 +1,148 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Callable
+
+from src.contexts.auth.application.token_service import TokenService
+from src.contexts.auth.domain.auth_token import AuthToken
+from src.contexts.auth.domain.token_claims import TokenClaims
+from src.contexts.users.domain.user import User
+from src.core.cache.lru_ttl_cache import MISSING, LRUTTLCache
+from src.core.exceptions.custom_exceptions import InvalidTokenException
+
+_ALGORITHM = "HS256"
+
+
+def parse_signing_keys(value: str) -> dict[str, bytes]:
+    """
+    Parses `kid:secret,kid:secret` into a key id to secret mapping. There is
+    no default: without a secret the API does not start.
+    """
+    if not value.strip():
+        raise ValueError("AUTH_SIGNING_KEYS is not set.")
+    keys = {}
+    for item in value.split(","):
+        key_id, separator, secret = item.strip().partition(":")
+        if not separator or not key_id or not secret:
+            raise ValueError("Signing keys must be given as `kid:secret,...`.")
+        keys[key_id] = secret.encode()
+    return keys
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class HMACTokenService(TokenService):
+    """
+    JWT (HS256) tokens signed with one of several keys, picked by the `kid`
+    header so keys can be rotated: new tokens use the active key while tokens
+    of the previous keys stay valid as long as those keys are configured.
+    """
+
+    def __init__(
+        self,
+        keys: dict[str, bytes],
+        active_key_id: str,
+        ttl: int,
+        cache_size: int,
+        cache_ttl: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        if active_key_id not in keys:
+            raise ValueError(f"Unknown active signing key '{active_key_id}'.")
+        # Keyed once here; every signature starts from a copy of these states
+        self._macs = {
+            key_id: hmac.new(secret, digestmod=hashlib.sha256)
+            for key_id, secret in keys.items()
+        }
+        self._active_key_id = active_key_id
+        self._ttl = ttl
+        self._clock = clock
+        # The encoded header is the same for every token of a key
+        self._headers = {
+            key_id: _b64encode(
+                json.dumps(
+                    {"alg": _ALGORITHM, "typ": "JWT", "kid": key_id},
+                    separators=(",", ":"),
+                ).encode()
+            )
+            for key_id in keys
+        }
+        self._header_key_ids = {
+            header.decode(): key_id for key_id, header in self._headers.items()
+        }
+        # Short-lived, so that removing a key revokes its tokens quickly
+        self._verified: LRUTTLCache[str, TokenClaims] = LRUTTLCache(
+            cache_size, ttl=cache_ttl, negative_ttl=0
+        )
+
+    def issue(self, user: User) -> AuthToken:
+        now = int(self._clock())
+        payload = {
+            "sub": str(user.id),
+            "name": user.name,
+            "email": user.email,
+            "iat": now,
+            "exp": now + self._ttl,
+        }
+        encoded_payload = _b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        )
+        signing_input = b".".join((self._headers[self._active_key_id], encoded_payload))
+        signature = self._sign(self._active_key_id, signing_input)
+        token = b".".join((signing_input, _b64encode(signature))).decode()
+        return AuthToken(access_token=token, token_type="bearer", expires_in=self._ttl)
+
+    def verify(self, token: str) -> TokenClaims:
+        claims = self._verified.get(token)
+        if claims is MISSING:
+            claims = self._decode(token)
+            self._verified.set(token, claims)
+        if claims.exp <= self._clock():
+            raise InvalidTokenException("Token has expired.")
+        return claims
+
+    def _decode(self, token: str) -> TokenClaims:
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError:
+            raise InvalidTokenException("Malformed token.")
+
+        key_id = self._header_key_ids.get(header)
+        if key_id is None:
+            key_id = self._key_id_from_header(header)
+
+        expected = self._sign(key_id, f"{header}.{payload}".encode())
+        try:
+            if not hmac.compare_digest(expected, _b64decode(signature)):
+                raise InvalidTokenException("Invalid token signature.")
+            # The payload is only parsed once its signature is known to be good
+            return TokenClaims.model_validate_json(_b64decode(payload))
+        except (binascii.Error, ValueError):
+            raise InvalidTokenException("Malformed token.")
+
+    def _key_id_from_header(self, header: str) -> str:
+        # Only reached for headers this service did not produce itself
+        try:
+            fields = json.loads(_b64decode(header))
+        except (binascii.Error, ValueError):
+            raise InvalidTokenException("Malformed token.")
+        if not isinstance(fields, dict) or fields.get("alg") != _ALGORITHM:
+            raise InvalidTokenException("Unsupported token algorithm.")
+        key_id = fields.get("kid")
+        if not isinstance(key_id, str) or key_id not in self._macs:
+            raise InvalidTokenException("Unknown signing key.")
+        return key_id
+
+    def _sign(self, key_id: str, signing_input: bytes) -> bytes:
+        mac = self._macs[key_id].copy()
+        mac.update(signing_input)
+        return mac.digest()
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+
+from src.contexts.commands.domain.command_status import CommandStatus
+
+
+class CommandStatusPublisher(ABC):
+    """
+    Port for announcing command progress to the processes that track it.
+    """
+
+    @abstractmethod
+    def publish(self, status: CommandStatus) -> None:
+        """Hands the status over without waiting for the broker."""
+        raise NotImplementedError
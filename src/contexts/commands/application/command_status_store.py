@@ -0,0 +1,28 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.contexts.commands.domain.command_status import CommandStatus
+
+
+class CommandStatusStore(ABC):
+    """
+    Port for the latest known status of recent commands.
+    """
+
+    @abstractmethod
+    def get(self, command_id: uuid.UUID) -> Optional[CommandStatus]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def wait_for_change(
+        self,
+        command_id: uuid.UUID,
+        seen: Optional[CommandStatus],
+        timeout: float,
+    ) -> Optional[CommandStatus]:
+        """
+        Returns the current status as soon as it differs from `seen`, or
+        whatever is current (possibly still `seen`) after `timeout` seconds.
+        """
+        raise NotImplementedError
@@ -0,0 +1,54 @@
+import time
+import uuid
+from typing import AsyncIterator
+
+from src.contexts.commands.application.command_status_store import CommandStatusStore
+from src.contexts.commands.domain.command_status import CommandStatus
+from src.core.exceptions.custom_exceptions import CommandNotFoundException
+
+
+class GetCommandStatusUseCase:
+    def __init__(self, store: CommandStatusStore, max_wait: float):
+        self._store = store
+        self._max_wait = max_wait
+
+    async def execute(self, command_id: uuid.UUID, wait: float = 0) -> CommandStatus:
+        """
+        Returns the command's status. With `wait`, a command that is not final
+        yet is held for up to that many seconds (capped) until it is.
+        """
+        deadline = time.monotonic() + min(wait, self._max_wait)
+        status = self._store.get(command_id)
+        while (status is None or not status.is_final) and time.monotonic() < deadline:
+            status = await self._store.wait_for_change(
+                command_id, status, deadline - time.monotonic()
+            )
+        if status is None:
+            raise CommandNotFoundException(f"Command {command_id} not found.")
+        return status
+
+    def stream(
+        self, command_id: uuid.UUID, wait: float
+    ) -> AsyncIterator[CommandStatus]:
+        """
+        Yields the current status and every change until the command is final
+        or `wait` runs out. An unknown command raises here, before anything
+        is streamed, so the caller can still answer 404.
+        """
+        status = self._store.get(command_id)
+        if status is None:
+            raise CommandNotFoundException(f"Command {command_id} not found.")
+        return self._changes(command_id, status, min(wait, self._max_wait))
+
+    async def _changes(
+        self, command_id: uuid.UUID, status: CommandStatus, wait: float
+    ) -> AsyncIterator[CommandStatus]:
+        deadline = time.monotonic() + wait
+        yield status
+        while (status is None or not status.is_final) and time.monotonic() < deadline:
+            changed = await self._store.wait_for_change(
+                command_id, status, deadline - time.monotonic()
+            )
+            if changed is not None and changed != status:
+                yield changed
+            status = changed
@@ -0,0 +1,31 @@
+import uuid
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CommandState(str, Enum):
+    PENDING = "pending"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+FINAL_STATES = frozenset({CommandState.SUCCEEDED, CommandState.FAILED})
+
+
+class CommandStatus(BaseModel):
+    command_id: uuid.UUID
+    state: CommandState
+    # Why the command failed or is being retried
+    detail: Optional[str] = None
+    # The id of what the command created, e.g. the new user
+    resource_id: Optional[uuid.UUID] = None
+    # Its natural key (the new user's email), for the API workers' own
+    # indexes; never shown to clients
+    resource_key: Optional[str] = None
+
+    @property
+    def is_final(self) -> bool:
+        return self.state in FINAL_STATES
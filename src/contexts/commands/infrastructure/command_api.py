@@ -0,0 +1,54 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+
+from src.contexts.commands.application.get_command_status_use_case import (
+    GetCommandStatusUseCase,
+)
+from src.contexts.commands.domain.command_status import CommandStatus
+from src.contexts.commands.infrastructure.command_dependencies import (
+    get_command_status_use_case,
+)
+from src.core.config.settings import settings
+
+router = APIRouter()
+
+EVENT_STREAM = "text/event-stream"
+# Meant for the API workers only
+INTERNAL_FIELDS = {"resource_key"}
+
+
+@router.get(
+    "/{command_id}",
+    response_model=CommandStatus,
+    response_model_exclude=INTERNAL_FIELDS,
+)
+async def get_command_status(
+    command_id: uuid.UUID,
+    wait: float = Query(0, ge=0),
+    accept: str = Header(""),
+    use_case: GetCommandStatusUseCase = Depends(get_command_status_use_case),
+):
+    """
+    Endpoint to retrieve the status of an accepted command.
+    With `wait`, the request is held until the command succeeds or fails
+    (or `wait` seconds pass, capped at the maximum), instead of the client
+    polling in a loop.
+    With `Accept: text/event-stream`, every change is streamed as a
+    server-sent event until the command is final.
+    """
+    if EVENT_STREAM in accept:
+        # Raises for an unknown command before the 200 of the stream is sent
+        statuses = use_case.stream(
+            command_id, wait or settings.COMMAND_STATUS_MAX_WAIT_SECONDS
+        )
+
+        async def events():
+            async for status in statuses:
+                yield f"event: status\ndata: {status.model_dump_json(exclude=INTERNAL_FIELDS)}\n\n"
+
+        return StreamingResponse(
+            events(), media_type=EVENT_STREAM, headers={"Cache-Control": "no-cache"}
+        )
+    return await use_case.execute(command_id, wait)
@@ -0,0 +1,25 @@
+from fastapi import Depends, Request
+
+from src.contexts.commands.application.get_command_status_use_case import (
+    GetCommandStatusUseCase,
+)
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.core.config.settings import settings
+from src.core.metrics.use_cases import timed_use_case
+
+
+def get_command_status_store(request: Request) -> InMemoryCommandStatusStore:
+    # One store per worker, fed by the consumers' status events
+    return request.app.state.command_status_store
+
+
+def get_command_status_use_case(
+    store: InMemoryCommandStatusStore = Depends(get_command_status_store),
+) -> GetCommandStatusUseCase:
+    return timed_use_case(
+        GetCommandStatusUseCase(
+            store, max_wait=settings.COMMAND_STATUS_MAX_WAIT_SECONDS
+        )
+    )
@@ -0,0 +1,66 @@
+import asyncio
+
+import aio_pika
+
+from src.contexts.commands.application.command_status_publisher import (
+    CommandStatusPublisher,
+)
+from src.contexts.commands.domain.command_status import CommandStatus
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+
+COMMAND_STATUS_EVENT = "command.status"
+
+
+def command_status_message(status: CommandStatus) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=status.model_dump_json().encode(),
+        content_type="application/json",
+        type=COMMAND_STATUS_EVENT,
+        correlation_id=str(status.command_id),
+    )
+
+
+class RabbitMQCommandStatusPublisher(CommandStatusPublisher):
+    """
+    Queues statuses in memory and publishes them to the fanout exchange from
+    a background task, in batches, so reporting a status never delays an ack.
+    Statuses are best effort: a lost one only makes a waiting client time out.
+    """
+
+    def __init__(
+        self, publisher: RabbitMQPublisher, exchange_name: str, batch_size: int = 100
+    ):
+        self._publisher = publisher
+        self._exchange_name = exchange_name
+        self._batch_size = batch_size
+        self._pending: asyncio.Queue[CommandStatus] = asyncio.Queue()
+
+    def publish(self, status: CommandStatus) -> None:
+        self._pending.put_nowait(status)
+
+    async def run(self) -> None:
+        while True:
+            statuses = [await self._pending.get()]
+            statuses.extend(self._take(self._batch_size - 1))
+            await self._send(statuses)
+
+    async def flush(self) -> None:
+        """Publishes whatever is still queued; called on shutdown."""
+        while not self._pending.empty():
+            await self._send(self._take(self._batch_size))
+
+    def _take(self, limit: int) -> list[CommandStatus]:
+        statuses = []
+        while len(statuses) < limit and not self._pending.empty():
+            statuses.append(self._pending.get_nowait())
+        return statuses
+
+    async def _send(self, statuses: list[CommandStatus]) -> None:
+        try:
+            await self._publisher.publish_batch(
+                (command_status_message(status) for status in statuses),
+                routing_key="",
+                exchange_name=self._exchange_name,
+            )
+        except Exception as e:
+            print(f" [!] Could not publish {len(statuses)} command status(es): {e}")
@@ -0,0 +1,64 @@
+from typing import Callable, Optional, Sequence
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage, AbstractRobustConnection
+
+from src.contexts.commands.domain.command_status import CommandStatus
+from src.contexts.commands.infrastructure.command_status_publisher import (
+    COMMAND_STATUS_EVENT,
+)
+
+CommandStatusHandler = Callable[[CommandStatus], None]
+
+
+class CommandStatusSubscriber:
+    """
+    Receives the consumers' command statuses in every API worker through a
+    private queue bound to the fanout exchange, and hands them to the store.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        exchange_name: str,
+        on_command_status: Sequence[CommandStatusHandler],
+    ):
+        self._url = url
+        self._exchange_name = exchange_name
+        self._on_command_status = list(on_command_status)
+        self._connection: Optional[AbstractRobustConnection] = None
+
+    async def start(self) -> None:
+        """Subscribes once; a failed attempt leaves nothing open, so it can be retried."""
+        if self._connection is not None:
+            return
+        connection = await aio_pika.connect_robust(self._url)
+        try:
+            channel = await connection.channel()
+            exchange = await channel.declare_exchange(
+                self._exchange_name, aio_pika.ExchangeType.FANOUT, durable=True
+            )
+            queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+            await queue.bind(exchange)
+            # Statuses are only useful while fresh, so skip the per-message ack
+            await queue.consume(self._on_message, no_ack=True)
+        except BaseException:
+            await connection.close()
+            raise
+        self._connection = connection
+
+    async def stop(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _on_message(self, message: AbstractIncomingMessage) -> None:
+        if message.type != COMMAND_STATUS_EVENT:
+            return
+        try:
+            status = CommandStatus.model_validate_json(message.body)
+        except Exception as e:
+            print(f" [!] Invalid command status: {e}")
+            return
+        for handler in self._on_command_status:
+            handler(status)
@@ -0,0 +1,95 @@
+import asyncio
+import uuid
+from collections import defaultdict
+from typing import Optional
+
+from src.contexts.commands.application.command_status_publisher import (
+    CommandStatusPublisher,
+)
+from src.contexts.commands.application.command_status_store import CommandStatusStore
+from src.contexts.commands.domain.command_status import (
+    CommandState,
+    CommandStatus,
+)
+from src.core.cache.lru_ttl_cache import MISSING, LRUTTLCache
+
+
+class InMemoryCommandStatusStore(CommandStatusStore):
+    """
+    Statuses of this worker's recent commands, bounded by size and TTL.
+    Waiters park on a future that the next update for their command
+    resolves, so a long-poll costs nothing until the consumer reports back.
+    Accepted commands are announced through the status publisher so the
+    other API workers know them too and do not answer 404 while they wait.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        status_publisher: Optional[CommandStatusPublisher] = None,
+    ):
+        self._statuses: LRUTTLCache[uuid.UUID, CommandStatus] = LRUTTLCache(
+            max_size=max_size, ttl=ttl, negative_ttl=0
+        )
+        self._waiters: defaultdict[uuid.UUID, set[asyncio.Future]] = defaultdict(set)
+        self._status_publisher = status_publisher
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def get(self, command_id: uuid.UUID) -> Optional[CommandStatus]:
+        status = self._statuses.get(command_id)
+        return None if status is MISSING else status
+
+    def accept(self, command_id: uuid.UUID) -> None:
+        """Records a command that was just enqueued and announces it."""
+        if self.get(command_id) is not None:
+            return
+        status = CommandStatus(command_id=command_id, state=CommandState.PENDING)
+        self.update(status)
+        if self._status_publisher is not None:
+            self._status_publisher.publish(status)
+
+    def update(self, status: CommandStatus) -> None:
+        current = self.get(status.command_id)
+        # Events can arrive out of order: a final state is never overwritten,
+        # and the API's pending broadcast never hides the consumer's progress
+        if current is not None and (
+            current.is_final or status.state == CommandState.PENDING
+        ):
+            return
+        self._statuses.set(status.command_id, status)
+        for waiter in self._waiters.pop(status.command_id, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def on_command_status(self, status: CommandStatus) -> None:
+        self.update(status)
+
+    async def wait_for_change(
+        self,
+        command_id: uuid.UUID,
+        seen: Optional[CommandStatus],
+        timeout: float,
+    ) -> Optional[CommandStatus]:
+        current = self.get(command_id)
+        if current != seen or timeout <= 0:
+            return current
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[command_id].add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(command_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[command_id]
+        return self.get(command_id)
+
+    def stats(self) -> dict:
+        return {**self._statuses.stats(), "waiting": self.waiting}
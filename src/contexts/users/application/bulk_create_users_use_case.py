@@ -0,0 +1,95 @@
+import uuid
+from typing import AsyncIterator, Optional
+
+from pydantic import ValidationError
+
+from src.contexts.users.application.user_command_publisher import (
+    UserCommandPublisher,
+)
+from src.contexts.users.domain.bulk_create_users_result import (
+    BulkCreateUsersResult,
+    BulkLineError,
+    line_command_id,
+)
+from src.contexts.users.domain.create_user import CreateUser
+
+
+class BulkCreateUsersUseCase:
+    """
+    Validates a stream of CreateUser records line by line and publishes the
+    valid ones in batches, so neither the body nor the commands are ever
+    held in memory as a whole. Each line is published under an id derived
+    from the batch and its line number. If a publish fails, reading stops and
+    the result says from which line on the commands may not have gone out.
+    """
+
+    def __init__(
+        self,
+        publisher: UserCommandPublisher,
+        batch_size: int,
+        max_reported_errors: int,
+    ):
+        self._publisher = publisher
+        self._batch_size = batch_size
+        self._max_reported_errors = max_reported_errors
+
+    async def execute(
+        self,
+        lines: AsyncIterator[Optional[bytes]],
+        batch_id: Optional[uuid.UUID] = None,
+    ) -> BulkCreateUsersResult:
+        """
+        `batch_id` defaults to a new one; passing the same one again (e.g. from
+        an Idempotency-Key) makes a retried upload reuse the same command ids.
+        """
+        result = BulkCreateUsersResult(
+            batch_id=batch_id or uuid.uuid4(), accepted=0, rejected=0, errors=[]
+        )
+        batch: list[CreateUser] = []
+        batch_lines: list[int] = []
+
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if line is not None and not line.strip():
+                continue
+            try:
+                if line is None:
+                    raise ValueError("Line is too long.")
+                batch.append(CreateUser.model_validate_json(line))
+                batch_lines.append(line_number)
+            except (ValidationError, ValueError) as e:
+                result.rejected += 1
+                if len(result.errors) < self._max_reported_errors:
+                    result.errors.append(
+                        BulkLineError(line=line_number, message=str(e))
+                    )
+                continue
+
+            if len(batch) >= self._batch_size:
+                if not await self._publish(result, batch, batch_lines):
+                    return result
+                batch, batch_lines = [], []
+
+        if batch:
+            await self._publish(result, batch, batch_lines)
+        return result
+
+    async def _publish(
+        self,
+        result: BulkCreateUsersResult,
+        batch: list[CreateUser],
+        batch_lines: list[int],
+    ) -> bool:
+        command_ids = [line_command_id(result.batch_id, line) for line in batch_lines]
+        try:
+            await self._publisher.publish_create_users(
+                batch, command_ids, result.batch_id
+            )
+        except Exception as e:
+            # Earlier batches are enqueued already: report them rather than a 500
+            result.failed_line = batch_lines[0]
+            result.detail = f"Could not publish from line {batch_lines[0]}: {e}"
+            return False
+        result.accepted += len(batch)
+        return True
@@ -1,3 +1,4 @@
+from src.contexts.users.application.password_hasher import PasswordHasher
 from src.contexts.users.application.user_repository import UserRepository
 from src.contexts.users.domain.create_user import CreateUser
 from src.contexts.users.domain.user import User
@@ -5,10 +6,13 @@ from src.core.exceptions.custom_exceptions import UserAlreadyExistsException
 
 
 class CreateUserUseCase:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self, user_repository: UserRepository, password_hasher: PasswordHasher
+    ):
         self._user_repository = user_repository
+        self._password_hasher = password_hasher
 
-    async def execute(self, command: CreateUser) -> None:
+    async def execute(self, command: CreateUser) -> User:
         # Verify if the user already exists
         existing_user = await self._user_repository.find_by_email(command.email)
         if existing_user:
@@ -17,7 +21,7 @@ class CreateUserUseCase:
             )
 
         # Hash the password
-        hashed_password = User.hash_password(command.password)
+        hashed_password = await self._password_hasher.hash(command.password)
 
         # Create domain user object
         new_user = User(
@@ -28,3 +32,4 @@ class CreateUserUseCase:
 
         # Save the new user
         await self._user_repository.save(new_user)
+        return new_user
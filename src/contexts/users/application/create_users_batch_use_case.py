@@ -0,0 +1,59 @@
+import asyncio
+from typing import Optional, Sequence
+
+from src.contexts.users.application.password_hasher import PasswordHasher
+from src.contexts.users.application.user_repository import UserRepository
+from src.contexts.users.domain.create_user import CreateUser
+from src.contexts.users.domain.user import User
+
+
+class CreateUsersBatchUseCase:
+    """
+    Batch variant of CreateUserUseCase: one duplicate check and one insert
+    for the whole batch instead of one of each per command.
+    """
+
+    def __init__(
+        self, user_repository: UserRepository, password_hasher: PasswordHasher
+    ):
+        self._user_repository = user_repository
+        self._password_hasher = password_hasher
+
+    async def execute(self, commands: Sequence[CreateUser]) -> list[Optional[User]]:
+        """Returns, for each command in order, the user it created or None."""
+        existing_emails = await self._user_repository.find_existing_emails(
+            list({command.email for command in commands})
+        )
+
+        # Only the first command for a free email may create the user
+        to_create: dict[str, CreateUser] = {}
+        creators: set[int] = set()
+        for index, command in enumerate(commands):
+            if command.email in existing_emails or command.email in to_create:
+                continue
+            to_create[command.email] = command
+            creators.add(index)
+
+        # Hash the whole batch at once so every hashing worker is kept busy
+        hashed_passwords = await asyncio.gather(
+            *(self._password_hasher.hash(c.password) for c in to_create.values())
+        )
+        new_users = [
+            User(name=command.name, email=command.email, hashed_password=hashed)
+            for command, hashed in zip(to_create.values(), hashed_passwords)
+        ]
+
+        inserted_emails = set()
+        if new_users:
+            # A concurrent insert may still win the race, so trust what was inserted
+            inserted_emails = await self._user_repository.save_many(new_users)
+
+        users_by_email = {user.email: user for user in new_users}
+        return [
+            (
+                users_by_email[command.email]
+                if index in creators and command.email in inserted_emails
+                else None
+            )
+            for index, command in enumerate(commands)
+        ]
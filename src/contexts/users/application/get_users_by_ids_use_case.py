@@ -0,0 +1,29 @@
+import uuid
+from typing import Sequence
+
+from src.contexts.users.application.user_query_repository import UserQueryRepository
+from src.contexts.users.domain.users_batch import UsersBatch
+from src.core.exceptions.custom_exceptions import BatchLimitExceededException
+
+
+class GetUsersByIdsUseCase:
+    def __init__(self, user_query_repository: UserQueryRepository, max_ids: int):
+        self._user_query_repository = user_query_repository
+        self._max_ids = max_ids
+
+    async def execute(self, user_ids: Sequence[uuid.UUID]) -> UsersBatch:
+        # Repeated ids are resolved once, keeping the order of first appearance
+        unique_ids = list(dict.fromkeys(user_ids))
+        if len(unique_ids) > self._max_ids:
+            raise BatchLimitExceededException(
+                f"At most {self._max_ids} user ids can be requested at once."
+            )
+
+        found = {
+            user.id: user
+            for user in await self._user_query_repository.find_by_ids(unique_ids)
+        }
+        return UsersBatch(
+            users=[found[user_id] for user_id in unique_ids if user_id in found],
+            missing=[user_id for user_id in unique_ids if user_id not in found],
+        )
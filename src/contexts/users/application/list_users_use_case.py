@@ -0,0 +1,38 @@
+from typing import AsyncIterator, Optional
+
+from src.contexts.users.application.user_page_cursor import (
+    decode_cursor,
+    encode_cursor,
+)
+from src.contexts.users.application.user_query_repository import UserQueryRepository
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.users_page import UserSortKey, UsersPage
+
+
+class ListUsersUseCase:
+    """
+    Keyset (seek) pagination: every page is an index range scan that starts
+    right after the last key of the previous page, whatever its position.
+    """
+
+    def __init__(self, user_query_repository: UserQueryRepository):
+        self._user_query_repository = user_query_repository
+
+    async def execute(
+        self, sort_key: UserSortKey, cursor: Optional[str], limit: int
+    ) -> UsersPage:
+        after = decode_cursor(cursor, sort_key) if cursor else None
+
+        # One extra row tells whether there is a next page without a COUNT
+        users = await self._user_query_repository.find_page(sort_key, after, limit + 1)
+        if len(users) <= limit:
+            return UsersPage(users=users)
+
+        users = users[:limit]
+        last_value = str(getattr(users[-1], sort_key.value))
+        return UsersPage(users=users, next_cursor=encode_cursor(sort_key, last_value))
+
+    def stream(
+        self, sort_key: UserSortKey, chunk_size: int
+    ) -> AsyncIterator[list[ReadUser]]:
+        return self._user_query_repository.stream_all(sort_key, chunk_size)
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class PasswordHasher(ABC):
+    """
+    Port for hashing and verifying passwords without blocking the event loop.
+    """
+
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        raise NotImplementedError
@@ -0,0 +1,27 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from src.contexts.users.domain.create_user import CreateUser
+
+
+class UserCommandPublisher(ABC):
+    """
+    Port for dispatching user commands to the asynchronous command side.
+    """
+
+    @abstractmethod
+    async def publish_create_user(
+        self, command: CreateUser, command_id: uuid.UUID
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def publish_create_users(
+        self,
+        commands: Sequence[CreateUser],
+        command_ids: Sequence[uuid.UUID],
+        batch_id: uuid.UUID,
+    ) -> None:
+        """Each command is published under its own id; `batch_id` correlates them."""
+        raise NotImplementedError
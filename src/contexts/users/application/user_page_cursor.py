@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+import uuid
+
+from src.contexts.users.domain.users_page import UserSortKey
+from src.core.exceptions.custom_exceptions import InvalidCursorException
+
+
+def encode_cursor(sort_key: UserSortKey, last_value: str) -> str:
+    """Builds the opaque cursor pointing right after `last_value`."""
+    payload = json.dumps({"s": sort_key.value, "v": last_value}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: UserSortKey) -> str:
+    """Returns the last seen value of a cursor issued for the same sort key."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        sort_value, last_value = payload["s"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorException("Invalid pagination cursor.")
+
+    if sort_value != sort_key.value or not isinstance(last_value, str):
+        raise InvalidCursorException("Cursor does not match the requested order.")
+    # Cursors are not signed: a forged id must not reach the query as a 500
+    if sort_key is UserSortKey.ID:
+        try:
+            uuid.UUID(last_value)
+        except ValueError:
+            raise InvalidCursorException("Invalid pagination cursor.")
+    return last_value
@@ -1,8 +1,9 @@
 import uuid
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
 
 from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.users_page import UserSortKey
 
 
 class UserQueryRepository(ABC):
@@ -13,3 +14,22 @@ class UserQueryRepository(ABC):
     @abstractmethod
     async def find_by_id(self, user_id: uuid.UUID) -> Optional[ReadUser]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_ids(self, user_ids: Sequence[uuid.UUID]) -> list[ReadUser]:
+        """Returns the users found, in no particular order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_page(
+        self, sort_key: UserSortKey, after: Optional[str], limit: int
+    ) -> list[ReadUser]:
+        """Returns up to `limit` users ordered by `sort_key`, strictly after `after`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_all(
+        self, sort_key: UserSortKey, chunk_size: int
+    ) -> AsyncIterator[list[ReadUser]]:
+        """Yields every user ordered by `sort_key`, in chunks, without buffering them all."""
+        raise NotImplementedError
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 
 from src.contexts.users.domain.user import User
 
@@ -17,3 +17,13 @@ class UserRepository(ABC):
     @abstractmethod
     async def find_by_email(self, email: str) -> Optional[User]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def find_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        """Returns the subset of `emails` that already belong to a user."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_many(self, users: Sequence[User]) -> set[str]:
+        """Saves the users, skipping emails already taken. Returns the inserted emails."""
+        raise NotImplementedError
@@ -0,0 +1,29 @@
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+def line_command_id(batch_id: uuid.UUID, line: int) -> uuid.UUID:
+    """
+    The command id of a line of a bulk upload, derived from the batch so a
+    client can look any line up on GET /commands/{id}, and so re-sending the
+    same body under the same batch republishes the same, deduplicated ids.
+    """
+    return uuid.uuid5(batch_id, str(line))
+
+
+class BulkLineError(BaseModel):
+    line: int
+    message: str
+
+
+class BulkCreateUsersResult(BaseModel):
+    batch_id: uuid.UUID
+    accepted: int
+    rejected: int
+    errors: list[BulkLineError]
+    # First line of the batch whose publish failed: that line and the ones
+    # after it may not have been enqueued, and the rest of the body was not read
+    failed_line: Optional[int] = None
+    detail: Optional[str] = None
@@ -19,6 +19,11 @@ class User:
         """Hashes a plaintext password."""
         return pwd_context.hash(password)
 
+    @staticmethod
+    def check_password(password: str, hashed_password: str) -> bool:
+        """Verifies a plaintext password against a hashed password."""
+        return pwd_context.verify(password, hashed_password)
+
     def verify_password(self, password: str) -> bool:
         """Verifies a plaintext password against the stored hashed password."""
-        return pwd_context.verify(password, self.hashed_password)
+        return User.check_password(password, self.hashed_password)
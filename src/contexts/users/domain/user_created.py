@@ -0,0 +1,9 @@
+import uuid
+
+from pydantic import BaseModel, EmailStr
+
+
+class UserCreated(BaseModel):
+    id: uuid.UUID
+    name: str
+    email: EmailStr
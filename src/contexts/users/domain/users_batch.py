@@ -0,0 +1,10 @@
+import uuid
+
+from pydantic import BaseModel
+
+from src.contexts.users.domain.read_user import ReadUser
+
+
+class UsersBatch(BaseModel):
+    users: list[ReadUser]
+    missing: list[uuid.UUID]
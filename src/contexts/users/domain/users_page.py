@@ -0,0 +1,16 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.contexts.users.domain.read_user import ReadUser
+
+
+class UserSortKey(str, Enum):
+    ID = "id"
+    EMAIL = "email"
+
+
+class UsersPage(BaseModel):
+    users: list[ReadUser]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,121 @@
+import uuid
+from typing import AsyncIterator, Optional, Sequence
+
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.users.application.user_query_repository import UserQueryRepository
+from src.contexts.users.application.user_repository import UserRepository
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.user import User
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.domain.users_page import UserSortKey
+from src.core.cache.lru_ttl_cache import MISSING, LRUTTLCache
+
+
+class UserCaches:
+    """
+    Per-process user caches shared by every request of an API worker.
+    """
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float):
+        self.by_id: LRUTTLCache[uuid.UUID, ReadUser] = LRUTTLCache(
+            max_size, ttl, negative_ttl
+        )
+        self.by_email: LRUTTLCache[str, User] = LRUTTLCache(max_size, ttl, negative_ttl)
+
+    def on_user_created(self, event: UserCreated) -> None:
+        # Prime the read side and drop any cached "unknown email" answer
+        self.by_id.set(
+            event.id, ReadUser(id=event.id, name=event.name, email=event.email)
+        )
+        self.by_email.invalidate(event.email)
+
+    def on_command_status(self, status: CommandStatus) -> None:
+        # The user was just created: drop a cached "unknown email" before
+        # user.created arrives
+        if status.state == CommandState.SUCCEEDED and status.resource_key:
+            self.by_email.invalidate(status.resource_key)
+
+    def clear(self) -> None:
+        # Cached "unknown email" answers may predate events that were missed
+        self.by_id.clear()
+        self.by_email.clear()
+
+
+class CachedUserQueryRepository(UserQueryRepository):
+    """Read-through cache decorator for the user query port."""
+
+    def __init__(
+        self,
+        repository: UserQueryRepository,
+        cache: LRUTTLCache[uuid.UUID, ReadUser],
+    ):
+        self._repository = repository
+        self._cache = cache
+
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[ReadUser]:
+        cached = self._cache.get(user_id)
+        if cached is not MISSING:
+            return cached
+        user = await self._repository.find_by_id(user_id)
+        self._cache.set(user_id, user)
+        return user
+
+    async def find_by_ids(self, user_ids: Sequence[uuid.UUID]) -> list[ReadUser]:
+        users = []
+        missed_ids = []
+        for user_id in user_ids:
+            cached = self._cache.get(user_id)
+            if cached is MISSING:
+                missed_ids.append(user_id)
+            elif cached is not None:
+                users.append(cached)
+
+        if missed_ids:
+            found = {
+                user.id: user for user in await self._repository.find_by_ids(missed_ids)
+            }
+            for user_id in missed_ids:
+                user = found.get(user_id)
+                self._cache.set(user_id, user)
+                if user is not None:
+                    users.append(user)
+        return users
+
+    async def find_page(
+        self, sort_key: UserSortKey, after: Optional[str], limit: int
+    ) -> list[ReadUser]:
+        return await self._repository.find_page(sort_key, after, limit)
+
+    def stream_all(
+        self, sort_key: UserSortKey, chunk_size: int
+    ) -> AsyncIterator[list[ReadUser]]:
+        return self._repository.stream_all(sort_key, chunk_size)
+
+
+class CachedUserRepository(UserRepository):
+    """Read-through cache decorator for email lookups on the user repository."""
+
+    def __init__(self, repository: UserRepository, cache: LRUTTLCache[str, User]):
+        self._repository = repository
+        self._cache = cache
+
+    async def save(self, user: User) -> None:
+        await self._repository.save(user)
+        self._cache.invalidate(user.email)
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        cached = self._cache.get(email)
+        if cached is not MISSING:
+            return cached
+        user = await self._repository.find_by_email(email)
+        self._cache.set(email, user)
+        return user
+
+    async def find_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        return await self._repository.find_existing_emails(emails)
+
+    async def save_many(self, users: Sequence[User]) -> set[str]:
+        inserted_emails = await self._repository.save_many(users)
+        for email in inserted_emails:
+            self._cache.invalidate(email)
+        return inserted_emails
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import struct
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.users.application.user_repository import UserRepository
+from src.contexts.users.domain.user import User
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.infrastructure.user_query_repository import users_table
+from src.core.cache.bloom_filter import BloomFilter
+from src.core.exceptions.custom_exceptions import UserAlreadyExistsException
+
+SessionFactory = Callable[[], AsyncSession]
+
+# The snapshot stores the number of users it covers ahead of the filter bits
+_SNAPSHOT_ROWS = struct.Struct("!Q")
+_REBUILD_CHUNK_SIZE = 10000
+
+
+class EmailExistenceFilter:
+    """
+    Bloom filter of the emails in the users table, kept per process.
+    A negative answer means the email is certainly not registered; until the
+    filter is loaded, and from an `invalidate` until the rebuild it requests
+    has finished, every email is reported as possibly registered.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, snapshot_path: str = ""):
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._snapshot_path = snapshot_path
+        self._bloom: Optional[BloomFilter] = None
+        # Users known to be covered, compared with the table to detect a stale snapshot
+        self._rows = 0
+        # Emails added while a load or rebuild reads the table or snapshot,
+        # replayed before the swap
+        self._pending: Optional[list[str]] = None
+        # Invalidations requested, and those covered by a completed rebuild
+        self._invalidations = 0
+        self._covered_invalidations = 0
+        self._rebuild_requested = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    @property
+    def stale(self) -> bool:
+        return self._invalidations != self._covered_invalidations
+
+    def might_exist(self, email: str) -> bool:
+        return self._bloom is None or self.stale or email in self._bloom
+
+    def invalidate(self) -> None:
+        """
+        User events may have been missed (e.g. the subscriber reconnected):
+        stops trusting negatives and asks `maintain` for a rebuild.
+        """
+        self._invalidations += 1
+        self._rebuild_requested.set()
+
+    def add(self, email: str) -> None:
+        if self._bloom is not None:
+            self._bloom.add(email)
+        if self._pending is not None:
+            self._pending.append(email)
+
+    def on_user_created(self, event: UserCreated) -> None:
+        self.add(event.email)
+        if self._pending is None:
+            self._rows += 1
+
+    def on_command_status(self, status: CommandStatus) -> None:
+        # A succeeded status reaches the API before user.created, which comes
+        # through the outbox; the row is counted when the event arrives
+        if status.state == CommandState.SUCCEEDED and status.resource_key:
+            self.add(status.resource_key)
+
+    def stats(self) -> dict[str, float]:
+        bloom = self._bloom
+        return {
+            "ready": int(bloom is not None),
+            "stale": int(self.stale),
+            "rows": self._rows,
+            "size_bytes": bloom.size_bytes if bloom else 0,
+            "false_positive_rate": bloom.false_positive_rate() if bloom else 1.0,
+        }
+
+    async def load(self, session_factory: SessionFactory) -> None:
+        """Uses the snapshot when it still matches the table, otherwise rebuilds."""
+        # Events arriving while the snapshot is read must not be lost
+        self._pending = []
+        try:
+            async with session_factory() as session:
+                rows = await session.scalar(
+                    select(func.count()).select_from(users_table)
+                )
+            snapshot = await asyncio.to_thread(self._read_snapshot)
+            if snapshot is not None and snapshot[0] == rows:
+                rows, bloom = snapshot
+                bloom.update(self._pending)
+                self._rows, self._bloom = rows, bloom
+                print(f" [*] Email filter loaded from snapshot ({rows} users)")
+                return
+            await self.rebuild(session_factory)
+        finally:
+            self._pending = None
+
+    async def rebuild(self, session_factory: SessionFactory) -> None:
+        """
+        Streams every email into a fresh filter and swaps it in; the current
+        filter keeps answering in the meantime.
+        """
+        invalidations = self._invalidations
+        if self._pending is None:
+            self._pending = []
+        try:
+            async with session_factory() as session:
+                expected = await session.scalar(
+                    select(func.count()).select_from(users_table)
+                )
+                # Leave headroom so the error rate holds while users keep signing up
+                bloom = BloomFilter(max(self._capacity, expected * 2), self._error_rate)
+                rows = 0
+                result = await session.stream(
+                    select(users_table.c.email).execution_options(
+                        yield_per=_REBUILD_CHUNK_SIZE
+                    )
+                )
+                async for partition in result.partitions():
+                    bloom.update(email for (email,) in partition)
+                    rows += len(partition)
+            bloom.update(self._pending)
+            self._bloom, self._rows = bloom, rows
+            # Anything missed before this rebuild started is in the table now
+            self._covered_invalidations = invalidations
+        finally:
+            self._pending = None
+
+        print(
+            f" [*] Email filter rebuilt with {rows} users, "
+            f"estimated false-positive rate {bloom.false_positive_rate():.4f}"
+        )
+        await self.save_snapshot()
+
+    async def maintain(
+        self, session_factory: SessionFactory, rebuild_interval: float
+    ) -> None:
+        """
+        Loads the filter, then rebuilds it periodically to drop drift, and
+        whenever `invalidate` asks for it.
+        """
+        try:
+            await self.load(session_factory)
+        except Exception as e:
+            print(f" [!] Could not load the email filter: {e}")
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._rebuild_requested.wait(),
+                    rebuild_interval if rebuild_interval > 0 else None,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._rebuild_requested.clear()
+            try:
+                await self.rebuild(session_factory)
+            except Exception as e:
+                print(f" [!] Could not rebuild the email filter: {e}")
+
+    async def save_snapshot(self) -> None:
+        if self._snapshot_path and self._bloom is not None:
+            await asyncio.to_thread(self._write_snapshot, self._rows, self._bloom)
+
+    def _read_snapshot(self) -> Optional[tuple[int, BloomFilter]]:
+        if not self._snapshot_path or not os.path.exists(self._snapshot_path):
+            return None
+        try:
+            with open(self._snapshot_path, "rb") as snapshot:
+                data = snapshot.read()
+            (rows,) = _SNAPSHOT_ROWS.unpack_from(data)
+            header_size = _SNAPSHOT_ROWS.size
+            return rows, BloomFilter.from_bytes(data[header_size:])
+        except (OSError, ValueError, struct.error) as e:
+            print(f" [!] Ignoring unreadable email filter snapshot: {e}")
+            return None
+
+    def _write_snapshot(self, rows: int, bloom: BloomFilter) -> None:
+        # Written aside and renamed, so readers never see a partial file
+        temporary_path = f"{self._snapshot_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as snapshot:
+            snapshot.write(_SNAPSHOT_ROWS.pack(rows))
+            snapshot.write(bloom.to_bytes())
+        os.replace(temporary_path, self._snapshot_path)
+
+
+class FilteredUserRepository(UserRepository):
+    """Skips email lookups the filter proves unnecessary."""
+
+    def __init__(self, repository: UserRepository, email_filter: EmailExistenceFilter):
+        self._repository = repository
+        self._filter = email_filter
+
+    async def save(self, user: User) -> None:
+        try:
+            await self._repository.save(user)
+        except UserAlreadyExistsException:
+            # The filter missed this email; do not trust that negative again
+            self._filter.add(user.email)
+            raise
+        self._filter.add(user.email)
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        if not self._filter.might_exist(email):
+            return None
+        return await self._repository.find_by_email(email)
+
+    async def find_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        candidates = [email for email in emails if self._filter.might_exist(email)]
+        if not candidates:
+            return set()
+        return await self._repository.find_existing_emails(candidates)
+
+    async def save_many(self, users: Sequence[User]) -> set[str]:
+        inserted_emails = await self._repository.save_many(users)
+        for email in inserted_emails:
+            self._filter.add(email)
+        return inserted_emails
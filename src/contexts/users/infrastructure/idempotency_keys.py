@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import uuid
+from typing import Optional
+
+from src.core.cache.lru_ttl_cache import MISSING, LRUTTLCache
+
+# Fixed, so every API worker derives the same command id from the same key
+IDEMPOTENCY_NAMESPACE = uuid.UUID("0b3f6c2e-5d1a-4f7e-9c84-2a6e1d9b7f30")
+
+
+def idempotent_command_id(idempotency_key: str) -> uuid.UUID:
+    """
+    The command id for a client key. Retries that reach different workers
+    still carry the same id, which the consumer deduplicates on.
+    """
+    return uuid.uuid5(IDEMPOTENCY_NAMESPACE, idempotency_key)
+
+
+def request_fingerprint(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+class IdempotencyClaim:
+    """
+    The first request seen for a key: its fingerprint and, once its publish
+    has finished, whether the command was enqueued.
+    """
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.published: Optional[bool] = None
+        self._settled = asyncio.Event()
+
+    def settle(self, published: bool) -> None:
+        self.published = published
+        self._settled.set()
+
+    async def wait(self) -> bool:
+        """Waits for the first request's publish and returns whether it went out."""
+        await self._settled.wait()
+        return self.published
+
+
+class IdempotencyKeys:
+    """
+    Idempotency keys this worker accepted recently, so that a retried POST
+    returns the original answer instead of enqueueing the command again.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._claims: LRUTTLCache[str, IdempotencyClaim] = LRUTTLCache(
+            max_size=max_size, ttl=ttl, negative_ttl=0
+        )
+
+    def claim(
+        self, idempotency_key: str, fingerprint: str
+    ) -> Optional[IdempotencyClaim]:
+        """
+        Records the key as in flight and returns None if it is new; otherwise
+        returns the claim of the request that first used it. A retry that
+        arrives while the first is still publishing waits on that claim.
+        """
+        previous = self._claims.get(idempotency_key)
+        if previous is not MISSING:
+            return previous
+        self._claims.set(idempotency_key, IdempotencyClaim(fingerprint))
+        return None
+
+    def accept(self, idempotency_key: str) -> None:
+        """Marks the key's command as enqueued and wakes the retries waiting on it."""
+        claim = self._claims.get(idempotency_key)
+        if claim is not MISSING:
+            claim.settle(True)
+
+    def release(self, idempotency_key: str) -> None:
+        """
+        Forgets a key whose command could not be published, so it can be
+        retried, and tells the waiting retries to publish it themselves.
+        """
+        claim = self._claims.get(idempotency_key)
+        self._claims.invalidate(idempotency_key)
+        if claim is not MISSING:
+            claim.settle(False)
+
+    def stats(self) -> dict:
+        return self._claims.stats()
@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from src.contexts.users.application.password_hasher import PasswordHasher
+from src.contexts.users.domain.user import User
+from src.core.metrics.registry import registry
+
+T = TypeVar("T")
+
+WARM_UP_PASSWORD = "warm-up"
+
+operation_seconds = registry.histogram(
+    "password_hasher_duration_seconds",
+    "Time of each hash or verify, spent inside a worker or waiting for one.",
+    ["operation", "phase"],
+)
+
+
+def _timed_call(func: Callable[..., T], *args) -> tuple[T, float]:
+    """Runs inside a worker process and reports how long the bcrypt work took."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+@dataclass
+class PasswordHasherMetrics:
+    workers: int
+    in_flight: int = 0
+    completed: int = 0
+    hash_seconds_total: float = 0.0
+    wait_seconds_total: float = 0.0
+    last_hash_seconds: float = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Operations submitted but still waiting for a free worker."""
+        return max(0, self.in_flight - self.workers)
+
+    @property
+    def average_hash_seconds(self) -> float:
+        return self.hash_seconds_total / self.completed if self.completed else 0.0
+
+
+class ProcessPoolPasswordHasher(PasswordHasher):
+    """
+    Runs bcrypt in a pool of worker processes, so the event loop keeps serving
+    other requests while a password is hashed or verified.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.metrics = PasswordHasherMetrics(workers=max_workers)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", User.hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", User.check_password, password, hashed_password)
+
+    async def warm_up(self) -> None:
+        """
+        Starts every worker process and has it import passlib and hash once,
+        so the first real passwords do not pay for spawning and loading bcrypt.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor, User.hash_password, WARM_UP_PASSWORD
+                )
+                for _ in range(self.metrics.workers)
+            )
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _run(self, operation: str, func: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        self.metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            result, hash_seconds = await loop.run_in_executor(
+                self._executor, _timed_call, func, *args
+            )
+        finally:
+            self.metrics.in_flight -= 1
+
+        wait_seconds = time.perf_counter() - start - hash_seconds
+        self.metrics.completed += 1
+        self.metrics.hash_seconds_total += hash_seconds
+        self.metrics.wait_seconds_total += wait_seconds
+        self.metrics.last_hash_seconds = hash_seconds
+        operation_seconds.labels(operation, "hash").observe(hash_seconds)
+        operation_seconds.labels(operation, "wait").observe(wait_seconds)
+        return result
@@ -0,0 +1,43 @@
+from typing import Optional, Sequence
+
+from src.contexts.users.application.password_hasher import PasswordHasher
+from src.contexts.users.application.user_repository import UserRepository
+from src.contexts.users.domain.user import User
+from src.core.messaging.consumer_metrics import timed_stage
+
+
+class StageTimedUserRepository(UserRepository):
+    """Times repository calls as the consumer's duplicate_check and insert stages."""
+
+    def __init__(self, repository: UserRepository):
+        self._repository = repository
+
+    async def save(self, user: User) -> None:
+        with timed_stage("insert"):
+            await self._repository.save(user)
+
+    async def find_by_email(self, email: str) -> Optional[User]:
+        with timed_stage("duplicate_check"):
+            return await self._repository.find_by_email(email)
+
+    async def find_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        with timed_stage("duplicate_check"):
+            return await self._repository.find_existing_emails(emails)
+
+    async def save_many(self, users: Sequence[User]) -> set[str]:
+        with timed_stage("insert"):
+            return await self._repository.save_many(users)
+
+
+class StageTimedPasswordHasher(PasswordHasher):
+    """Times password hashing as the consumer's hash stage."""
+
+    def __init__(self, password_hasher: PasswordHasher):
+        self._password_hasher = password_hasher
+
+    async def hash(self, password: str) -> str:
+        with timed_stage("hash"):
+            return await self._password_hasher.hash(password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._password_hasher.verify(password, hashed_password)
@@ -1,37 +1,181 @@
 import uuid
+from typing import Optional, Union
 
-import aio_pika
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
+from src.contexts.commands.infrastructure.command_dependencies import (
+    get_command_status_store,
+)
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.contexts.users.application.bulk_create_users_use_case import (
+    BulkCreateUsersUseCase,
+)
 from src.contexts.users.application.get_user_use_case import GetUserUseCase
+from src.contexts.users.application.get_users_by_ids_use_case import (
+    GetUsersByIdsUseCase,
+)
+from src.contexts.users.application.list_users_use_case import ListUsersUseCase
+from src.contexts.users.application.user_command_publisher import (
+    UserCommandPublisher,
+)
+from src.contexts.users.domain.bulk_create_users_result import (
+    BulkCreateUsersResult,
+)
 from src.contexts.users.domain.create_user import CreateUser
 from src.contexts.users.domain.read_user import ReadUser
-from src.contexts.users.infrastructure.user_dependencies import get_user_query_use_case
+from src.contexts.users.domain.users_batch import UsersBatch
+from src.contexts.users.domain.users_page import UserSortKey, UsersPage
+from src.contexts.users.infrastructure.idempotency_keys import (
+    IdempotencyKeys,
+    idempotent_command_id,
+    request_fingerprint,
+)
+from src.contexts.users.infrastructure.user_dependencies import (
+    get_bulk_create_users_use_case,
+    get_idempotency_keys,
+    get_list_users_use_case,
+    get_user_command_publisher,
+    get_user_query_use_case,
+    get_users_by_ids_use_case,
+)
 from src.core.config.settings import settings
+from src.core.exceptions.custom_exceptions import IdempotencyKeyReusedException
+from src.core.streaming.ndjson import iter_ndjson_lines
 
 router = APIRouter()
 
 
 @router.post("/", status_code=status.HTTP_202_ACCEPTED)
-async def create_user(command: CreateUser):
+async def create_user(
+    command: CreateUser,
+    publisher: UserCommandPublisher = Depends(get_user_command_publisher),
+    idempotency_keys: IdempotencyKeys = Depends(get_idempotency_keys),
+    status_store: InMemoryCommandStatusStore = Depends(get_command_status_store),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=255
+    ),
+):
     """
     Endpoint to accept the request for creating a user.
-    Publishes the command to a RabbitMQ queue for asynchronous processing.
-    """
-    connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
-    async with connection:
-        channel = await connection.channel()
-        # Ensure that the queue exists
-        queue_name = "user_creation_queue"
-        await channel.declare_queue(queue_name, durable=True)
-
-        # Serialize the command and publish it
-        message_body = command.model_dump_json().encode()
-        await channel.default_exchange.publish(
-            aio_pika.Message(body=message_body),
-            routing_key=queue_name,
-        )
-    return {"message": "User creation request accepted."}
+    Publishes the command to a RabbitMQ queue for asynchronous processing;
+    the returned `command_id` identifies it in the consumer's logs, and
+    `GET /commands/{command_id}` reports when it succeeded or failed.
+    Retrying with the same `Idempotency-Key` returns the same `command_id`
+    and does not enqueue the command again; a retry that arrives while the
+    first request is still publishing waits for it, and publishes the
+    command itself if the first publish failed.
+    """
+    if idempotency_key is None:
+        command_id = uuid.uuid4()
+        await publisher.publish_create_user(command, command_id)
+        status_store.accept(command_id)
+        return _accepted(command_id)
+
+    command_id = idempotent_command_id(idempotency_key)
+    fingerprint = request_fingerprint(command.model_dump_json())
+    while (
+        previous := idempotency_keys.claim(idempotency_key, fingerprint)
+    ) is not None:
+        if previous.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedException(
+                "Idempotency-Key was already used with a different request."
+            )
+        # Only answer 202 once the first request's command is really enqueued;
+        # if its publish failed, the key was released and this retry claims it
+        if await previous.wait():
+            return _accepted(command_id)
+    try:
+        await publisher.publish_create_user(command, command_id)
+    except BaseException:
+        # Also on cancellation, so waiting retries are never left hanging
+        idempotency_keys.release(idempotency_key)
+        raise
+    status_store.accept(command_id)
+    idempotency_keys.accept(idempotency_key)
+    return _accepted(command_id)
+
+
+def _accepted(command_id: uuid.UUID) -> dict:
+    return {
+        "message": "User creation request accepted.",
+        "command_id": command_id,
+        "status_url": f"/commands/{command_id}",
+    }
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=BulkCreateUsersResult,
+)
+async def bulk_create_users(
+    request: Request,
+    response: Response,
+    use_case: BulkCreateUsersUseCase = Depends(get_bulk_create_users_use_case),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=255
+    ),
+):
+    """
+    Endpoint to accept many user creation requests as an NDJSON body
+    (one CreateUser object per line). The body is validated while it is
+    being received and valid lines are published in batches.
+    Line `n` is published as command `uuid5(batch_id, str(n))`. With an
+    `Idempotency-Key` the `batch_id` is derived from it, so re-sending the
+    same body republishes the same command ids and the consumer skips the
+    ones it already processed. If a publish fails, the partial result is
+    returned with a 503 and `failed_line`.
+    """
+    lines = iter_ndjson_lines(request.stream(), settings.USERS_BULK_MAX_LINE_BYTES)
+    batch_id = None
+    if idempotency_key is not None:
+        batch_id = idempotent_command_id(idempotency_key)
+    result = await use_case.execute(lines, batch_id)
+    if result.failed_line is not None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
+
+
+@router.get("/", response_model=Union[UsersBatch, UsersPage])
+async def list_users(
+    ids: Optional[list[uuid.UUID]] = Query(None),
+    order_by: UserSortKey = UserSortKey.ID,
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        settings.USERS_PAGE_DEFAULT_LIMIT, ge=1, le=settings.USERS_PAGE_MAX_LIMIT
+    ),
+    batch_use_case: GetUsersByIdsUseCase = Depends(get_users_by_ids_use_case),
+    list_use_case: ListUsersUseCase = Depends(get_list_users_use_case),
+):
+    """
+    With `ids` (`?ids=...&ids=...`), retrieves those users in one query:
+    they are returned in request order and unknown ids are listed in `missing`.
+    Otherwise, returns a page of users ordered by `order_by`; send `next_cursor`
+    back as `cursor` to get the following page.
+    """
+    if ids:
+        return await batch_use_case.execute(ids)
+    return await list_use_case.execute(order_by, cursor, limit)
+
+
+@router.get("/stream")
+async def stream_users(
+    order_by: UserSortKey = UserSortKey.ID,
+    use_case: ListUsersUseCase = Depends(get_list_users_use_case),
+):
+    """
+    Endpoint to export every user as NDJSON (one user per line).
+    Rows are written as they are read from a server-side cursor.
+    """
+
+    async def ndjson_lines():
+        async for users in use_case.stream(order_by, settings.USERS_STREAM_CHUNK_SIZE):
+            yield "".join(user.model_dump_json() + "\n" for user in users)
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{user_id}", response_model=ReadUser)
@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from collections import defaultdict
+from typing import Optional, Sequence
+
+import aio_pika
+
+from src.contexts.users.application.user_command_publisher import (
+    UserCommandPublisher,
+)
+from src.contexts.users.domain.create_user import CreateUser
+from src.core.messaging.codecs import SCHEMA_VERSION_HEADER, MessageCodec
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+from src.core.messaging.sharding import shard_for, shard_key, shard_queue_name
+from src.core.messaging.tracing import trace_properties
+
+# Bump when CreateUser changes incompatibly, after every consumer understands it
+CREATE_USER_SCHEMA_VERSION = 1
+
+
+class RabbitMQUserCommandPublisher(UserCommandPublisher):
+    """
+    With `shards` above 1, each command goes to the shard queue of its email,
+    so every command for an email is handled by the one consumer of that
+    shard, in order, and never races another consumer on the same address.
+    """
+
+    def __init__(
+        self,
+        publisher: RabbitMQPublisher,
+        queue_name: str,
+        codec: MessageCodec,
+        shards: int = 1,
+    ):
+        self._publisher = publisher
+        self._queue_name = queue_name
+        self._codec = codec
+        self._shards = shards
+
+    def queue_for(self, email: str) -> str:
+        shard = shard_for(shard_key(email), self._shards)
+        return shard_queue_name(self._queue_name, shard, self._shards)
+
+    async def publish_create_user(
+        self, command: CreateUser, command_id: uuid.UUID
+    ) -> None:
+        await self._publisher.publish(
+            self._to_message(command, command_id), self.queue_for(command.email)
+        )
+
+    async def publish_create_users(
+        self,
+        commands: Sequence[CreateUser],
+        command_ids: Sequence[uuid.UUID],
+        batch_id: uuid.UUID,
+    ) -> None:
+        # One batch per shard, each on its own channel, confirmed concurrently
+        by_queue: dict[str, list[aio_pika.Message]] = defaultdict(list)
+        for command, command_id in zip(commands, command_ids):
+            by_queue[self.queue_for(command.email)].append(
+                self._to_message(command, command_id, batch_id)
+            )
+        await asyncio.gather(
+            *(
+                self._publisher.publish_batch(messages, queue_name)
+                for queue_name, messages in by_queue.items()
+            )
+        )
+
+    def _to_message(
+        self,
+        command: CreateUser,
+        command_id: uuid.UUID,
+        correlation_id: Optional[uuid.UUID] = None,
+    ) -> aio_pika.Message:
+        properties = trace_properties(command_id, correlation_id)
+        properties["headers"][SCHEMA_VERSION_HEADER] = CREATE_USER_SCHEMA_VERSION
+        return aio_pika.Message(
+            body=self._codec.encode(command),
+            content_type=self._codec.content_type,
+            **properties,
+        )
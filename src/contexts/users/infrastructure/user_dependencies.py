@@ -1,11 +1,109 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.contexts.users.application.bulk_create_users_use_case import (
+    BulkCreateUsersUseCase,
+)
 from src.contexts.users.application.get_user_use_case import GetUserUseCase
-from src.contexts.users.infrastructure.user_repository import UserRepository
-from src.core.database.database import get_db
+from src.contexts.users.application.get_users_by_ids_use_case import (
+    GetUsersByIdsUseCase,
+)
+from src.contexts.users.application.list_users_use_case import ListUsersUseCase
+from src.contexts.users.application.password_hasher import PasswordHasher
+from src.contexts.users.application.user_command_publisher import (
+    UserCommandPublisher,
+)
+from src.contexts.users.infrastructure.cached_user_repository import (
+    CachedUserQueryRepository,
+    UserCaches,
+)
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+)
+from src.contexts.users.infrastructure.idempotency_keys import IdempotencyKeys
+from src.contexts.users.infrastructure.user_command_publisher import (
+    RabbitMQUserCommandPublisher,
+)
+from src.contexts.users.infrastructure.user_query_repository import (
+    UserQueryRepository,
+)
+from src.core.config.settings import settings
+from src.core.container import Container
+from src.core.dependencies.common import (
+    get_container,
+    get_rabbitmq_publisher,
+    get_read_db,
+)
+from src.core.messaging.codecs import codec_named
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+from src.core.metrics.use_cases import timed_use_case
 
 
-def get_user_query_use_case(session: AsyncSession = Depends(get_db)) -> GetUserUseCase:
-    repository = UserRepository(session)
-    return GetUserUseCase(repository)
+def get_user_caches(container: Container = Depends(get_container)) -> UserCaches:
+    # The caches live as long as the worker, and are kept fresh by user events
+    return container.user_caches
+
+
+def get_email_filter(
+    container: Container = Depends(get_container),
+) -> EmailExistenceFilter:
+    return container.email_filter
+
+
+def get_idempotency_keys(request: Request) -> IdempotencyKeys:
+    return request.app.state.idempotency_keys
+
+
+def get_user_query_use_case(
+    session: AsyncSession = Depends(get_read_db),
+    caches: UserCaches = Depends(get_user_caches),
+) -> GetUserUseCase:
+    repository = CachedUserQueryRepository(UserQueryRepository(session), caches.by_id)
+    return timed_use_case(GetUserUseCase(repository))
+
+
+def get_users_by_ids_use_case(
+    session: AsyncSession = Depends(get_read_db),
+    caches: UserCaches = Depends(get_user_caches),
+) -> GetUsersByIdsUseCase:
+    repository = CachedUserQueryRepository(UserQueryRepository(session), caches.by_id)
+    return timed_use_case(
+        GetUsersByIdsUseCase(repository, max_ids=settings.USERS_BATCH_MAX_IDS)
+    )
+
+
+def get_list_users_use_case(
+    session: AsyncSession = Depends(get_read_db),
+) -> ListUsersUseCase:
+    # Listings are not cached: they scan ranges rather than hot single users
+    return timed_use_case(ListUsersUseCase(UserQueryRepository(session)))
+
+
+def get_user_command_publisher(
+    publisher: RabbitMQPublisher = Depends(get_rabbitmq_publisher),
+) -> UserCommandPublisher:
+    return RabbitMQUserCommandPublisher(
+        publisher,
+        settings.USER_CREATION_QUEUE,
+        codec_named(settings.MESSAGE_CODEC),
+        shards=settings.USER_CREATION_SHARDS,
+    )
+
+
+def get_bulk_create_users_use_case(
+    publisher: UserCommandPublisher = Depends(get_user_command_publisher),
+) -> BulkCreateUsersUseCase:
+    return timed_use_case(
+        BulkCreateUsersUseCase(
+            publisher,
+            batch_size=settings.USERS_BULK_PUBLISH_BATCH_SIZE,
+            max_reported_errors=settings.USERS_BULK_MAX_REPORTED_ERRORS,
+        )
+    )
+
+
+def get_password_hasher(
+    container: Container = Depends(get_container),
+) -> PasswordHasher:
+    # The hashing process pool is owned by the container
+    return container.password_hasher
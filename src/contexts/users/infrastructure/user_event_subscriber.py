@@ -0,0 +1,74 @@
+from typing import Callable, Optional, Sequence
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage, AbstractRobustConnection
+
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.infrastructure.user_outbox import USER_CREATED_EVENT
+
+UserCreatedHandler = Callable[[UserCreated], None]
+ReconnectHandler = Callable[[], None]
+
+
+class UserEventSubscriber:
+    """
+    Receives user events in every process through a private queue bound to
+    the fanout exchange, so each one can keep its in-process state fresh.
+    The queue is deleted when the connection drops, so events published in
+    the meantime are lost: `on_reconnect` handlers must resynchronise.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        exchange_name: str,
+        on_user_created: Sequence[UserCreatedHandler],
+        on_reconnect: Sequence[ReconnectHandler] = (),
+    ):
+        self._url = url
+        self._exchange_name = exchange_name
+        self._on_user_created = list(on_user_created)
+        self._on_reconnect = list(on_reconnect)
+        self._connection: Optional[AbstractRobustConnection] = None
+
+    async def start(self) -> None:
+        """Subscribes once; a failed attempt leaves nothing open, so it can be retried."""
+        if self._connection is not None:
+            return
+        connection = await aio_pika.connect_robust(self._url)
+        try:
+            channel = await connection.channel()
+            exchange = await channel.declare_exchange(
+                self._exchange_name, aio_pika.ExchangeType.FANOUT, durable=True
+            )
+            # Server-named queue that disappears with this worker
+            queue = await channel.declare_queue(exclusive=True, auto_delete=True)
+            await queue.bind(exchange)
+            await queue.consume(self._on_message)
+        except BaseException:
+            await connection.close()
+            raise
+        connection.reconnect_callbacks.add(self._reconnected)
+        self._connection = connection
+
+    async def stop(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def _reconnected(self, *args) -> None:
+        print(" [!] User event subscriber reconnected, events may have been missed")
+        for handler in self._on_reconnect:
+            handler()
+
+    async def _on_message(self, message: AbstractIncomingMessage) -> None:
+        async with message.process():
+            if message.type != USER_CREATED_EVENT:
+                return
+            try:
+                event = UserCreated.model_validate_json(message.body)
+            except Exception as e:
+                print(f" [!] Invalid user event: {e}")
+                return
+            for handler in self._on_user_created:
+                handler(event)
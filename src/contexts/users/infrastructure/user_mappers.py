@@ -1,4 +1,8 @@
+from sqlalchemy import Row
+
+from src.contexts.users.domain.read_user import ReadUser
 from src.contexts.users.domain.user import User
+from src.contexts.users.domain.user_created import UserCreated
 from src.contexts.users.infrastructure.user import User as UserOrmModel
 
 
@@ -20,3 +24,25 @@ def user_orm_to_domain(orm_user: UserOrmModel) -> User:
         email=orm_user.email,
         hashed_password=orm_user.hashed_password,
     )
+
+
+def user_domain_to_row(domain_user: User) -> dict:
+    """Transforms a domain User entity to a row for Core bulk inserts."""
+    return {
+        "id": domain_user.id,
+        "name": domain_user.name,
+        "email": domain_user.email,
+        "hashed_password": domain_user.hashed_password,
+    }
+
+
+def user_row_to_read_model(row: Row) -> ReadUser:
+    """Transforms an (id, name, email) row to a ReadUser without re-validating it."""
+    return ReadUser.model_construct(id=row.id, name=row.name, email=row.email)
+
+
+def user_domain_to_created_event(domain_user: User) -> UserCreated:
+    """Transforms a newly created domain User entity to its UserCreated event."""
+    return UserCreated(
+        id=domain_user.id, name=domain_user.name, email=domain_user.email
+    )
@@ -0,0 +1,87 @@
+from typing import Iterable
+
+from src.contexts.users.infrastructure.cached_user_repository import UserCaches
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+)
+from src.contexts.users.infrastructure.password_hasher import (
+    ProcessPoolPasswordHasher,
+)
+from src.core.metrics.registry import Collector
+
+
+def user_metrics_collector(
+    password_hasher: ProcessPoolPasswordHasher,
+    user_caches: UserCaches,
+    email_filter: EmailExistenceFilter,
+) -> Collector:
+    """Exports the counters the user adapters already keep, read at scrape time."""
+
+    def collect() -> Iterable:
+        hasher = password_hasher.metrics
+        yield (
+            "password_hasher_in_flight",
+            "gauge",
+            "Hash or verify operations submitted and not finished.",
+            [("password_hasher_in_flight", {}, hasher.in_flight)],
+        )
+        yield (
+            "password_hasher_queue_depth",
+            "gauge",
+            "Operations waiting for a free hashing worker.",
+            [("password_hasher_queue_depth", {}, hasher.queue_depth)],
+        )
+        yield (
+            "password_hasher_operations_total",
+            "counter",
+            "Completed hash or verify operations.",
+            [("password_hasher_operations_total", {}, hasher.completed)],
+        )
+        yield (
+            "password_hasher_seconds_total",
+            "counter",
+            "Time spent hashing inside the workers, and waiting for one.",
+            [
+                (
+                    "password_hasher_seconds_total",
+                    {"phase": "hash"},
+                    hasher.hash_seconds_total,
+                ),
+                (
+                    "password_hasher_seconds_total",
+                    {"phase": "wait"},
+                    hasher.wait_seconds_total,
+                ),
+            ],
+        )
+
+        caches = {"by_id": user_caches.by_id, "by_email": user_caches.by_email}
+        for stat, kind in (
+            ("hits", "counter"),
+            ("misses", "counter"),
+            ("evictions", "counter"),
+            ("size", "gauge"),
+        ):
+            name = f"user_cache_{stat}" + ("_total" if kind == "counter" else "")
+            yield (
+                name,
+                kind,
+                f"User cache {stat}.",
+                [
+                    (name, {"cache": cache_name}, cache.stats()[stat])
+                    for cache_name, cache in caches.items()
+                ],
+            )
+
+        email_filter_stats = email_filter.stats()
+        yield (
+            "email_filter_info",
+            "gauge",
+            "Email existence filter state: ready, rows, size_bytes, false_positive_rate.",
+            [
+                ("email_filter_info", {"stat": stat}, value)
+                for stat, value in email_filter_stats.items()
+            ],
+        )
+
+    return collect
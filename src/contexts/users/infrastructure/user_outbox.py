@@ -0,0 +1,21 @@
+from src.contexts.users.domain.user import User
+from src.contexts.users.infrastructure.user_mappers import (
+    user_domain_to_created_event,
+)
+from src.core.outbox.outbox_message import OutboxMessage
+
+USER_CREATED_EVENT = "user.created"
+
+
+def user_created_outbox_row(user: User, exchange_name: str) -> dict:
+    """The outbox row announcing a newly created user, as insert values."""
+    return {
+        "exchange": exchange_name,
+        "routing_key": USER_CREATED_EVENT,
+        "message_type": USER_CREATED_EVENT,
+        "body": user_domain_to_created_event(user).model_dump_json(),
+    }
+
+
+def user_created_outbox_message(user: User, exchange_name: str) -> OutboxMessage:
+    return OutboxMessage(**user_created_outbox_row(user, exchange_name))
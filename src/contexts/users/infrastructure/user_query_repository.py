@@ -0,0 +1,65 @@
+import uuid
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.contexts.users.application.user_query_repository import UserQueryRepository
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.users_page import UserSortKey
+from src.contexts.users.infrastructure.user import User as UserOrmModel
+from src.contexts.users.infrastructure.user_mappers import user_row_to_read_model
+
+users_table = UserOrmModel.__table__
+read_columns = (users_table.c.id, users_table.c.name, users_table.c.email)
+
+
+class UserQueryRepository(UserQueryRepository):
+    """
+    Read-optimized adapter: plain Core selects of the public columns only,
+    mapped straight to ReadUser without going through ORM entities.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def find_by_id(self, user_id: uuid.UUID) -> Optional[ReadUser]:
+        query = select(*read_columns).where(users_table.c.id == user_id)
+        result = await self._session.execute(query)
+        row = result.first()
+        if row:
+            return user_row_to_read_model(row)
+        return None
+
+    async def find_by_ids(self, user_ids: Sequence[uuid.UUID]) -> list[ReadUser]:
+        if not user_ids:
+            return []
+        ids_param = bindparam("ids", list(user_ids), type_=ARRAY(UUID(as_uuid=True)))
+        query = select(*read_columns).where(users_table.c.id == any_(ids_param))
+        result = await self._session.execute(query)
+        return [user_row_to_read_model(row) for row in result]
+
+    async def find_page(
+        self, sort_key: UserSortKey, after: Optional[str], limit: int
+    ) -> list[ReadUser]:
+        sort_column = users_table.c[sort_key.value]
+        query = select(*read_columns).order_by(sort_column).limit(limit)
+        if after is not None:
+            after_value = uuid.UUID(after) if sort_key is UserSortKey.ID else after
+            query = query.where(sort_column > after_value)
+        result = await self._session.execute(query)
+        return [user_row_to_read_model(row) for row in result]
+
+    async def stream_all(
+        self, sort_key: UserSortKey, chunk_size: int
+    ) -> AsyncIterator[list[ReadUser]]:
+        # Server-side cursor: rows are fetched `chunk_size` at a time
+        query = (
+            select(*read_columns)
+            .order_by(users_table.c[sort_key.value])
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self._session.stream(query)
+        async for rows in result.partitions():
+            yield [user_row_to_read_model(row) for row in rows]
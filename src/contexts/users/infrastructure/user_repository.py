@@ -1,6 +1,9 @@
 import uuid
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -9,18 +12,53 @@ from src.contexts.users.domain.user import User
 from src.contexts.users.infrastructure.user import User as UserOrmModel
 from src.contexts.users.infrastructure.user_mappers import (
     user_domain_to_orm,
+    user_domain_to_row,
     user_orm_to_domain,
 )
+from src.contexts.users.infrastructure.user_outbox import (
+    user_created_outbox_message,
+    user_created_outbox_row,
+)
+from src.core.config.settings import settings
+from src.core.exceptions.custom_exceptions import UserAlreadyExistsException
+from src.core.outbox.outbox_message import OutboxMessage
+
+# The unique index on users.email, as PostgreSQL and SQLite name it in errors
+_EMAIL_CONFLICT_MARKERS = ("ix_users_email", "users.email")
+
+
+def _is_email_conflict(error: IntegrityError) -> bool:
+    message = str(error.orig)
+    return any(marker in message for marker in _EMAIL_CONFLICT_MARKERS)
 
 
 class UserRepository(UserRepository):
-    def __init__(self, session: AsyncSession):
+    """
+    Saving a user also writes its UserCreated event to the outbox, in the same
+    session, so the event is published if and only if the user is committed.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        events_exchange: str = settings.USER_EVENTS_EXCHANGE,
+    ):
         self._session = session
+        self._events_exchange = events_exchange
 
     async def save(self, user: User) -> None:
         orm_user = user_domain_to_orm(user)
         self._session.add(orm_user)
-        await self._session.flush()
+        self._session.add(user_created_outbox_message(user, self._events_exchange))
+        try:
+            await self._session.flush()
+        except IntegrityError as e:
+            # Another insert won the race after find_by_email said it was free
+            if _is_email_conflict(e):
+                raise UserAlreadyExistsException(
+                    f"User with email {user.email} already exists."
+                ) from e
+            raise
 
     async def find_by_email(self, email: str) -> Optional[User]:
         query = select(UserOrmModel).filter(UserOrmModel.email == email)
@@ -30,6 +68,40 @@ class UserRepository(UserRepository):
             return user_orm_to_domain(orm_user)
         return None
 
+    async def find_existing_emails(self, emails: Sequence[str]) -> set[str]:
+        if not emails:
+            return set()
+        # A single array parameter keeps one prepared statement for any batch size
+        emails_param = bindparam("emails", list(emails), type_=ARRAY(String))
+        query = select(UserOrmModel.email).where(
+            UserOrmModel.email == any_(emails_param)
+        )
+        result = await self._session.execute(query)
+        return set(result.scalars().all())
+
+    async def save_many(self, users: Sequence[User]) -> set[str]:
+        if not users:
+            return set()
+        statement = (
+            insert(UserOrmModel)
+            .values([user_domain_to_row(user) for user in users])
+            .on_conflict_do_nothing(index_elements=[UserOrmModel.email])
+            .returning(UserOrmModel.email)
+        )
+        result = await self._session.execute(statement)
+        inserted_emails = set(result.scalars().all())
+        if inserted_emails:
+            await self._session.execute(
+                insert(OutboxMessage).values(
+                    [
+                        user_created_outbox_row(user, self._events_exchange)
+                        for user in users
+                        if user.email in inserted_emails
+                    ]
+                )
+            )
+        return inserted_emails
+
     async def find_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         orm_user = await self._session.get(UserOrmModel, user_id)
         if orm_user:
@@ -0,0 +1,84 @@
+import hashlib
+import math
+import struct
+from typing import Iterable
+
+_HEADER = struct.Struct("!4sQBQ")
+_MAGIC = b"BLM1"
+
+
+class BloomFilter:
+    """
+    Probabilistic set membership: `item in bloom` is never False for an added
+    item, and is True for a missing one with about `error_rate` probability.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self._size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._hash_count = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of items added (repeated additions are counted once, approximately)."""
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    def add(self, item: str) -> None:
+        is_new = False
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                is_new = True
+        if is_new:
+            self._count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate for the number of items added so far."""
+        return (
+            1 - math.exp(-self._hash_count * self._count / self._size)
+        ) ** self._hash_count
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, self._size, self._hash_count, self._count)
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, size, hash_count, count = _HEADER.unpack_from(data)
+        header_size = _HEADER.size
+        bits = data[header_size:]
+        if magic != _MAGIC or len(bits) != (size + 7) // 8:
+            raise ValueError("Not a serialized BloomFilter.")
+
+        bloom = cls.__new__(cls)
+        bloom._size = size
+        bloom._hash_count = hash_count
+        bloom._bits = bytearray(bits)
+        bloom._count = count
+        return bloom
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions out of one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self._size for i in range(self._hash_count))
@@ -0,0 +1,167 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.contexts.users.infrastructure.cached_user_repository import UserCaches
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+)
+from src.contexts.users.infrastructure.password_hasher import (
+    ProcessPoolPasswordHasher,
+)
+from src.core.config.settings import settings
+from src.core.database.database import (
+    create_read_engine,
+    create_session_factory,
+    create_write_engine,
+    warm_up_engine,
+)
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+
+
+class Container:
+    """
+    The long-lived resources of a process (API worker or consumer): database
+    engines, the AMQP publisher, the bcrypt process pool and the in-process
+    caches. Building it does no I/O; `warm_up` opens what the first requests
+    would otherwise open, and `close` releases everything in order. The
+    consumer only writes, so it is built without a read engine.
+    """
+
+    def __init__(
+        self,
+        write_engine: AsyncEngine,
+        read_engine: Optional[AsyncEngine],
+        publisher: RabbitMQPublisher,
+        password_hasher: ProcessPoolPasswordHasher,
+        user_caches: UserCaches,
+        email_filter: EmailExistenceFilter,
+    ):
+        self.write_engine = write_engine
+        self.read_engine = read_engine
+        self.sessions = create_session_factory(write_engine)
+        self.read_sessions = (
+            create_session_factory(read_engine) if read_engine is not None else None
+        )
+        self.publisher = publisher
+        self.password_hasher = password_hasher
+        self.user_caches = user_caches
+        self.email_filter = email_filter
+        self.ready = False
+        self._email_filter_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        rabbitmq_connection_pool_size: int = settings.RABBITMQ_CONNECTION_POOL_SIZE,
+        password_hashing_workers: int = settings.PASSWORD_HASHING_WORKERS,
+        read_engine: bool = True,
+    ) -> "Container":
+        return cls(
+            write_engine=create_write_engine(),
+            read_engine=create_read_engine() if read_engine else None,
+            publisher=RabbitMQPublisher(
+                settings.RABBITMQ_URL,
+                connection_pool_size=rabbitmq_connection_pool_size,
+                channel_pool_size=settings.RABBITMQ_CHANNEL_POOL_SIZE,
+            ),
+            # bcrypt runs in worker processes so it never blocks the event loop
+            password_hasher=ProcessPoolPasswordHasher(password_hashing_workers),
+            # Per-process user caches, invalidated by the events of the consumer
+            user_caches=UserCaches(
+                max_size=settings.USER_CACHE_MAX_SIZE,
+                ttl=settings.USER_CACHE_TTL_SECONDS,
+                negative_ttl=settings.USER_CACHE_NEGATIVE_TTL_SECONDS,
+            ),
+            # Known emails, loaded in the background; lookups go to the
+            # database until then
+            email_filter=EmailExistenceFilter(
+                capacity=settings.EMAIL_FILTER_CAPACITY,
+                error_rate=settings.EMAIL_FILTER_ERROR_RATE,
+                snapshot_path=settings.EMAIL_FILTER_SNAPSHOT_PATH,
+            ),
+        )
+
+    async def connect(self) -> None:
+        """Creates the publisher pools; connections open on first use or warm-up."""
+        await self.publisher.connect()
+
+    def maintain_email_filter(self, use_read_engine: bool) -> None:
+        """Loads the email filter in the background and rebuilds it periodically."""
+        if not settings.EMAIL_FILTER_ENABLED:
+            return
+        sessions = self.read_sessions if use_read_engine else self.sessions
+        self._email_filter_task = asyncio.create_task(
+            self.email_filter.maintain(
+                sessions, settings.EMAIL_FILTER_REBUILD_INTERVAL_SECONDS
+            )
+        )
+
+    async def warm_up(
+        self,
+        read_connections: int = 0,
+        write_connections: int = 0,
+        queues: Iterable[str] = (),
+        exchanges: Iterable[str] = (),
+        channels: int = 0,
+        queue_arguments: Optional[dict] = None,
+        subscribers: Iterable[Callable[[], Awaitable[None]]] = (),
+        retry_interval: float = settings.WARMUP_RETRY_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Opens database connections and AMQP channels, declares the queues and
+        exchanges, starts the event subscribers (given as their idempotent
+        `start`) and every bcrypt worker, all at once. Retries until it
+        succeeds (e.g. while the database or the broker is still starting),
+        then marks the container ready.
+        """
+        queues, exchanges = list(queues), list(exchanges)
+        subscribers = list(subscribers)
+        engines = [(self.write_engine, write_connections)]
+        if self.read_engine is not None:
+            engines.append((self.read_engine, read_connections))
+        start = time.perf_counter()
+        while True:
+            try:
+                await asyncio.gather(
+                    *(
+                        warm_up_engine(engine, connections)
+                        for engine, connections in engines
+                    ),
+                    self._warm_up_broker(queues, exchanges, channels, queue_arguments),
+                    *(start_subscriber() for start_subscriber in subscribers),
+                    self.password_hasher.warm_up(),
+                )
+                break
+            except Exception as e:
+                print(f" [!] Warm-up failed, retrying in {retry_interval}s: {e}")
+                await asyncio.sleep(retry_interval)
+        self.ready = True
+        print(f" [*] Warmed up in {time.perf_counter() - start:.2f}s")
+
+    async def close(self) -> None:
+        self.ready = False
+        if self._email_filter_task is not None:
+            self._email_filter_task.cancel()
+            await asyncio.gather(self._email_filter_task, return_exceptions=True)
+            await self.email_filter.save_snapshot()
+        await self.publisher.close()
+        self.password_hasher.close()
+        await self.write_engine.dispose()
+        if self.read_engine is not None:
+            await self.read_engine.dispose()
+
+    async def _warm_up_broker(
+        self,
+        queues: list[str],
+        exchanges: list[str],
+        channels: int,
+        queue_arguments: Optional[dict],
+    ) -> None:
+        await self.publisher.warm_up(channels)
+        for queue_name in queues:
+            await self.publisher.declare_queue(queue_name, queue_arguments)
+        for exchange_name in exchanges:
+            await self.publisher.declare_exchange(exchange_name)
@@ -1,30 +1,90 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+from contextlib import AsyncExitStack
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from src.core.config.settings import settings
+from src.core.metrics.database import TimedAsyncAdaptedQueuePool, instrument_engine
 
 DATABASE_URL = settings.DATABASE_URL
+DATABASE_READ_URL = settings.DATABASE_READ_URL or settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
 
-Base = declarative_base()
+def create_engine(
+    name: str,
+    url: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: float,
+    statement_cache_size: int,
+) -> AsyncEngine:
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = statement_cache_size
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        connect_args=connect_args,
+    )
+    instrument_engine(engine, name)
+    return engine
+
+
+def create_write_engine() -> AsyncEngine:
+    # Commands (the consumer) write to the primary
+    return create_engine(
+        "write",
+        DATABASE_URL,
+        pool_size=settings.DB_WRITE_POOL_SIZE,
+        max_overflow=settings.DB_WRITE_MAX_OVERFLOW,
+        pool_timeout=settings.DB_WRITE_POOL_TIMEOUT,
+        statement_cache_size=settings.DB_WRITE_STATEMENT_CACHE_SIZE,
+    )
+
 
+def create_read_engine() -> AsyncEngine:
+    # Queries use their own pool, on a replica when DATABASE_READ_URL points to one
+    return create_engine(
+        "read",
+        DATABASE_READ_URL,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW,
+        pool_timeout=settings.DB_READ_POOL_TIMEOUT,
+        statement_cache_size=settings.DB_READ_STATEMENT_CACHE_SIZE,
+    ).execution_options(postgresql_readonly=True)
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
 
+def create_session_factory(engine: AsyncEngine) -> sessionmaker:
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
 
-async def init_db():
-    async with engine.begin():
-        pass
+
+async def warm_up_engine(engine: AsyncEngine, connections: int) -> None:
+    """
+    Opens up to `connections` connections at once (no more than the pool keeps)
+    and hands them back to the pool, so the first requests find them open.
+    """
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+        for connection in opened:
+            await connection.execute(text("SELECT 1"))
+
+
+Base = declarative_base()
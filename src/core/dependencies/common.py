@@ -1,4 +1,25 @@
-# from typing import AsyncGenerator
+from fastapi import Request
 
-# from src.core.database.database import AsyncSession, get_db
-pass
+from src.core.container import Container
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+
+
+def get_container(request: Request) -> Container:
+    # Built and warmed up once in the application lifespan
+    return request.app.state.container
+
+
+def get_rabbitmq_publisher(request: Request) -> RabbitMQPublisher:
+    return get_container(request).publisher
+
+
+async def get_write_db(request: Request):
+    # For handlers that write to the primary; user creation goes through the
+    # broker and the consumer instead
+    async with get_container(request).sessions() as session:
+        yield session
+
+
+async def get_read_db(request: Request):
+    async with get_container(request).read_sessions() as session:
+        yield session
@@ -8,3 +8,23 @@ class UserNotFoundException(Exception):
 
 class InvalidCredentialsException(Exception):
     pass
+
+
+class BatchLimitExceededException(Exception):
+    pass
+
+
+class InvalidCursorException(Exception):
+    pass
+
+
+class InvalidTokenException(Exception):
+    pass
+
+
+class IdempotencyKeyReusedException(Exception):
+    pass
+
+
+class CommandNotFoundException(Exception):
+    pass
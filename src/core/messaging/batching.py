@@ -0,0 +1,39 @@
+import asyncio
+from typing import AsyncIterator, TypeVar
+
+T = TypeVar("T")
+
+
+async def iterate_batches(
+    iterator: AsyncIterator[T], max_size: int, timeout: float
+) -> AsyncIterator[list[T]]:
+    """
+    Groups the items of `iterator` into batches of up to `max_size` items.
+    A batch is flushed when it is full or `timeout` seconds after its first item
+    arrived, so a quiet queue never holds messages back for long.
+    The iterator must tolerate its pending `__anext__` being cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            batch = [await iterator.__anext__()]
+        except StopAsyncIteration:
+            return
+
+        deadline = loop.time() + timeout
+        exhausted = False
+        while len(batch) < max_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(iterator.__anext__(), remaining))
+            except asyncio.TimeoutError:
+                break
+            except StopAsyncIteration:
+                exhausted = True
+                break
+
+        yield batch
+        if exhausted:
+            return
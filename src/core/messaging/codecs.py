@@ -0,0 +1,90 @@
+from abc import ABC, abstractmethod
+from typing import TypeVar
+
+import msgpack
+from aio_pika.abc import AbstractIncomingMessage
+from pydantic import BaseModel, ValidationError
+
+# Version of the payload's schema, so consumers can refuse messages from the future
+SCHEMA_VERSION_HEADER = "x-schema-version"
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class MessageFormatError(ValueError):
+    """A message this consumer cannot decode; retrying will not help."""
+
+
+class MessageCodec(ABC):
+    content_type: str
+
+    @abstractmethod
+    def encode(self, payload: BaseModel) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, body: bytes, model: type[M]) -> M:
+        """Parses and validates the body in one step."""
+        raise NotImplementedError
+
+
+class JsonCodec(MessageCodec):
+    content_type = "application/json"
+
+    def encode(self, payload: BaseModel) -> bytes:
+        return payload.model_dump_json().encode()
+
+    def decode(self, body: bytes, model: type[M]) -> M:
+        # pydantic-core parses straight into the model, with no dict in between
+        return model.model_validate_json(body)
+
+
+class MsgpackCodec(MessageCodec):
+    content_type = "application/msgpack"
+
+    def encode(self, payload: BaseModel) -> bytes:
+        return msgpack.packb(payload.model_dump(mode="json"))
+
+    def decode(self, body: bytes, model: type[M]) -> M:
+        return model.model_validate(msgpack.unpackb(body))
+
+
+CODECS: dict[str, MessageCodec] = {
+    codec.content_type: codec for codec in (JsonCodec(), MsgpackCodec())
+}
+CODEC_NAMES = {"json": JsonCodec.content_type, "msgpack": MsgpackCodec.content_type}
+
+
+def codec_named(name: str) -> MessageCodec:
+    """The codec for a MESSAGE_CODEC setting value."""
+    try:
+        return CODECS[CODEC_NAMES[name]]
+    except KeyError:
+        raise ValueError(
+            f"Unknown message codec {name!r}, expected one of {sorted(CODEC_NAMES)}."
+        ) from None
+
+
+def decode_message(
+    message: AbstractIncomingMessage, model: type[M], schema_version: int
+) -> M:
+    """
+    Decodes a message with the codec of its content type. Messages published
+    before codecs existed have no content type nor version, and are JSON v1.
+    Raises MessageFormatError for a body that cannot be decoded, and pydantic's
+    ValidationError for one that decodes into an invalid payload.
+    """
+    version = (message.headers or {}).get(SCHEMA_VERSION_HEADER, 1)
+    if not isinstance(version, int) or version > schema_version:
+        raise MessageFormatError(
+            f"Unsupported schema version {version!r} (up to {schema_version})."
+        )
+    codec = CODECS.get(message.content_type or JsonCodec.content_type)
+    if codec is None:
+        raise MessageFormatError(f"Unsupported content type {message.content_type!r}.")
+    try:
+        return codec.decode(message.body, model)
+    except ValidationError:
+        raise
+    except Exception as e:
+        raise MessageFormatError(f"Undecodable {codec.content_type} body: {e}") from e
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from aio_pika.abc import AbstractRobustConnection
+
+from src.core.metrics.registry import registry
+from src.core.metrics.throughput import ThroughputMeter
+
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+settled_messages = registry.counter(
+    "consumer_settled_messages_total",
+    "Messages acked or rejected by the consumer.",
+    ["action"],
+)
+processed_messages = registry.counter(
+    "consumer_processed_messages_total",
+    "Messages handled by the consumer, by outcome.",
+    ["outcome"],
+)
+stage_seconds = registry.histogram(
+    "consumer_stage_duration_seconds",
+    "Time spent in each stage of handling a message.",
+    ["stage"],
+)
+in_flight_messages = registry.gauge(
+    "consumer_in_flight_messages",
+    "Messages received from the broker and not yet settled.",
+)
+queue_messages = registry.gauge(
+    "consumer_queue_messages",
+    "Ready messages in the queue, as last reported by the broker.",
+    ["queue"],
+)
+queue_consumers = registry.gauge(
+    "consumer_queue_consumers",
+    "Consumers attached to the queue, as last reported by the broker.",
+    ["queue"],
+)
+
+_throughput = ThroughputMeter(THROUGHPUT_WINDOW_SECONDS)
+
+
+def record_received(count: int = 1) -> None:
+    in_flight_messages.inc(count)
+
+
+def record_settled(action: str, count: int = 1) -> None:
+    """Counts acks ("ack") and rejects ("reject") and feeds the messages/sec rate."""
+    settled_messages.labels(action).inc(count)
+    in_flight_messages.dec(count)
+    _throughput.record(count)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """Observes the wall time of the block, awaits included, under `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.labels(stage).observe(time.perf_counter() - start)
+
+
+def _collect_throughput() -> Iterable:
+    yield (
+        "consumer_messages_per_second",
+        "gauge",
+        f"Settled messages per second over the last {THROUGHPUT_WINDOW_SECONDS:.0f}s.",
+        [("consumer_messages_per_second", {}, _throughput.rate())],
+    )
+
+
+registry.register_collector(_collect_throughput)
+
+
+async def poll_queue_depth(
+    connection: AbstractRobustConnection, queue_name: str, interval: float
+) -> None:
+    """
+    Keeps the queue gauges up to date with a passive declare every `interval`
+    seconds, on a channel of its own so that a failed poll never closes the
+    channel the messages are consumed from.
+    """
+    channel = await connection.channel()
+    try:
+        while True:
+            try:
+                queue = await channel.declare_queue(queue_name, passive=True)
+                result = queue.declaration_result
+                queue_messages.labels(queue_name).set(result.message_count)
+                queue_consumers.labels(queue_name).set(result.consumer_count)
+            except Exception as e:
+                print(f" [!] Could not poll the depth of {queue_name}: {e}")
+                if channel.is_closed:
+                    channel = await connection.channel()
+            await asyncio.sleep(interval)
+    finally:
+        if not channel.is_closed:
+            await channel.close()
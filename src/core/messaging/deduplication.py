@@ -0,0 +1,121 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache.lru_ttl_cache import MISSING, LRUTTLCache
+from src.core.messaging.processed_command import ProcessedCommand
+from src.core.metrics.registry import registry
+
+SessionFactory = Callable[[], AsyncSession]
+
+duplicate_messages = registry.counter(
+    "consumer_duplicate_messages_total",
+    "Messages dropped because their command was already processed, by store.",
+    ["store"],
+)
+
+
+def _parse_command_id(message_id: Optional[str]) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(message_id) if message_id else None
+    except ValueError:
+        return None
+
+
+class CommandDeduplicator:
+    """
+    Remembers which command ids (AMQP message ids) were processed, so that a
+    redelivered or re-enqueued command is acked before any hashing or writes.
+
+    Ids are kept in a bounded in-memory LRU. With `use_table`, they are also
+    written to `processed_commands` in the same transaction as the command's
+    effects: that store survives a consumer crash, which is precisely when
+    the broker redelivers, and is shared by every consumer. Messages without
+    a UUID message id are never deduplicated.
+    """
+
+    def __init__(self, max_size: int, ttl: float, use_table: bool):
+        self._ttl = ttl
+        self._use_table = use_table
+        self._recent: LRUTTLCache[uuid.UUID, bool] = LRUTTLCache(
+            max_size=max_size, ttl=ttl, negative_ttl=0
+        )
+
+    async def processed(
+        self, session: AsyncSession, message_ids: Sequence[Optional[str]]
+    ) -> set[str]:
+        """Returns the given message ids whose command was already processed."""
+        ids = {
+            message_id: command_id
+            for message_id in message_ids
+            if (command_id := _parse_command_id(message_id)) is not None
+        }
+        found = {
+            message_id
+            for message_id, command_id in ids.items()
+            if self._recent.get(command_id) is not MISSING
+        }
+        if found:
+            duplicate_messages.labels("memory").inc(len(found))
+
+        unknown = {
+            command_id: message_id
+            for message_id, command_id in ids.items()
+            if message_id not in found
+        }
+        if self._use_table and unknown:
+            stored = set(
+                await session.scalars(
+                    select(ProcessedCommand.command_id).where(
+                        ProcessedCommand.command_id.in_(list(unknown))
+                    )
+                )
+            )
+            if stored:
+                duplicate_messages.labels("table").inc(len(stored))
+                self.remember(unknown[command_id] for command_id in stored)
+                found.update(unknown[command_id] for command_id in stored)
+        return found
+
+    def record(
+        self, session: AsyncSession, message_ids: Iterable[Optional[str]]
+    ) -> None:
+        """Adds the ids to the session; they are committed with the command's effects."""
+        if not self._use_table:
+            return
+        session.add_all(
+            ProcessedCommand(command_id=command_id)
+            for command_id in map(_parse_command_id, message_ids)
+            if command_id is not None
+        )
+
+    def remember(self, message_ids: Iterable[Optional[str]]) -> None:
+        """Marks the ids as processed in memory, once their transaction committed."""
+        for command_id in map(_parse_command_id, message_ids):
+            if command_id is not None:
+                self._recent.set(command_id, True)
+
+    async def purge(self, session_factory: SessionFactory) -> int:
+        """Deletes table entries older than the TTL; redeliveries come much sooner."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._ttl)
+        async with session_factory() as session:
+            result = await session.execute(
+                delete(ProcessedCommand).where(ProcessedCommand.processed_at < cutoff)
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def maintain(self, session_factory: SessionFactory, interval: float) -> None:
+        """Purges the table every `interval` seconds until cancelled."""
+        if not self._use_table:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.purge(session_factory)
+            except Exception as e:
+                print(f" [!] Could not purge processed commands: {e}")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.database.database import Base
+
+
+class ProcessedCommand(Base):
+    """A command id whose effects were committed, written in the same transaction."""
+
+    __tablename__ = "processed_commands"
+
+    command_id = Column(UUID(as_uuid=True), primary_key=True)
+    processed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
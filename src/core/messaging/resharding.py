@@ -0,0 +1,55 @@
+import asyncio
+from typing import Sequence
+
+from aio_pika.abc import AbstractRobustConnection
+from aio_pika.exceptions import ChannelNotFoundEntity
+
+from src.core.messaging.retry import RetryTopology
+
+
+async def queue_depth(
+    connection: AbstractRobustConnection, queue_name: str
+) -> tuple[int, int]:
+    """
+    Messages ready and consumers of a queue, with a passive declare on a
+    channel of its own (a missing queue closes it, and counts as empty).
+    """
+    channel = await connection.channel()
+    try:
+        queue = await channel.declare_queue(queue_name, passive=True)
+        result = queue.declaration_result
+        return result.message_count, result.consumer_count
+    except ChannelNotFoundEntity:
+        return 0, 0
+    finally:
+        if not channel.is_closed:
+            await channel.close()
+
+
+async def pending_messages(
+    connection: AbstractRobustConnection,
+    topologies: Sequence[RetryTopology],
+    count_consumers: bool = False,
+) -> int:
+    """
+    Messages still waiting in the work queues and their retry queues. With
+    `count_consumers`, a consumer of a work queue counts too: it may still
+    hold unacked messages, which the broker does not report as ready.
+    """
+    pending = 0
+    for topology in topologies:
+        messages, consumers = await queue_depth(connection, topology.queue_name)
+        pending += messages + (consumers if count_consumers else 0)
+        for delay in topology.delays:
+            pending += (await queue_depth(connection, topology.retry_queue(delay)))[0]
+    return pending
+
+
+async def wait_until_drained(
+    connection: AbstractRobustConnection,
+    topologies: Sequence[RetryTopology],
+    interval: float,
+    count_consumers: bool = False,
+) -> None:
+    while await pending_messages(connection, topologies, count_consumers):
+        await asyncio.sleep(interval)
@@ -0,0 +1,168 @@
+from typing import Sequence
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, ExchangeType
+
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+from src.core.metrics.registry import registry
+
+ATTEMPT_HEADER = "x-attempt"
+ERROR_HEADER = "x-error"
+ERROR_TYPE_HEADER = "x-error-type"
+MAX_ERROR_LENGTH = 500
+
+retried_messages = registry.counter(
+    "consumer_retried_messages_total",
+    "Messages sent to a retry queue, by delay.",
+    ["queue", "delay"],
+)
+dead_lettered_messages = registry.counter(
+    "consumer_dead_lettered_messages_total",
+    "Messages sent to the dead-letter queue, by error type.",
+    ["queue", "error_type"],
+)
+
+
+def backoff_delays(
+    max_attempts: int, base_delay: float, factor: float
+) -> tuple[float, ...]:
+    """The delay before each retry: `max_attempts - 1` of them, growing by `factor`."""
+    return tuple(base_delay * factor**level for level in range(max_attempts - 1))
+
+
+class RetryTopology:
+    """
+    Names and declares the queues around a work queue:
+
+    - `<queue>.retry.<delay>ms`: one per backoff level. Nothing consumes them;
+      their TTL dead-letters each message back to the work queue. A queue per
+      level, instead of a per-message expiration on a single queue, keeps a
+      long delay from holding back the short ones queued behind it.
+    - `<queue>.dlx` and `<queue>.dead`: the dead-letter exchange and the queue
+      bound to it, holding what will not be retried until it is replayed.
+
+    The work queue itself is left untouched, so existing deployments do not
+    have to redeclare it with new arguments.
+    """
+
+    def __init__(self, queue_name: str, delays: Sequence[float]):
+        self.queue_name = queue_name
+        self.delays = tuple(delays)
+        self.dead_letter_exchange = f"{queue_name}.dlx"
+        self.dead_letter_queue = f"{queue_name}.dead"
+
+    def retry_queue(self, delay: float) -> str:
+        return f"{self.queue_name}.retry.{round(delay * 1000)}ms"
+
+    async def declare(self, channel: AbstractChannel) -> None:
+        for delay in self.delays:
+            await channel.declare_queue(
+                self.retry_queue(delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": round(delay * 1000),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.queue_name,
+                },
+            )
+        exchange = await channel.declare_exchange(
+            self.dead_letter_exchange, ExchangeType.FANOUT, durable=True
+        )
+        queue = await channel.declare_queue(self.dead_letter_queue, durable=True)
+        await queue.bind(exchange)
+
+
+def attempt_of(message: AbstractIncomingMessage) -> int:
+    """
+    1 for the first delivery, counting up with every retry. Anyone can set
+    the header, so a value that is not a positive integer counts as a first
+    attempt: the message still runs out of attempts instead of failing here.
+    """
+    try:
+        attempt = int((message.headers or {}).get(ATTEMPT_HEADER, 1))
+    except (TypeError, ValueError):
+        return 1
+    return max(attempt, 1)
+
+
+def copy_message(message: AbstractIncomingMessage, **headers) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=message.body,
+        headers={**(message.headers or {}), **headers},
+        content_type=message.content_type,
+        message_id=message.message_id,
+        correlation_id=message.correlation_id,
+        timestamp=message.timestamp,
+        type=message.type,
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+    )
+
+
+def replay_copy(message: AbstractIncomingMessage) -> aio_pika.Message:
+    """A dead-lettered message as a fresh first attempt, for replaying it."""
+    replayed = copy_message(message)
+    for header in (ATTEMPT_HEADER, ERROR_HEADER, ERROR_TYPE_HEADER):
+        replayed.headers.pop(header, None)
+    return replayed
+
+
+class MessageRetrier:
+    """
+    Decides what happens to a message whose handling failed. Retryable errors
+    are republished to the retry queue of their attempt, and anything else,
+    or a message out of attempts, to the dead-letter exchange. The caller acks
+    the original once this returns; if publishing fails the error propagates
+    and the original must be requeued instead.
+    """
+
+    def __init__(
+        self,
+        publisher: RabbitMQPublisher,
+        topology: RetryTopology,
+        non_retryable: tuple[type[Exception], ...] = (),
+    ):
+        self._publisher = publisher
+        self._topology = topology
+        self._non_retryable = non_retryable
+
+    @property
+    def max_attempts(self) -> int:
+        return len(self._topology.delays) + 1
+
+    def is_retryable(self, error: Exception) -> bool:
+        return not isinstance(error, self._non_retryable)
+
+    async def retry_or_dead_letter(
+        self, message: AbstractIncomingMessage, error: Exception
+    ) -> str:
+        """Returns "retried" or "dead_lettered"."""
+        attempt = attempt_of(message)
+        if not self.is_retryable(error) or attempt >= self.max_attempts:
+            await self.dead_letter(message, error)
+            return "dead_lettered"
+
+        delay = self._topology.delays[attempt - 1]
+        await self._publisher.publish(
+            copy_message(message, **{ATTEMPT_HEADER: attempt + 1}),
+            self._topology.retry_queue(delay),
+        )
+        retried_messages.labels(self._topology.queue_name, f"{delay:g}").inc()
+        return "retried"
+
+    async def dead_letter(
+        self, message: AbstractIncomingMessage, error: Exception
+    ) -> None:
+        error_type = type(error).__name__
+        await self._publisher.publish(
+            copy_message(
+                message,
+                **{
+                    ATTEMPT_HEADER: attempt_of(message),
+                    ERROR_HEADER: str(error)[:MAX_ERROR_LENGTH],
+                    ERROR_TYPE_HEADER: error_type,
+                },
+            ),
+            routing_key=self._topology.queue_name,
+            exchange_name=self._topology.dead_letter_exchange,
+        )
+        dead_lettered_messages.labels(self._topology.queue_name, error_type).inc()
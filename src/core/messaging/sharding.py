@@ -0,0 +1,54 @@
+import hashlib
+from typing import Optional
+
+
+def shard_key(email: str) -> str:
+    # Case and surrounding spaces must not send one address to two shards
+    return email.strip().lower()
+
+
+def shard_for(key: str, shards: int) -> int:
+    """
+    The shard of a key, stable across processes and restarts (unlike the
+    salted built-in hash), so every API worker routes a key the same way.
+    """
+    if shards <= 1:
+        return 0
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def shard_queue_name(queue_name: str, shard: int, shards: int) -> str:
+    """
+    One shard is the unsharded queue itself, so K=1 changes nothing. The
+    count is part of the name: the queues of two layouts never overlap, so
+    the old ones can be drained while the new ones fill up.
+    """
+    if shards <= 1:
+        return queue_name
+    return f"{queue_name}.shard.{shard}-of-{shards}"
+
+
+def shard_queue_names(queue_name: str, shards: int) -> list[str]:
+    return [shard_queue_name(queue_name, shard, shards) for shard in range(shards)]
+
+
+def shard_queue_arguments(shards: int) -> Optional[dict]:
+    """
+    Shard queues deliver to a single active consumer, so a shard stays
+    serial even if two workers subscribe to it. The unsharded queue keeps
+    its original declaration, which RabbitMQ would refuse to change.
+    """
+    return {"x-single-active-consumer": True} if shards > 1 else None
+
+
+def owned_shards(shards: int, worker: Optional[int], workers: int) -> list[int]:
+    """
+    The shards a consumer process reads: split round-robin across workers.
+    Without sharding, every worker shares the single queue.
+    """
+    if shards <= 1:
+        return [0]
+    if worker is None:
+        return list(range(shards))
+    return list(range(worker, shards, workers))
@@ -0,0 +1,101 @@
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from src.core.metrics.registry import registry
+
+# Epoch seconds as a float: the AMQP timestamp property only has second precision
+PUBLISHED_AT_HEADER = "x-published-at"
+
+command_queue_wait_seconds = registry.histogram(
+    "command_queue_wait_seconds",
+    "Time from publish until the consumer started handling the command.",
+    ["queue"],
+)
+command_processing_seconds = registry.histogram(
+    "command_processing_seconds",
+    "Time the consumer spent handling the command, by outcome.",
+    ["queue", "outcome"],
+)
+command_latency_seconds = registry.histogram(
+    "command_latency_seconds",
+    "Time from publish until the command was handled, by outcome.",
+    ["queue", "outcome"],
+)
+
+
+def trace_properties(
+    message_id: uuid.UUID, correlation_id: Optional[uuid.UUID] = None
+) -> dict:
+    """Message properties that let the consumer trace a command back to its request."""
+    now = time.time()
+    return {
+        "message_id": str(message_id),
+        "correlation_id": str(correlation_id or message_id),
+        "timestamp": datetime.fromtimestamp(now, timezone.utc),
+        "headers": {PUBLISHED_AT_HEADER: now},
+    }
+
+
+@dataclass
+class CommandTrace:
+    """
+    Follows one command through the consumer. Queue wait and total latency
+    compare the publisher's clock with ours, so they are only as accurate as
+    the clock sync between the API and consumer hosts.
+    """
+
+    queue: str
+    command_id: Optional[str]
+    correlation_id: Optional[str]
+    published_at: Optional[float]
+    started_at: float
+    clock: Callable[[], float] = time.time
+
+    @classmethod
+    def start(
+        cls,
+        message: AbstractIncomingMessage,
+        queue: str,
+        clock: Callable[[], float] = time.time,
+    ) -> "CommandTrace":
+        published_at = (message.headers or {}).get(PUBLISHED_AT_HEADER)
+        if published_at is None and message.timestamp is not None:
+            published_at = message.timestamp.timestamp()
+        return cls(
+            queue=queue,
+            command_id=message.message_id,
+            correlation_id=message.correlation_id,
+            published_at=float(published_at) if published_at is not None else None,
+            started_at=clock(),
+            clock=clock,
+        )
+
+    def finish(self, outcome: str) -> dict:
+        """Records the command's timings and logs them as one JSON line."""
+        finished_at = self.clock()
+        processing = finished_at - self.started_at
+        record = {
+            "event": "command_handled",
+            "queue": self.queue,
+            "command_id": self.command_id,
+            "correlation_id": self.correlation_id,
+            "outcome": outcome,
+            "processing_ms": round(processing * 1000, 3),
+        }
+        command_processing_seconds.labels(self.queue, outcome).observe(processing)
+        if self.published_at is not None:
+            # Clamped, as clock skew between hosts can make these negative
+            queue_wait = max(0.0, self.started_at - self.published_at)
+            latency = max(0.0, finished_at - self.published_at)
+            command_queue_wait_seconds.labels(self.queue).observe(queue_wait)
+            command_latency_seconds.labels(self.queue, outcome).observe(latency)
+            record["queue_wait_ms"] = round(queue_wait * 1000, 3)
+            record["total_ms"] = round(latency * 1000, 3)
+        print(json.dumps(record))
+        return record
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from src.core.messaging.consumer_metrics import record_received, record_settled
+
+MessageHandler = Callable[[AbstractIncomingMessage], Awaitable[None]]
+
+
+class OrderedAckWorkerPool:
+    """
+    Runs a message handler for up to `concurrency` messages at the same time.
+    Messages are acknowledged in the order they were received, even when
+    their handlers finish out of order. A message whose handler raises is
+    rejected, and requeued if `requeue_on_error` is set.
+    """
+
+    def __init__(
+        self,
+        handler: MessageHandler,
+        concurrency: int,
+        requeue_on_error: bool = False,
+    ):
+        self._handler = handler
+        self._requeue_on_error = requeue_on_error
+        self._slots = asyncio.Semaphore(concurrency)
+        self._last_ack: Optional[asyncio.Task] = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def submit(self, message: AbstractIncomingMessage) -> None:
+        """Waits for a free slot, then starts handling the message in the background."""
+        await self._slots.acquire()
+        self._in_flight += 1
+        record_received()
+        handling = asyncio.create_task(self._handle(message))
+        self._last_ack = asyncio.create_task(
+            self._ack_in_order(message, handling, self._last_ack)
+        )
+
+    async def drain(self) -> None:
+        """Waits until every submitted message has been handled and acknowledged."""
+        while self._last_ack is not None and not self._last_ack.done():
+            await asyncio.wait({self._last_ack})
+
+    async def _handle(self, message: AbstractIncomingMessage) -> bool:
+        try:
+            await self._handler(message)
+            return True
+        except Exception as e:
+            print(f" [!] Unhandled error processing message: {e}")
+            return False
+        finally:
+            self._slots.release()
+
+    async def _ack_in_order(
+        self,
+        message: AbstractIncomingMessage,
+        handling: asyncio.Task,
+        previous: Optional[asyncio.Task],
+    ) -> None:
+        handled = await handling
+        if previous is not None:
+            await asyncio.wait({previous})
+        try:
+            if handled:
+                await message.ack()
+                record_settled("ack")
+            else:
+                await message.reject(requeue=self._requeue_on_error)
+                record_settled("reject")
+        finally:
+            self._in_flight -= 1
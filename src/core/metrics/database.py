@@ -0,0 +1,101 @@
+import time
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.metrics.registry import registry
+
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements, by engine and statement type.",
+    ["engine", "statement"],
+)
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["engine"],
+)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waits for a connection,
+    labelled with the pool's `logging_name` (kept across pool recreation).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.labels(
+                getattr(self, "logging_name", None) or "default"
+            ).observe(time.perf_counter() - start)
+
+
+# Live engines by name; an engine built again under the same name (a new
+# Container) replaces the old one, and disposed engines are not kept alive
+_engines: dict[str, weakref.ref] = {}
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Times every statement of the engine and exports its pool usage."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        # Kept on the execution, so a failed statement leaves nothing behind
+        if context is not None:
+            context.query_started_at = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started_at = getattr(context, "query_started_at", None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        # The leading keyword keeps the label set small: SELECT, INSERT, ...
+        statement_type = statement.lstrip().split(None, 1)[0].upper()
+        db_query_seconds.labels(name, statement_type).observe(elapsed)
+
+    _engines[name] = weakref.ref(sync_engine)
+
+
+def collect_pools():
+    """One `db_pool_connections` family with the samples of every engine."""
+    samples = []
+    for name, engine_ref in list(_engines.items()):
+        sync_engine = engine_ref()
+        if sync_engine is None:
+            del _engines[name]
+            continue
+        pool = sync_engine.pool
+        samples += [
+            (
+                "db_pool_connections",
+                {"engine": name, "state": "checked_out"},
+                pool.checkedout(),
+            ),
+            (
+                "db_pool_connections",
+                {"engine": name, "state": "idle"},
+                pool.checkedin(),
+            ),
+            (
+                "db_pool_connections",
+                {"engine": name, "state": "overflow"},
+                max(0, pool.overflow()),
+            ),
+        ]
+    if samples:
+        yield (
+            "db_pool_connections",
+            "gauge",
+            "Connections of the pool by state.",
+            samples,
+        )
+
+
+registry.register_collector(collect_pools)
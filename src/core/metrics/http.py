@@ -0,0 +1,54 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics.registry import registry
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by method, route template and status code.",
+    ["method", "route", "status"],
+)
+
+
+def _route_template(scope: Scope) -> str:
+    # Set by the router once it matched, so unknown paths share one label
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # FastAPI keeps the routes of an included router relative to its prefix,
+    # and records the full template of the matched one next to it
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(context, "path", None) or route.path
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every request until its body is fully sent.
+    Requests are labelled with the matched route template, never the raw path,
+    so ids in URLs do not create new series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_seconds.labels(
+                scope["method"], _route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,308 @@
+import bisect
+import math
+from typing import Callable, Iterable, Optional, Sequence
+
+# Seconds; from sub-millisecond cache hits up to slow bcrypt and batch inserts
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Sample = tuple[str, dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        """Returns the child for these label values; cheap enough for hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._children.items():
+            yield self.name, dict(zip(self.labelnames, values)), child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._children.items():
+            yield self.name, dict(zip(self.labelnames, values)), child.value
+
+
+class _HistogramChild:
+    __slots__ = ("_upper_bounds", "bucket_counts", "count", "sum")
+
+    def __init__(self, upper_bounds: tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        # Per-bucket (not cumulative) counts; the last one is +Inf
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self._upper_bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._children.items():
+            labels = dict(zip(self.labelnames, values))
+            cumulative = 0
+            for upper_bound, bucket_count in zip(
+                self.buckets + (math.inf,), child.bucket_counts
+            ):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    {**labels, "le": _format_value(upper_bound)},
+                    cumulative,
+                )
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, child.count
+
+
+# Called at scrape time: (name, type, help, samples)
+Collector = Callable[[], Iterable[tuple[str, str, str, Iterable[Sample]]]]
+Family = tuple[str, str, str, list[Sample]]
+
+
+def merge_families(snapshots: Iterable[Iterable[Family]]) -> list[Family]:
+    """
+    Adds up the samples of several processes' snapshots, label set by label
+    set. Right for counters, histograms and gauges such as in-flight counts;
+    a gauge every process reports for the same thing must come from one only.
+    """
+    merged: dict[str, tuple[str, str, dict]] = {}
+    for families in snapshots:
+        for name, kind, documentation, samples in families:
+            _, _, totals = merged.setdefault(name, (kind, documentation, {}))
+            for sample_name, labels, value in samples:
+                key = (sample_name, tuple(sorted(labels.items())))
+                totals[key] = totals.get(key, 0.0) + value
+    return [
+        (
+            name,
+            kind,
+            documentation,
+            [
+                (sample_name, dict(labels), value)
+                for (sample_name, labels), value in totals.items()
+            ],
+        )
+        for name, (kind, documentation, totals) in merged.items()
+    ]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text format.
+    Recording is a dict lookup and an addition; everything else (cumulative
+    buckets, collectors, formatting) only happens when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Collector) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self) -> list[Family]:
+        """
+        Every metric's current samples, as plain (picklable) tuples. Families
+        of the same name from several collectors are joined into one, since
+        the text format allows a single HELP and TYPE line per family.
+        """
+        families: dict[str, Family] = {
+            metric.name: (
+                metric.name,
+                metric.kind,
+                metric.documentation,
+                list(metric.samples()),
+            )
+            for metric in self._metrics.values()
+        }
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                if name in families:
+                    families[name][3].extend(samples)
+                else:
+                    families[name] = (name, kind, documentation, list(samples))
+        return list(families.values())
+
+    def render(self) -> str:
+        lines = []
+        for name, kind, documentation, samples in self.collect():
+            self._render_family(lines, name, kind, documentation, samples)
+        lines.append("")
+        return "\n".join(lines)
+
+    def _register(self, metric: _Metric):
+        existing: Optional[_Metric] = self._metrics.get(metric.name)
+        if existing is not None:
+            # Modules may be imported from several places; hand back the same metric
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    @staticmethod
+    def _render_family(
+        lines: list[str],
+        name: str,
+        kind: str,
+        documentation: str,
+        samples: Iterable[Sample],
+    ) -> None:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            lines.append(
+                f"{sample_name}{_format_labels(labels)} {_format_value(value)}"
+            )
+
+
+# Shared by everything in the process
+registry = MetricsRegistry()
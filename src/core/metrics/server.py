@@ -0,0 +1,87 @@
+import asyncio
+from typing import Callable, Optional
+
+from src.core.metrics.registry import MetricsRegistry, registry
+
+REQUEST_TIMEOUT_SECONDS = 5.0
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Serves GET /metrics and GET /health for processes without a web framework,
+    such as the consumer. A bare asyncio server: one request per connection,
+    handled on the process's own event loop, so a scrape also tells whether
+    that loop is responsive.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        is_healthy: Callable[[], bool] = lambda: True,
+        metrics: MetricsRegistry = registry,
+    ):
+        self._host = host
+        self._port = port
+        self._is_healthy = is_healthy
+        self._metrics = metrics
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> int:
+        """The bound port, which differs from the configured one when that is 0."""
+        if self._server is None or not self._server.sockets:
+            return self._port
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self._host, self._port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await asyncio.wait_for(
+                reader.readline(), REQUEST_TIMEOUT_SECONDS
+            )
+            # Headers are not used, but must be read before answering
+            while await asyncio.wait_for(
+                reader.readline(), REQUEST_TIMEOUT_SECONDS
+            ) not in (b"\r\n", b"\n", b""):
+                pass
+            status, content_type, body = self._respond(request_line)
+            head = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1") + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, request_line: bytes) -> tuple[str, str, bytes]:
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            return "400 Bad Request", "text/plain", b"Bad Request\n"
+        method, target, _ = parts
+        path = target.split("?", 1)[0]
+        if method != "GET":
+            return "405 Method Not Allowed", "text/plain", b"Method Not Allowed\n"
+        if path == "/metrics":
+            return "200 OK", METRICS_CONTENT_TYPE, self._metrics.render().encode()
+        if path == "/health":
+            if self._is_healthy():
+                return "200 OK", "application/json", b'{"status":"ok"}'
+            return "503 Service Unavailable", "application/json", b'{"status":"down"}'
+        return "404 Not Found", "text/plain", b"Not Found\n"
@@ -0,0 +1,43 @@
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class ThroughputMeter:
+    """
+    Events per second over a sliding window, kept as one counter per second
+    so that recording stays O(1) whatever the rate.
+    """
+
+    def __init__(
+        self, window: float = 60.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self._window = window
+        self._clock = clock
+        self._buckets: deque[list[int]] = deque()
+        self._first_record: Optional[float] = None
+
+    def record(self, count: int = 1) -> None:
+        now = self._clock()
+        if self._first_record is None:
+            self._first_record = now
+        second = int(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([second, count])
+            self._trim(second)
+
+    def rate(self) -> float:
+        now = self._clock()
+        self._trim(int(now))
+        if self._first_record is None:
+            return 0.0
+        # A process younger than the window is measured over its own lifetime,
+        # and never over less than the one-second bucket it just filled
+        elapsed = min(self._window, max(now - self._first_record, 1.0))
+        return sum(count for _, count in self._buckets) / elapsed
+
+    def _trim(self, second: int) -> None:
+        while self._buckets and self._buckets[0][0] <= second - self._window:
+            self._buckets.popleft()
@@ -0,0 +1,37 @@
+import time
+from typing import TypeVar
+
+from src.core.metrics.registry import registry
+
+U = TypeVar("U")
+
+use_case_seconds = registry.histogram(
+    "use_case_duration_seconds",
+    "Duration of use case executions, by use case and outcome.",
+    ["use_case", "outcome"],
+)
+
+
+def timed_use_case(use_case: U) -> U:
+    """
+    Records the duration of the use case's async `execute`, labelled with its
+    class. Applied where use cases are built, so the application layer never
+    knows it is measured.
+    """
+    name = type(use_case).__name__
+    succeeded = use_case_seconds.labels(name, "success")
+    failed = use_case_seconds.labels(name, "error")
+    execute = use_case.execute
+
+    async def timed_execute(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = await execute(*args, **kwargs)
+        except Exception:
+            failed.observe(time.perf_counter() - start)
+            raise
+        succeeded.observe(time.perf_counter() - start)
+        return result
+
+    use_case.execute = timed_execute
+    return use_case
@@ -0,0 +1,50 @@
+import uuid
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.database.database import Base
+
+# Channel the insert trigger notifies, so the relay can wait on LISTEN
+OUTBOX_CHANNEL = "outbox"
+
+
+class OutboxMessage(Base):
+    """
+    A message written in the same transaction as the change it announces,
+    and published to the broker by the relay once that transaction commits.
+    """
+
+    __tablename__ = "outbox"
+
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    message_id = Column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
+    exchange = Column(String, nullable=False)
+    routing_key = Column(String, nullable=False)
+    message_type = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The relay only ever looks for unsent rows, oldest first
+        Index(
+            "ix_outbox_unsent",
+            "id",
+            postgresql_where=sent_at.is_(None),
+            sqlite_where=sent_at.is_(None),
+        ),
+        # The purge deletes sent rows by age, without scanning unsent ones
+        Index(
+            "ix_outbox_sent_at",
+            "sent_at",
+            postgresql_where=sent_at.isnot(None),
+            sqlite_where=sent_at.isnot(None),
+        ),
+    )
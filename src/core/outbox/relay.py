@@ -0,0 +1,227 @@
+import asyncio
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Sequence
+
+import aio_pika
+import asyncpg
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+from src.core.messaging.tracing import trace_properties
+from src.core.metrics.registry import registry
+from src.core.metrics.throughput import ThroughputMeter
+from src.core.outbox.outbox_message import OUTBOX_CHANNEL, OutboxMessage
+
+SessionFactory = Callable[[], AsyncSession]
+
+relayed_messages = registry.counter(
+    "outbox_relayed_messages_total",
+    "Outbox messages published and marked as sent, by exchange.",
+    ["exchange"],
+)
+relay_batch_seconds = registry.histogram(
+    "outbox_relay_batch_duration_seconds",
+    "Time to claim, publish and mark one batch of outbox messages.",
+)
+backlog_messages = registry.gauge(
+    "outbox_backlog_messages", "Outbox messages not yet published."
+)
+oldest_unsent_age_seconds = registry.gauge(
+    "outbox_oldest_unsent_age_seconds", "Age of the oldest unpublished message."
+)
+
+
+def to_amqp_message(row: Row) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=row.body.encode(),
+        type=row.message_type,
+        content_type="application/json",
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        **trace_properties(row.message_id),
+    )
+
+
+class OutboxRelay:
+    """
+    Publishes committed outbox messages in id order and marks them as sent.
+
+    Each batch is claimed with FOR UPDATE SKIP LOCKED, published with broker
+    confirms and marked sent with one UPDATE, all in one transaction: a
+    crash or a failed publish leaves the rows unsent, to be published again.
+    Delivery is therefore at least once. Several relays can run side by
+    side, at the cost of ordering between their batches.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        publisher: RabbitMQPublisher,
+        batch_size: int,
+        poll_interval: float,
+    ):
+        self._session_factory = session_factory
+        self._publisher = publisher
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._throughput = ThroughputMeter()
+
+    @property
+    def messages_per_second(self) -> float:
+        return self._throughput.rate()
+
+    def notify(self, *args: Any) -> None:
+        """Wakes the relay up; usable as an asyncpg LISTEN callback."""
+        self._wakeup.set()
+
+    async def relay_batch(self) -> int:
+        """Publishes up to one batch and returns how many messages were sent."""
+        start = time.perf_counter()
+        async with self._session_factory() as session:
+            async with session.begin():
+                rows = (
+                    await session.execute(
+                        select(
+                            OutboxMessage.id,
+                            OutboxMessage.message_id,
+                            OutboxMessage.exchange,
+                            OutboxMessage.routing_key,
+                            OutboxMessage.message_type,
+                            OutboxMessage.body,
+                        )
+                        .where(OutboxMessage.sent_at.is_(None))
+                        .order_by(OutboxMessage.id)
+                        .limit(self._batch_size)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).all()
+                if not rows:
+                    return 0
+                await self._publish(rows)
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_([row.id for row in rows]))
+                    .values(sent_at=func.now())
+                )
+        relay_batch_seconds.observe(time.perf_counter() - start)
+        self._throughput.record(len(rows))
+        return len(rows)
+
+    async def run(self) -> None:
+        """Relays until cancelled, waiting for a notification or the poll interval when idle."""
+        while True:
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay_batch()
+            except Exception as e:
+                print(f" [!] Could not relay outbox messages: {e}")
+                relayed = 0
+            if relayed >= self._batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def backlog(self) -> tuple[int, Optional[float]]:
+        """Unsent messages and the age in seconds of the oldest one."""
+        async with self._session_factory() as session:
+            count, oldest = (
+                await session.execute(
+                    select(func.count(), func.min(OutboxMessage.created_at)).where(
+                        OutboxMessage.sent_at.is_(None)
+                    )
+                )
+            ).one()
+        if oldest is None:
+            return count, None
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        return count, (datetime.now(timezone.utc) - oldest).total_seconds()
+
+    async def purge_sent(self, retention: float, batch_size: int) -> int:
+        """
+        Deletes messages sent more than `retention` seconds ago, `batch_size`
+        rows per transaction (found through ix_outbox_sent_at), so the purge
+        never holds long locks or builds one huge transaction on the primary.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=retention)
+        purged = 0
+        while True:
+            async with self._session_factory() as session:
+                async with session.begin():
+                    expired = (
+                        select(OutboxMessage.id)
+                        .where(OutboxMessage.sent_at < cutoff)
+                        .order_by(OutboxMessage.sent_at)
+                        .limit(batch_size)
+                    )
+                    result = await session.execute(
+                        delete(OutboxMessage).where(
+                            OutboxMessage.id.in_(expired.scalar_subquery())
+                        )
+                    )
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
+
+    async def purge(self, interval: float, retention: float, batch_size: int) -> None:
+        """Purges sent messages every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                purged = await self.purge_sent(retention, batch_size)
+                if purged:
+                    print(f" [*] Outbox: purged {purged} sent message(s)")
+            except Exception as e:
+                print(f" [!] Could not purge sent outbox messages: {e}")
+
+    async def report(self, interval: float) -> None:
+        """Updates the backlog gauges and prints the relay's progress every `interval` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                count, age = await self.backlog()
+                backlog_messages.set(count)
+                oldest_unsent_age_seconds.set(age or 0.0)
+                oldest = f", oldest {age:.1f}s" if age is not None else ""
+                print(
+                    f" [*] Outbox: {self.messages_per_second:.1f} msg/s, "
+                    f"backlog {count}{oldest}"
+                )
+            except Exception as e:
+                print(f" [!] Could not read the outbox backlog: {e}")
+
+    async def _publish(self, rows: Sequence[Row]) -> None:
+        # Consecutive rows for the same destination go out as one confirmed batch
+        for (exchange, routing_key), group in itertools.groupby(
+            rows, key=lambda row: (row.exchange, row.routing_key)
+        ):
+            messages = [to_amqp_message(row) for row in group]
+            if exchange:
+                await self._publisher.declare_exchange(exchange)
+            await self._publisher.publish_batch(
+                messages, routing_key=routing_key, exchange_name=exchange
+            )
+            relayed_messages.labels(exchange or routing_key).inc(len(messages))
+
+
+async def listen_for_outbox(
+    database_url: str, callback: Callable[..., None]
+) -> Optional[asyncpg.Connection]:
+    """
+    LISTENs on the outbox channel with a dedicated asyncpg connection and
+    returns it, or returns None for databases without LISTEN (the relay then
+    only polls).
+    """
+    if not database_url.startswith("postgresql+asyncpg://"):
+        return None
+    connection = await asyncpg.connect(
+        database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    )
+    await connection.add_listener(OUTBOX_CHANNEL, callback)
+    return connection
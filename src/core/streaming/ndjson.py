@@ -0,0 +1,41 @@
+from typing import AsyncIterator, Optional
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Optional[bytes]]:
+    """
+    Splits a streamed body into lines as the chunks arrive.
+    Only the current line is buffered: a line longer than `max_line_bytes`
+    is skipped and yielded as None, so callers can report it.
+    """
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline == -1:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+
+            if oversized:
+                oversized = False
+                yield None
+            else:
+                buffer += chunk[start:newline]
+                if len(buffer) > max_line_bytes:
+                    yield None
+                else:
+                    yield bytes(buffer)
+            buffer.clear()
+            start = newline + 1
+
+    if oversized:
+        yield None
+    elif buffer:
+        yield bytes(buffer)
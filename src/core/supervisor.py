@@ -0,0 +1,209 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+from multiprocessing.context import BaseContext
+from typing import Callable, Iterable, Optional
+
+from src.core.metrics.registry import Family, MetricsRegistry, merge_families
+
+# A worker that stayed up this long is considered recovered: its backoff resets
+STABLE_AFTER_SECONDS = 60.0
+TICK_SECONDS = 0.5
+
+# Runs in the child: target(index, stats_queue, *args)
+WorkerTarget = Callable[..., None]
+
+
+@dataclass
+class WorkerSlot:
+    index: int
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started_at: float = 0.0
+    # Consecutive crashes, for the backoff; reset once the worker is stable
+    failures: int = 0
+    restarts: int = 0
+    restart_at: Optional[float] = None
+    healthy: bool = False
+    reported_at: float = 0.0
+    families: list[Family] = field(default_factory=list)
+    # Counters and histograms of this slot's previous processes, so the sums
+    # never go backwards when a worker is restarted
+    retired: list[Family] = field(default_factory=list)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class WorkerSupervisor:
+    """
+    Runs `workers` copies of a worker process, so CPU-bound work (bcrypt) can
+    use every core. Crashed workers are restarted with exponential backoff;
+    on stop, each worker gets SIGTERM to drain and is killed only if it does
+    not exit within `shutdown_timeout`. Workers report their metrics over a
+    queue, and `metrics` serves the sum of them.
+    """
+
+    def __init__(
+        self,
+        target: WorkerTarget,
+        workers: int,
+        args: tuple = (),
+        restart_base_delay: float = 1.0,
+        restart_max_delay: float = 60.0,
+        shutdown_timeout: float = 30.0,
+        stats_interval: float = 5.0,
+        context: Optional[BaseContext] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._target = target
+        self._args = args
+        self._restart_base_delay = restart_base_delay
+        self._restart_max_delay = restart_max_delay
+        self._shutdown_timeout = shutdown_timeout
+        self._stats_interval = stats_interval
+        # Each worker builds its own connections and engines from scratch
+        self._context = context or multiprocessing.get_context("spawn")
+        self._clock = clock
+        self._stats_queue = self._context.Queue()
+        self.slots = [WorkerSlot(index) for index in range(workers)]
+        self.metrics = MetricsRegistry()
+        self.metrics.register_collector(self._collect)
+
+    def is_healthy(self) -> bool:
+        """Every worker is up and has reported itself healthy recently."""
+        stale_before = self._clock() - 3 * self._stats_interval
+        return all(
+            slot.alive and slot.healthy and slot.reported_at >= stale_before
+            for slot in self.slots
+        )
+
+    async def run(self, stop: asyncio.Event) -> None:
+        for slot in self.slots:
+            self._start(slot)
+        try:
+            while not stop.is_set():
+                self._read_stats()
+                self._check_workers()
+                try:
+                    await asyncio.wait_for(stop.wait(), TICK_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._stop_workers()
+
+    def restart_delay(self, failures: int) -> float:
+        return min(
+            self._restart_base_delay * 2 ** max(failures - 1, 0),
+            self._restart_max_delay,
+        )
+
+    def _start(self, slot: WorkerSlot) -> None:
+        slot.process = self._context.Process(
+            target=self._target,
+            args=(slot.index, self._stats_queue, *self._args),
+            name=f"worker-{slot.index}",
+        )
+        slot.process.start()
+        slot.started_at = self._clock()
+        slot.restart_at = None
+        slot.healthy = False
+        print(f" [*] Started worker {slot.index} (pid {slot.process.pid})")
+
+    def _check_workers(self) -> None:
+        now = self._clock()
+        for slot in self.slots:
+            if slot.restart_at is not None:
+                if now >= slot.restart_at:
+                    slot.restarts += 1
+                    self._start(slot)
+                continue
+            if slot.alive:
+                if now - slot.started_at >= STABLE_AFTER_SECONDS:
+                    slot.failures = 0
+                continue
+            slot.failures += 1
+            slot.healthy = False
+            slot.retired = merge_families(
+                [slot.retired, [f for f in slot.families if f[1] != "gauge"]]
+            )
+            slot.families = []
+            delay = self.restart_delay(slot.failures)
+            slot.restart_at = now + delay
+            print(
+                f" [!] Worker {slot.index} exited with code "
+                f"{slot.process.exitcode}, restarting in {delay:.1f}s"
+            )
+
+    def _read_stats(self) -> None:
+        while True:
+            try:
+                index, pid, healthy, families = self._stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            slot = self.slots[index]
+            if slot.process is None or slot.process.pid != pid:
+                continue  # Sent by a process that has been replaced since
+            slot.healthy = healthy
+            slot.families = families
+            slot.reported_at = self._clock()
+
+    async def _stop_workers(self) -> None:
+        running = [slot.process for slot in self.slots if slot.alive]
+        for process in running:
+            # SIGTERM: the worker stops consuming and drains in-flight messages
+            process.terminate()
+        deadline = self._clock() + self._shutdown_timeout
+        while any(process.is_alive() for process in running):
+            if self._clock() >= deadline:
+                for process in running:
+                    if process.is_alive():
+                        print(f" [!] Worker {process.name} did not drain, killing it")
+                        process.kill()
+                break
+            await asyncio.sleep(TICK_SECONDS)
+        for process in running:
+            process.join()
+        self._read_stats()
+
+    def _collect(self) -> Iterable:
+        yield from merge_families(
+            families
+            for slot in self.slots
+            for families in (slot.retired, slot.families)
+        )
+        yield (
+            "consumer_workers_alive",
+            "gauge",
+            "Worker processes currently running.",
+            [("consumer_workers_alive", {}, sum(slot.alive for slot in self.slots))],
+        )
+        yield (
+            "consumer_worker_restarts_total",
+            "counter",
+            "Times a crashed worker process was restarted.",
+            [
+                (
+                    "consumer_worker_restarts_total",
+                    {"worker": str(slot.index)},
+                    slot.restarts,
+                )
+                for slot in self.slots
+            ],
+        )
+
+
+async def report_to_supervisor(
+    stats_queue,
+    index: int,
+    interval: float,
+    is_healthy: Callable[[], bool],
+    metrics: MetricsRegistry,
+) -> None:
+    """Runs in a worker: sends its health and metrics every `interval` seconds."""
+    while True:
+        stats_queue.put((index, os.getpid(), is_healthy(), metrics.collect()))
+        await asyncio.sleep(interval)
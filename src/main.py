@@ -1,14 +1,131 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from src.contexts.auth.infrastructure.auth_api import router as auth_router
+from src.contexts.auth.infrastructure.hmac_token_service import (
+    HMACTokenService,
+    parse_signing_keys,
+)
+from src.contexts.commands.infrastructure.command_api import router as command_router
+from src.contexts.commands.infrastructure.command_status_publisher import (
+    RabbitMQCommandStatusPublisher,
+)
+from src.contexts.commands.infrastructure.command_status_subscriber import (
+    CommandStatusSubscriber,
+)
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.contexts.users.infrastructure.idempotency_keys import IdempotencyKeys
 from src.contexts.users.infrastructure.user_api import router as user_router
+from src.contexts.users.infrastructure.user_event_subscriber import (
+    UserEventSubscriber,
+)
+from src.contexts.users.infrastructure.user_metrics import user_metrics_collector
+from src.core.config.settings import settings
+from src.core.container import Container
 from src.core.exceptions.custom_exceptions import (
+    BatchLimitExceededException,
+    CommandNotFoundException,
+    IdempotencyKeyReusedException,
     InvalidCredentialsException,
+    InvalidCursorException,
+    InvalidTokenException,
     UserNotFoundException,
 )
+from src.core.messaging.sharding import shard_queue_arguments, shard_queue_names
+from src.core.metrics.http import MetricsMiddleware
+from src.core.metrics.registry import registry
 
-app = FastAPI(title="Backend Hexagonal CQRS")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines, publisher, hashing pool and caches, shared by every request
+    container = Container.from_settings()
+    await container.connect()
+    app.state.container = container
+    app.state.token_service = HMACTokenService(
+        keys=parse_signing_keys(settings.AUTH_SIGNING_KEYS),
+        active_key_id=settings.AUTH_ACTIVE_KEY_ID,
+        ttl=settings.AUTH_TOKEN_TTL_SECONDS,
+        cache_size=settings.AUTH_VERIFIED_TOKEN_CACHE_SIZE,
+        cache_ttl=settings.AUTH_VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+    )
+    app.state.idempotency_keys = IdempotencyKeys(
+        max_size=settings.IDEMPOTENCY_KEYS_MAX_SIZE,
+        ttl=settings.IDEMPOTENCY_KEYS_TTL_SECONDS,
+    )
+    user_event_subscriber = UserEventSubscriber(
+        settings.RABBITMQ_URL,
+        settings.USER_EVENTS_EXCHANGE,
+        on_user_created=[
+            container.user_caches.on_user_created,
+            container.email_filter.on_user_created,
+        ],
+        on_reconnect=[
+            container.user_caches.clear,
+            container.email_filter.invalidate,
+        ],
+    )
+    # Statuses of the commands accepted by any worker; waiting requests wake
+    # on updates. Accepted commands are broadcast so every worker knows them
+    command_status_publisher = RabbitMQCommandStatusPublisher(
+        container.publisher, settings.COMMAND_EVENTS_EXCHANGE
+    )
+    command_status_publisher_task = asyncio.create_task(command_status_publisher.run())
+    command_status_store = InMemoryCommandStatusStore(
+        max_size=settings.COMMAND_STATUS_MAX_SIZE,
+        ttl=settings.COMMAND_STATUS_TTL_SECONDS,
+        status_publisher=command_status_publisher,
+    )
+    app.state.command_status_store = command_status_store
+    command_status_subscriber = CommandStatusSubscriber(
+        settings.RABBITMQ_URL,
+        settings.COMMAND_EVENTS_EXCHANGE,
+        on_command_status=[
+            command_status_store.on_command_status,
+            container.user_caches.on_command_status,
+            container.email_filter.on_command_status,
+        ],
+    )
+    metrics_collector = user_metrics_collector(
+        container.password_hasher, container.user_caches, container.email_filter
+    )
+    registry.register_collector(metrics_collector)
+    container.maintain_email_filter(use_read_engine=True)
+    # The server starts accepting at once; /ready turns green when this is
+    # done, subscribers included, however long the broker takes to come up
+    warm_up_task = asyncio.create_task(
+        container.warm_up(
+            read_connections=settings.DB_WARMUP_CONNECTIONS,
+            queues=shard_queue_names(
+                settings.USER_CREATION_QUEUE, settings.USER_CREATION_SHARDS
+            ),
+            exchanges=[settings.COMMAND_EVENTS_EXCHANGE],
+            channels=settings.RABBITMQ_WARMUP_CHANNELS,
+            queue_arguments=shard_queue_arguments(settings.USER_CREATION_SHARDS),
+            subscribers=[user_event_subscriber.start, command_status_subscriber.start],
+        )
+    )
+    try:
+        yield
+    finally:
+        warm_up_task.cancel()
+        await asyncio.gather(warm_up_task, return_exceptions=True)
+        registry.unregister_collector(metrics_collector)
+        await user_event_subscriber.stop()
+        await command_status_subscriber.stop()
+        command_status_publisher_task.cancel()
+        await asyncio.gather(command_status_publisher_task, return_exceptions=True)
+        await command_status_publisher.flush()
+        await container.close()
+
+
+app = FastAPI(title="Backend Hexagonal CQRS", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.exception_handler(UserNotFoundException)
@@ -21,6 +138,16 @@ async def user_not_found_exception_handler(
     )
 
 
+@app.exception_handler(CommandNotFoundException)
+async def command_not_found_exception_handler(
+    request: Request, exc: CommandNotFoundException
+):
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"message": str(exc)},
+    )
+
+
 @app.exception_handler(InvalidCredentialsException)
 async def invalid_credentials_exception_handler(
     request: Request, exc: InvalidCredentialsException
@@ -32,10 +159,69 @@ async def invalid_credentials_exception_handler(
     )
 
 
+@app.exception_handler(InvalidTokenException)
+async def invalid_token_exception_handler(request: Request, exc: InvalidTokenException):
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        content={"message": str(exc)},
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+@app.exception_handler(BatchLimitExceededException)
+async def batch_limit_exceeded_exception_handler(
+    request: Request, exc: BatchLimitExceededException
+):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"message": str(exc)},
+    )
+
+
+@app.exception_handler(IdempotencyKeyReusedException)
+async def idempotency_key_reused_exception_handler(
+    request: Request, exc: IdempotencyKeyReusedException
+):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"message": str(exc)},
+    )
+
+
+@app.exception_handler(InvalidCursorException)
+async def invalid_cursor_exception_handler(
+    request: Request, exc: InvalidCursorException
+):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"message": str(exc)},
+    )
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Hexagonal CQRS Backend!"}
 
 
+@app.get("/ready", include_in_schema=False)
+async def ready(request: Request):
+    # For load balancers and orchestrators: no traffic until the warm-up is done
+    if not request.app.state.container.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up"},
+        )
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Rendered only when scraped; recording a metric is just an increment
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 app.include_router(user_router, prefix="/users", tags=["users"])
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
+app.include_router(command_router, prefix="/commands", tags=["commands"])
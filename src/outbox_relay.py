@@ -0,0 +1,82 @@
+import asyncio
+import signal
+
+from src.core.config.settings import settings
+from src.core.database.database import (
+    DATABASE_URL,
+    create_session_factory,
+    create_write_engine,
+)
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+from src.core.metrics.server import MetricsServer
+from src.core.outbox.relay import OutboxRelay, listen_for_outbox
+
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    # Needs neither the read engine nor bcrypt, so it does not build a Container
+    write_engine = create_write_engine()
+    publisher = RabbitMQPublisher(settings.RABBITMQ_URL, connection_pool_size=1)
+    await publisher.connect()
+    relay = OutboxRelay(
+        create_session_factory(write_engine),
+        publisher,
+        batch_size=settings.OUTBOX_RELAY_BATCH_SIZE,
+        poll_interval=settings.OUTBOX_RELAY_POLL_INTERVAL_SECONDS,
+    )
+    # Polling alone still works, only with up to a poll interval of extra latency
+    try:
+        listener = await listen_for_outbox(DATABASE_URL, relay.notify)
+    except Exception as e:
+        print(f" [!] Could not LISTEN for outbox inserts, polling instead: {e}")
+        listener = None
+
+    relaying = asyncio.create_task(relay.run())
+    reporting = asyncio.create_task(
+        relay.report(settings.OUTBOX_RELAY_REPORT_INTERVAL_SECONDS)
+    )
+    tasks = [relaying, reporting]
+    if settings.OUTBOX_RETENTION_SECONDS:
+        tasks.append(
+            asyncio.create_task(
+                relay.purge(
+                    settings.OUTBOX_PURGE_INTERVAL_SECONDS,
+                    settings.OUTBOX_RETENTION_SECONDS,
+                    settings.OUTBOX_PURGE_BATCH_SIZE,
+                )
+            )
+        )
+    metrics_server = MetricsServer(
+        settings.OUTBOX_RELAY_METRICS_HOST,
+        settings.OUTBOX_RELAY_METRICS_PORT,
+        is_healthy=lambda: not relaying.done(),
+    )
+    if settings.OUTBOX_RELAY_METRICS_PORT:
+        await metrics_server.start()
+    print(
+        f" [*] Relaying outbox messages in batches of {settings.OUTBOX_RELAY_BATCH_SIZE}"
+        f"{' on LISTEN' if listener is not None else ''}. To exit press CTRL+C"
+    )
+
+    await stop.wait()
+    print(" [*] Shutting down")
+    # Cancellation rolls back a batch in progress; its rows stay unsent
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await metrics_server.stop()
+    if listener is not None:
+        await listener.close()
+    await publisher.close()
+    await write_engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("Interrupted")
@@ -1,53 +1,725 @@
+import argparse
 import asyncio
-import json
+import signal
+import uuid
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable, Coroutine, Optional, Sequence
 
 import aio_pika
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractIncomingMessage,
+    AbstractQueue,
+    AbstractRobustConnection,
+)
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.contexts.commands.application.command_status_publisher import (
+    CommandStatusPublisher,
+)
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.commands.infrastructure.command_status_publisher import (
+    RabbitMQCommandStatusPublisher,
+)
 from src.contexts.users.application.create_user_use_case import CreateUserUseCase
+from src.contexts.users.application.create_users_batch_use_case import (
+    CreateUsersBatchUseCase,
+)
+from src.contexts.users.application.password_hasher import PasswordHasher
 from src.contexts.users.domain.create_user import CreateUser
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+    FilteredUserRepository,
+)
+from src.contexts.users.infrastructure.stage_timed import (
+    StageTimedPasswordHasher,
+    StageTimedUserRepository,
+)
+from src.contexts.users.infrastructure.user_command_publisher import (
+    CREATE_USER_SCHEMA_VERSION,
+)
+from src.contexts.users.infrastructure.user_event_subscriber import (
+    UserEventSubscriber,
+)
 from src.contexts.users.infrastructure.user_repository import UserRepository
 from src.core.config.settings import settings
-from src.core.database.database import AsyncSessionLocal
+from src.core.container import Container
+from src.core.exceptions.custom_exceptions import UserAlreadyExistsException
+from src.core.messaging.batching import iterate_batches
+from src.core.messaging.codecs import MessageFormatError, decode_message
+from src.core.messaging.consumer_metrics import (
+    poll_queue_depth,
+    processed_messages,
+    record_received,
+    record_settled,
+    timed_stage,
+)
+from src.core.messaging.deduplication import CommandDeduplicator, SessionFactory
+from src.core.messaging.resharding import pending_messages, wait_until_drained
+from src.core.messaging.retry import MessageRetrier, RetryTopology, backoff_delays
+from src.core.messaging.sharding import (
+    owned_shards,
+    shard_queue_arguments,
+    shard_queue_name,
+    shard_queue_names,
+)
+from src.core.messaging.tracing import CommandTrace
+from src.core.messaging.worker_pool import OrderedAckWorkerPool
+from src.core.metrics.registry import registry
+from src.core.metrics.server import MetricsServer
+from src.core.metrics.use_cases import timed_use_case
+from src.core.supervisor import WorkerSupervisor, report_to_supervisor
 
+# Retrying cannot fix a malformed or invalid command or a taken email. Any
+# other error, a ValueError from the driver included, is retried
+NON_RETRYABLE_ERRORS = (UserAlreadyExistsException, MessageFormatError, ValidationError)
+DEDUP_PURGE_INTERVAL_SECONDS = 3600
 
-async def main():
+
+@dataclass
+class ConsumerDependencies:
+    # The queue the messages are consumed from, a shard of the creation queue
+    queue: str
+    password_hasher: PasswordHasher
+    email_filter: EmailExistenceFilter
+    retrier: MessageRetrier
+    deduplicator: CommandDeduplicator
+    status_publisher: CommandStatusPublisher
+    sessions: SessionFactory
+
+
+def build_user_repository(
+    session: AsyncSession, dependencies: ConsumerDependencies
+) -> StageTimedUserRepository:
+    return StageTimedUserRepository(
+        FilteredUserRepository(UserRepository(session), dependencies.email_filter)
+    )
+
+
+def record_outcome(trace: CommandTrace, outcome: str) -> None:
+    processed_messages.labels(outcome).inc()
+    trace.finish(outcome)
+
+
+def report_status(
+    message: AbstractIncomingMessage,
+    dependencies: ConsumerDependencies,
+    state: CommandState,
+    detail: Optional[str] = None,
+    resource_id: Optional[uuid.UUID] = None,
+    resource_key: Optional[str] = None,
+) -> None:
+    """Tells the API workers how the command went, so waiting clients wake up."""
+    try:
+        command_id = uuid.UUID(message.message_id)
+    except (TypeError, ValueError):
+        # Published without a command id, so nobody can be waiting for it
+        return
+    dependencies.status_publisher.publish(
+        CommandStatus(
+            command_id=command_id,
+            state=state,
+            detail=detail,
+            resource_id=resource_id,
+            resource_key=resource_key,
+        )
+    )
+
+
+def parse_command(message: AbstractIncomingMessage) -> CreateUser:
+    # Parsing and validation are a single pass, so they are timed together
+    with timed_stage("decode"):
+        return decode_message(message, CreateUser, CREATE_USER_SCHEMA_VERSION)
+
+
+async def dispose_of_failure(
+    message: AbstractIncomingMessage,
+    trace: CommandTrace,
+    error: Exception,
+    dependencies: ConsumerDependencies,
+) -> None:
+    """
+    Sends a failed message to a retry queue or the dead-letter queue, after
+    which the original can be acked. Raises if neither could be published.
+    """
+    try:
+        outcome = await dependencies.retrier.retry_or_dead_letter(message, error)
+    except Exception:
+        record_outcome(trace, "requeued")
+        raise
+    record_outcome(trace, outcome)
+    state = CommandState.RETRYING if outcome == "retried" else CommandState.FAILED
+    report_status(message, dependencies, state, detail=str(error))
+    print(f" [!] Message {message.message_id} {outcome.replace('_', ' ')}: {error}")
+
+
+async def handle_create_user(
+    message: AbstractIncomingMessage, dependencies: ConsumerDependencies
+) -> None:
+    trace = CommandTrace.start(message, dependencies.queue)
+    try:
+        command = parse_command(message)
+    except Exception as e:
+        print(f" [!] Invalid message format: {e}")
+        await dispose_of_failure(message, trace, e, dependencies)
+        return
+    print(f" [x] Received command to create user: {command.email}")
+
+    deduplicator = dependencies.deduplicator
+    # Inject dependencies and execute use case, with one session per message
+    async with dependencies.sessions() as session:
+        try:
+            with timed_stage("deduplicate"):
+                duplicate = await deduplicator.processed(session, [message.message_id])
+            if duplicate:
+                record_outcome(trace, "duplicate")
+                print(f" [=] Command {message.message_id} was already processed.")
+                return
+            use_case = timed_use_case(
+                CreateUserUseCase(
+                    build_user_repository(session, dependencies),
+                    dependencies.password_hasher,
+                )
+            )
+            user = await use_case.execute(command)
+            deduplicator.record(session, [message.message_id])
+            with timed_stage("commit"):
+                await session.commit()
+        except UserAlreadyExistsException as e:
+            await session.rollback()
+            deduplicator.remember([message.message_id])
+            record_outcome(trace, "already_exists")
+            report_status(message, dependencies, CommandState.FAILED, detail=str(e))
+            print(f" [!] {e}")
+            return
+        except Exception as e:
+            await session.rollback()
+            print(f" [!] Error processing message: {e}")
+            await dispose_of_failure(message, trace, e, dependencies)
+            return
+    deduplicator.remember([message.message_id])
+    record_outcome(trace, "created")
+    # The email travels with the status: the API's filter and caches must know
+    # it before user.created comes through the outbox, or a login right
+    # after a succeeded status would be refused
+    report_status(
+        message,
+        dependencies,
+        CommandState.SUCCEEDED,
+        resource_id=user.id,
+        resource_key=user.email,
+    )
+    print(f" [v] User {command.email} created successfully.")
+
+
+async def settle_failure(
+    message: AbstractIncomingMessage,
+    trace: CommandTrace,
+    error: Exception,
+    dependencies: ConsumerDependencies,
+) -> None:
+    try:
+        await dispose_of_failure(message, trace, error, dependencies)
+    except Exception as e:
+        print(f" [!] Could not retry message {message.message_id}, requeueing: {e}")
+        await message.reject(requeue=True)
+        record_settled("reject")
+        return
+    await message.ack()
+    record_settled("ack")
+
+
+async def handle_create_user_batch(
+    messages: list[AbstractIncomingMessage], dependencies: ConsumerDependencies
+) -> None:
+    commands = []
+    valid_messages = []
+    traces = []
+    for message in messages:
+        trace = CommandTrace.start(message, dependencies.queue)
+        try:
+            commands.append(parse_command(message))
+            valid_messages.append(message)
+            traces.append(trace)
+        except Exception as e:
+            print(f" [!] Invalid message format: {e}")
+            await settle_failure(message, trace, e, dependencies)
+
+    if not commands:
+        return
+    print(f" [x] Received batch of {len(commands)} command(s) to create users")
+
+    deduplicator = dependencies.deduplicator
+    async with dependencies.sessions() as session:
+        try:
+            with timed_stage("deduplicate"):
+                duplicates = await deduplicator.processed(
+                    session, [message.message_id for message in valid_messages]
+                )
+            pending = [
+                (message, trace, command)
+                for message, trace, command in zip(valid_messages, traces, commands)
+                if message.message_id not in duplicates
+            ]
+            created = []
+            if pending:
+                use_case = timed_use_case(
+                    CreateUsersBatchUseCase(
+                        build_user_repository(session, dependencies),
+                        dependencies.password_hasher,
+                    )
+                )
+                created = await use_case.execute([command for _, _, command in pending])
+                deduplicator.record(
+                    session,
+                    [
+                        message.message_id
+                        for (message, _, _), user in zip(pending, created)
+                        if user is not None
+                    ],
+                )
+                with timed_stage("commit"):
+                    await session.commit()
+        except Exception as e:
+            await session.rollback()
+            print(f" [!] Error processing batch: {e}")
+            for message, trace in zip(valid_messages, traces):
+                await settle_failure(message, trace, e, dependencies)
+            return
+
+    for message, trace in zip(valid_messages, traces):
+        if message.message_id in duplicates:
+            record_outcome(trace, "duplicate")
+            print(f" [=] Command {message.message_id} was already processed.")
+            await message.ack()
+            record_settled("ack")
+
+    deduplicator.remember(message.message_id for message, _, _ in pending)
+    # Each message is acked on its own, once its row is known to be committed
+    for (message, trace, command), user in zip(pending, created):
+        if user is not None:
+            record_outcome(trace, "created")
+            report_status(
+                message,
+                dependencies,
+                CommandState.SUCCEEDED,
+                resource_id=user.id,
+                resource_key=user.email,
+            )
+            print(f" [v] User {command.email} created successfully.")
+        else:
+            detail = f"User with email {command.email} already exists."
+            record_outcome(trace, "already_exists")
+            report_status(message, dependencies, CommandState.FAILED, detail=detail)
+            print(f" [!] {detail}")
+        await message.ack()
+        record_settled("ack")
+
+
+async def consume(queue: AbstractQueue, pool: OrderedAckWorkerPool) -> None:
+    async with queue.iterator() as queue_iter:
+        async for message in queue_iter:
+            await pool.submit(message)
+
+
+async def consume_batches(
+    queue: AbstractQueue,
+    dependencies: ConsumerDependencies,
+    in_flight: set[asyncio.Task],
+) -> None:
+    async with queue.iterator() as queue_iter:
+        async for batch in iterate_batches(
+            queue_iter,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            timeout=settings.CONSUMER_BATCH_TIMEOUT_SECONDS,
+        ):
+            record_received(len(batch))
+            # Shielded so that shutdown never interrupts a batch halfway
+            task = asyncio.create_task(handle_create_user_batch(batch, dependencies))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            await asyncio.shield(task)
+
+
+async def consume_all(
+    consumers: list[Coroutine], before: Optional[Awaitable[None]] = None
+) -> None:
+    """Runs the consumers, once `before` (draining another layout) is done."""
+    try:
+        if before is not None:
+            await before
+    except BaseException:
+        for consumer in consumers:
+            consumer.close()
+        raise
+    await asyncio.gather(*consumers)
+
+
+def unsharded_layout(shards: int, retry_delays: Sequence[float]) -> list[RetryTopology]:
+    """
+    The unsharded queue, when commands are sharded. A sharded layout cannot
+    be found without its shard count, which USER_CREATION_PREVIOUS_SHARDS
+    gives when resharding.
+    """
+    if shards <= 1:
+        return []
+    return [RetryTopology(settings.USER_CREATION_QUEUE, retry_delays)]
+
+
+async def drain_previous_layout(
+    connection: AbstractRobustConnection,
+    channel: AbstractChannel,
+    previous_shards: int,
+    worker: Optional[int],
+    workers: int,
+    retry_delays: Sequence[float],
+    dependencies_for: Callable[[RetryTopology], ConsumerDependencies],
+    pools: list[OrderedAckWorkerPool],
+) -> None:
+    """
+    Consumes this worker's share of the queues of the previous shard layout,
+    serially, until they and their retry queues are empty; then waits until
+    every worker has finished its share. Only then can the new layout start
+    without two commands for one email being processed at once.
+    """
+    interval = settings.CONSUMER_QUEUE_DEPTH_POLL_SECONDS
+    topologies = [
+        RetryTopology(name, retry_delays)
+        for name in shard_queue_names(settings.USER_CREATION_QUEUE, previous_shards)
+    ]
+    # Round-robin as for the new layout; the unsharded queue goes to worker 0
+    mine = [
+        topology
+        for shard, topology in enumerate(topologies)
+        if shard % workers == (worker or 0)
+    ]
+    print(
+        f" [*] Draining {', '.join(t.queue_name for t in mine) or 'nothing'} "
+        f"of the previous layout ({previous_shards} shard(s)) first"
+    )
+    while mine:
+        consuming = []
+        drain_pools = []
+        for topology in mine:
+            queue = await channel.declare_queue(
+                topology.queue_name,
+                durable=True,
+                arguments=shard_queue_arguments(previous_shards),
+            )
+            await topology.declare(channel)
+            pool = OrderedAckWorkerPool(
+                partial(handle_create_user, dependencies=dependencies_for(topology)),
+                concurrency=1,
+                requeue_on_error=True,
+            )
+            drain_pools.append(pool)
+            consuming.append(asyncio.create_task(consume(queue, pool)))
+        pools.extend(drain_pools)
+        try:
+            await wait_until_drained(connection, mine, interval)
+        finally:
+            for task in consuming:
+                task.cancel()
+            await asyncio.gather(*consuming, return_exceptions=True)
+            await asyncio.gather(*(pool.drain() for pool in drain_pools))
+        # A message retried while the last ones were handled brings us back
+        if not await pending_messages(connection, mine):
+            break
+    await wait_until_drained(connection, topologies, interval, count_consumers=True)
+    print(" [*] Previous layout drained")
+
+
+async def main(
+    worker: Optional[int] = None,
+    stats_queue=None,
+    hashing_workers: int = settings.PASSWORD_HASHING_WORKERS,
+    workers: int = 1,
+):
+    """
+    Consumes until SIGINT/SIGTERM. Under the supervisor, `worker` is this
+    process's index and metrics go to `stats_queue` instead of a port.
+
+    With sharded queues the process consumes its share of the shards, each
+    one serially, so two commands for the same email are never in flight
+    at once; the concurrency comes from the number of shards instead.
+    """
     connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
-    queue_name = "user_creation_queue"
+    shards = settings.USER_CREATION_SHARDS
+    my_shards = owned_shards(shards, worker, workers)
+    queue_names = [
+        shard_queue_name(settings.USER_CREATION_QUEUE, shard, shards)
+        for shard in my_shards
+    ]
+    concurrency = settings.CONSUMER_CONCURRENCY if shards <= 1 else 1
+    parallelism = concurrency * len(queue_names)
+    batch_size = settings.CONSUMER_BATCH_SIZE
+    retry_delays = backoff_delays(
+        settings.CONSUMER_MAX_ATTEMPTS,
+        settings.CONSUMER_RETRY_BASE_DELAY_SECONDS,
+        settings.CONSUMER_RETRY_BACKOFF_FACTOR,
+    )
+    previous_shards = settings.USER_CREATION_PREVIOUS_SHARDS
+    resharding = previous_shards > 0 and previous_shards != shards
+    if not resharding:
+        orphaned = unsharded_layout(shards, retry_delays)
+        if await pending_messages(connection, orphaned):
+            await connection.close()
+            # Consuming now could run a command for an email while an older
+            # one for it still waits in the other layout
+            raise RuntimeError(
+                f"Commands are still queued in "
+                f"{', '.join(t.queue_name for t in orphaned)}: set "
+                "USER_CREATION_PREVIOUS_SHARDS to the shard count they were "
+                "published with, so they are drained first."
+            )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    # Write engine, publisher, bcrypt pool and email filter, as in the API; no
+    # read engine, since the consumer only writes
+    container = Container.from_settings(
+        rabbitmq_connection_pool_size=1,
+        password_hashing_workers=hashing_workers,
+        read_engine=False,
+    )
+    await container.connect()
+    # Skips the duplicate check for emails that were never registered; users
+    # created by other consumers arrive through the user events
+    email_filter = container.email_filter
+    user_event_subscriber = UserEventSubscriber(
+        settings.RABBITMQ_URL,
+        settings.USER_EVENTS_EXCHANGE,
+        on_user_created=[email_filter.on_user_created],
+        on_reconnect=[email_filter.invalidate],
+    )
+    container.maintain_email_filter(use_read_engine=False)
+    # Messages wait in the queue rather than hitting cold connections and workers
+    await container.warm_up(
+        write_connections=min(settings.DB_WARMUP_CONNECTIONS, parallelism),
+        exchanges=[settings.COMMAND_EVENTS_EXCHANGE],
+        channels=1,
+        subscribers=[user_event_subscriber.start],
+    )
+    deduplicator = CommandDeduplicator(
+        max_size=settings.CONSUMER_DEDUP_MAX_SIZE,
+        ttl=settings.CONSUMER_DEDUP_TTL_SECONDS,
+        use_table=settings.CONSUMER_DEDUP_TABLE_ENABLED,
+    )
+    dedup_purge_task = asyncio.create_task(
+        deduplicator.maintain(container.sessions, DEDUP_PURGE_INTERVAL_SECONDS)
+    )
+    publisher = container.publisher
+    status_publisher = RabbitMQCommandStatusPublisher(
+        publisher, settings.COMMAND_EVENTS_EXCHANGE
+    )
+    status_publisher_task = asyncio.create_task(status_publisher.run())
+    password_hasher = StageTimedPasswordHasher(container.password_hasher)
+
+    def dependencies_for(retry_topology: RetryTopology) -> ConsumerDependencies:
+        # Each queue retries into its own topology, so a retried command
+        # comes back to the shard it was routed to
+        return ConsumerDependencies(
+            queue=retry_topology.queue_name,
+            password_hasher=password_hasher,
+            email_filter=email_filter,
+            retrier=MessageRetrier(publisher, retry_topology, NON_RETRYABLE_ERRORS),
+            deduplicator=deduplicator,
+            status_publisher=status_publisher,
+            sessions=container.sessions,
+        )
 
     async with connection:
         channel = await connection.channel()
-        await channel.set_qos(prefetch_count=1)  # Process one message at a time
+        # The broker must hand out at least as many messages as we can process at once
+        await channel.set_qos(
+            prefetch_count=max(
+                settings.CONSUMER_PREFETCH_COUNT, concurrency, batch_size
+            )
+        )
+
+        consumers = []
+        pools = []
+        in_flight: set[asyncio.Task] = set()
+        for queue_name in queue_names:
+            queue = await channel.declare_queue(
+                queue_name, durable=True, arguments=shard_queue_arguments(shards)
+            )
+            retry_topology = RetryTopology(queue_name, retry_delays)
+            await retry_topology.declare(channel)
+            queue_dependencies = dependencies_for(retry_topology)
+            if batch_size > 1:
+                consumers.append(consume_batches(queue, queue_dependencies, in_flight))
+            else:
+                pool = OrderedAckWorkerPool(
+                    partial(handle_create_user, dependencies=queue_dependencies),
+                    concurrency=concurrency,
+                    # The handler already retried or dead-lettered anything it could
+                    requeue_on_error=True,
+                )
+                pools.append(pool)
+                consumers.append(consume(queue, pool))
+        draining = None
+        if resharding:
+            draining = drain_previous_layout(
+                connection,
+                channel,
+                previous_shards,
+                worker,
+                workers,
+                retry_delays,
+                dependencies_for,
+                pools,
+            )
+        consuming = asyncio.create_task(consume_all(consumers, before=draining))
+
+        async def drain():
+            await asyncio.gather(*in_flight, *(pool.drain() for pool in pools))
+
+        mode = (
+            f"in batches of {batch_size}"
+            if batch_size > 1
+            else f"with {concurrency} worker(s) each"
+        )
+        print(
+            f" [*] Waiting for messages on {', '.join(queue_names)} {mode}. "
+            "To exit press CTRL+C"
+        )
+
+        # Healthy while connected to the broker and still consuming
+        def is_healthy() -> bool:
+            return not connection.is_closed and not consuming.done()
+
+        metrics_server = MetricsServer(
+            settings.CONSUMER_METRICS_HOST,
+            settings.CONSUMER_METRICS_PORT,
+            is_healthy=is_healthy,
+        )
+        reporting_tasks = []
+        if worker is not None:
+            # The supervisor serves the sum of all workers on the metrics port
+            reporting_tasks.append(
+                asyncio.create_task(
+                    report_to_supervisor(
+                        stats_queue,
+                        worker,
+                        settings.CONSUMER_STATS_INTERVAL_SECONDS,
+                        is_healthy,
+                        registry,
+                    )
+                )
+            )
+        elif settings.CONSUMER_METRICS_PORT:
+            await metrics_server.start()
+            print(f" [*] Serving /metrics and /health on port {metrics_server.port}")
+        # A shared queue has the same depth for every worker, so only one
+        # reports it; shards are reported by the worker that owns them
+        if shards > 1 or not worker:
+            reporting_tasks.extend(
+                asyncio.create_task(
+                    poll_queue_depth(
+                        connection,
+                        queue_name,
+                        settings.CONSUMER_QUEUE_DEPTH_POLL_SECONDS,
+                    )
+                )
+                for queue_name in queue_names
+            )
 
-        queue = await channel.declare_queue(queue_name, durable=True)
+        stopping = asyncio.create_task(stop.wait())
+        await asyncio.wait({consuming, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+        consuming.cancel()
+        try:
+            await consuming
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Let in-flight messages finish and be acked before closing the channel
+            print(" [*] Shutting down, waiting for in-flight messages")
+            await drain()
+            for task in reporting_tasks:
+                task.cancel()
+            await asyncio.gather(*reporting_tasks, return_exceptions=True)
+            await metrics_server.stop()
+            await user_event_subscriber.stop()
+            dedup_purge_task.cancel()
+            await asyncio.gather(dedup_purge_task, return_exceptions=True)
+            status_publisher_task.cancel()
+            await asyncio.gather(status_publisher_task, return_exceptions=True)
+            await status_publisher.flush()
+            await container.close()
 
-        print(" [*] Waiting for messages. To exit press CTRL+C")
 
-        async for message in queue:
-            async with message.process():
-                try:
-                    data = json.loads(message.body.decode())
-                    command = CreateUser(**data)
-                    print(f" [x] Received command to create user: {command.email}")
+def run_worker(worker: int, stats_queue, hashing_workers: int, workers: int) -> None:
+    """Entry point of a worker process started by the supervisor."""
+    try:
+        asyncio.run(main(worker, stats_queue, hashing_workers, workers))
+    except KeyboardInterrupt:
+        pass
+
+
+async def supervise(workers: int) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    shards = settings.USER_CREATION_SHARDS
+    if 1 < shards < workers:
+        # A shard has a single consumer: the extra workers would have nothing to do
+        print(f" [!] Only {shards} shard(s) for {workers} workers, starting {shards}")
+        workers = shards
+    supervisor = WorkerSupervisor(
+        run_worker,
+        workers,
+        # The bcrypt processes are shared out, so N workers do not oversubscribe
+        args=(max(1, settings.PASSWORD_HASHING_WORKERS // workers), workers),
+        restart_base_delay=settings.CONSUMER_RESTART_BASE_DELAY_SECONDS,
+        restart_max_delay=settings.CONSUMER_RESTART_MAX_DELAY_SECONDS,
+        shutdown_timeout=settings.CONSUMER_SHUTDOWN_TIMEOUT_SECONDS,
+        stats_interval=settings.CONSUMER_STATS_INTERVAL_SECONDS,
+    )
+    metrics_server = MetricsServer(
+        settings.CONSUMER_METRICS_HOST,
+        settings.CONSUMER_METRICS_PORT,
+        is_healthy=supervisor.is_healthy,
+        metrics=supervisor.metrics,
+    )
+    if settings.CONSUMER_METRICS_PORT:
+        await metrics_server.start()
+        print(
+            f" [*] Serving /metrics and /health of {workers} worker(s) "
+            f"on port {metrics_server.port}"
+        )
+    try:
+        await supervisor.run(stop)
+    finally:
+        print(" [*] All workers stopped")
+        await metrics_server.stop()
 
-                    # Inject dependencies and execute use case
-                    async with AsyncSessionLocal() as session:
-                        try:
-                            user_repository = UserRepository(session)
-                            use_case = CreateUserUseCase(user_repository)
-                            await use_case.execute(command)
-                            await session.commit()
-                            print(f" [v] User {command.email} created successfully.")
-                        except Exception as e:
-                            await session.rollback()
-                            print(f" [!] Error processing message: {e}")
-                            # Optional: requeue the message or log the error
 
-                except Exception as e:
-                    print(f" [!] Invalid message format: {e}")
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Consumes user creation commands.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.CONSUMER_WORKERS,
+        help="Worker processes to run under a supervisor; 1 runs in this process.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        asyncio.run(main())
+        if args.workers > 1:
+            asyncio.run(supervise(args.workers))
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("Interrupted")
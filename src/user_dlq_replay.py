@@ -0,0 +1,128 @@
+"""
+Moves dead-lettered user creation commands back to the work queue.
+
+    python -m src.user_dlq_replay --dry-run
+    python -m src.user_dlq_replay --error-type OperationalError --limit 100
+
+Replayed messages start over as a first attempt, on the shard of their
+email in the current layout; while resharding, the dead-letter queues of
+the previous layout are replayed too. Messages that are skipped, or only
+listed with --dry-run, stay in the dead-letter queue.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage
+
+from src.contexts.users.domain.create_user import CreateUser
+from src.contexts.users.infrastructure.user_command_publisher import (
+    CREATE_USER_SCHEMA_VERSION,
+)
+from src.core.config.settings import settings
+from src.core.messaging.codecs import decode_message
+from src.core.messaging.retry import (
+    ATTEMPT_HEADER,
+    ERROR_HEADER,
+    ERROR_TYPE_HEADER,
+    RetryTopology,
+    backoff_delays,
+    replay_copy,
+)
+from src.core.messaging.sharding import (
+    shard_for,
+    shard_key,
+    shard_queue_arguments,
+    shard_queue_name,
+    shard_queue_names,
+)
+
+
+def route(message: AbstractIncomingMessage, shards: int) -> str:
+    """The current shard queue of the command's email."""
+    try:
+        command = decode_message(message, CreateUser, CREATE_USER_SCHEMA_VERSION)
+    except ValueError:
+        # Unreadable, so it cannot race anything: any shard will reject it again
+        shard = 0
+    else:
+        shard = shard_for(shard_key(command.email), shards)
+    return shard_queue_name(settings.USER_CREATION_QUEUE, shard, shards)
+
+
+async def replay(
+    limit: Optional[int], error_type: Optional[str], dry_run: bool
+) -> tuple[int, int]:
+    """Returns how many messages were replayed (or would be) and skipped."""
+    shards = settings.USER_CREATION_SHARDS
+    layouts = [shards]
+    previous_shards = settings.USER_CREATION_PREVIOUS_SHARDS
+    if previous_shards > 0 and previous_shards != shards:
+        layouts.append(previous_shards)
+    delays = backoff_delays(
+        settings.CONSUMER_MAX_ATTEMPTS,
+        settings.CONSUMER_RETRY_BASE_DELAY_SECONDS,
+        settings.CONSUMER_RETRY_BACKOFF_FACTOR,
+    )
+    connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
+    replayed = skipped = 0
+    async with connection:
+        channel = await connection.channel(publisher_confirms=True)
+        for queue_name in shard_queue_names(settings.USER_CREATION_QUEUE, shards):
+            await channel.declare_queue(
+                queue_name, durable=True, arguments=shard_queue_arguments(shards)
+            )
+        for layout in layouts:
+            for queue_name in shard_queue_names(settings.USER_CREATION_QUEUE, layout):
+                topology = RetryTopology(queue_name, delays)
+                await topology.declare(channel)
+                dead_letter_queue = await channel.get_queue(topology.dead_letter_queue)
+                # Messages left unacked go back to the dead-letter queue when
+                # the channel closes; until then `get` does not hand them out again
+                while limit is None or replayed < limit:
+                    message = await dead_letter_queue.get(no_ack=False, fail=False)
+                    if message is None:
+                        break
+                    headers = message.headers or {}
+                    if error_type and headers.get(ERROR_TYPE_HEADER) != error_type:
+                        skipped += 1
+                        continue
+
+                    print(
+                        f" [{'-' if dry_run else '>'}] {message.message_id} "
+                        f"after {headers.get(ATTEMPT_HEADER, 1)} attempt(s): "
+                        f"{headers.get(ERROR_TYPE_HEADER)}: "
+                        f"{headers.get(ERROR_HEADER)}"
+                    )
+                    replayed += 1
+                    if dry_run:
+                        continue
+                    await channel.default_exchange.publish(
+                        replay_copy(message), routing_key=route(message, shards)
+                    )
+                    await message.ack()
+    return replayed, skipped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, help="Replay at most this many.")
+    parser.add_argument(
+        "--error-type", help="Only replay messages that failed with this error."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="List the messages, replay nothing."
+    )
+    args = parser.parse_args()
+
+    replayed, skipped = asyncio.run(replay(args.limit, args.error_type, args.dry_run))
+    action = "Would replay" if args.dry_run else "Replayed"
+    print(f" [*] {action} {replayed} message(s), skipped {skipped}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
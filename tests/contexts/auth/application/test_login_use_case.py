@@ -1,8 +1,9 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from src.contexts.auth.application.login_use_case import LoginUseCase
+from src.contexts.auth.domain.auth_token import AuthToken
 from src.contexts.auth.domain.login import Login
 from src.contexts.users.domain.user import User
 from src.core.exceptions.custom_exceptions import InvalidCredentialsException
@@ -18,15 +19,28 @@ async def test_login_successful_with_valid_credentials():
     # Create a mock user found in the DB
     mock_user = AsyncMock(spec=User)
     mock_user.name = "Test User"
-    # Mock `verify_password` to return True
-    mock_user.verify_password.return_value = True
+    mock_user.hashed_password = "stored_hash"
 
     # Create the user repository mock
     mock_user_repository = AsyncMock()
     mock_user_repository.find_by_email.return_value = mock_user
 
+    # Mock the password hasher `verify` to return True
+    mock_password_hasher = AsyncMock()
+    mock_password_hasher.verify.return_value = True
+
+    # Mock the token service to issue a known token
+    mock_token_service = MagicMock()
+    mock_token_service.issue.return_value = AuthToken(
+        access_token="signed-token", token_type="bearer", expires_in=3600
+    )
+
     # Instantiate the use case
-    use_case = LoginUseCase(user_repository=mock_user_repository)
+    use_case = LoginUseCase(
+        user_repository=mock_user_repository,
+        password_hasher=mock_password_hasher,
+        token_service=mock_token_service,
+    )
 
     # Act
     auth_token = await use_case.execute(command)
@@ -36,12 +50,13 @@ async def test_login_successful_with_valid_credentials():
     mock_user_repository.find_by_email.assert_called_once_with(command.email)
 
     # Verify password verification call
-    mock_user.verify_password.assert_called_once_with(command.password)
+    mock_password_hasher.verify.assert_called_once_with(command.password, "stored_hash")
 
     # Check the returned token
     assert auth_token is not None
     assert auth_token.token_type == "bearer"
-    assert "dummy-jwt-for-Test User" in auth_token.access_token
+    mock_token_service.issue.assert_called_once_with(mock_user)
+    assert auth_token.access_token == "signed-token"
 
 
 @pytest.mark.asyncio
@@ -53,14 +68,23 @@ async def test_login_fails_with_invalid_password():
 
     # Create a mock user
     mock_user = AsyncMock(spec=User)
-    # Mock `verify_password` to return False
-    mock_user.verify_password.return_value = False
+    mock_user.hashed_password = "stored_hash"
 
     # Create the repository mock
     mock_user_repository = AsyncMock()
     mock_user_repository.find_by_email.return_value = mock_user
 
-    use_case = LoginUseCase(user_repository=mock_user_repository)
+    # Mock the password hasher `verify` to return False
+    mock_password_hasher = AsyncMock()
+    mock_password_hasher.verify.return_value = False
+
+    mock_token_service = MagicMock()
+
+    use_case = LoginUseCase(
+        user_repository=mock_user_repository,
+        password_hasher=mock_password_hasher,
+        token_service=mock_token_service,
+    )
 
     # Act & Assert
     with pytest.raises(InvalidCredentialsException):
@@ -68,7 +92,8 @@ async def test_login_fails_with_invalid_password():
 
     # Verify interactions
     mock_user_repository.find_by_email.assert_called_once_with(command.email)
-    mock_user.verify_password.assert_called_once_with(command.password)
+    mock_password_hasher.verify.assert_called_once_with(command.password, "stored_hash")
+    mock_token_service.issue.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -83,11 +108,20 @@ async def test_login_fails_if_user_does_not_exist():
     # Mock `find_by_email` to return None
     mock_user_repository.find_by_email.return_value = None
 
-    use_case = LoginUseCase(user_repository=mock_user_repository)
+    mock_password_hasher = AsyncMock()
+
+    mock_token_service = MagicMock()
+
+    use_case = LoginUseCase(
+        user_repository=mock_user_repository,
+        password_hasher=mock_password_hasher,
+        token_service=mock_token_service,
+    )
 
     # Act & Assert
     with pytest.raises(InvalidCredentialsException):
         await use_case.execute(command)
 
-    # Verify user lookup attempt
+    # Verify user lookup attempt and that no password was verified
     mock_user_repository.find_by_email.assert_called_once_with(command.email)
+    mock_password_hasher.verify.assert_not_called()
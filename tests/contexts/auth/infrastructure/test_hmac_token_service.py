@@ -0,0 +1,110 @@
+import pytest
+
+from src.contexts.auth.infrastructure.hmac_token_service import (
+    HMACTokenService,
+    parse_signing_keys,
+)
+from src.contexts.users.domain.user import User
+from src.core.exceptions.custom_exceptions import InvalidTokenException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def token_service(keys="old:old-secret,new:new-secret", active="new", clock=None):
+    return HMACTokenService(
+        keys=parse_signing_keys(keys),
+        active_key_id=active,
+        ttl=3600,
+        cache_size=100,
+        cache_ttl=60,
+        clock=clock or FakeClock(),
+    )
+
+
+@pytest.fixture
+def user():
+    return User(name="Test User", email="test@example.com", hashed_password="hash")
+
+
+def test_issued_token_is_verified_into_its_claims(user):
+    """
+    Test that a freshly issued token round-trips into the identity of the user.
+    """
+    service = token_service()
+
+    auth_token = service.issue(user)
+    claims = service.verify(auth_token.access_token)
+
+    assert auth_token.token_type == "bearer"
+    assert auth_token.expires_in == 3600
+    assert claims.sub == user.id
+    assert claims.email == user.email
+    assert claims.exp - claims.iat == 3600
+
+
+def test_tokens_of_a_rotated_key_stay_valid(user):
+    """
+    Test that tokens signed with a previous key are accepted while it is configured.
+    """
+    old_token = token_service(active="old").issue(user).access_token
+
+    assert token_service(active="new").verify(old_token).sub == user.id
+
+    with pytest.raises(InvalidTokenException):
+        token_service(keys="new:new-secret", active="new").verify(old_token)
+
+
+def test_tampered_token_is_rejected(user):
+    """
+    Test that changing the payload invalidates the signature.
+    """
+    service = token_service()
+    header, payload, signature = service.issue(user).access_token.split(".")
+    other_payload = (
+        token_service()
+        .issue(User(name="Admin", email="admin@example.com", hashed_password="hash"))
+        .access_token.split(".")[1]
+    )
+
+    with pytest.raises(InvalidTokenException):
+        service.verify(f"{header}.{other_payload}.{signature}")
+    with pytest.raises(InvalidTokenException):
+        service.verify("not-a-token")
+
+
+def test_expired_token_is_rejected_even_when_cached(user):
+    """
+    Test that the verified-token cache never extends the lifetime of a token.
+    """
+    clock = FakeClock()
+    service = token_service(clock=clock)
+    token = service.issue(user).access_token
+    service.verify(token)
+
+    clock.now += 3600
+
+    with pytest.raises(InvalidTokenException):
+        service.verify(token)
+
+
+def test_malformed_signing_keys_are_refused():
+    """
+    Test that a key without an id is reported at startup.
+    """
+    with pytest.raises(ValueError):
+        parse_signing_keys("just-a-secret")
+
+
+@pytest.mark.parametrize("value", ["", "  "], ids=repr)
+def test_missing_signing_keys_are_refused(value):
+    """
+    Test that the API cannot start without a signing secret.
+    """
+    with pytest.raises(ValueError):
+        parse_signing_keys(value)
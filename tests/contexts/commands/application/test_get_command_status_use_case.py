@@ -0,0 +1,115 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.contexts.commands.application.get_command_status_use_case import (
+    GetCommandStatusUseCase,
+)
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.core.exceptions.custom_exceptions import CommandNotFoundException
+
+
+async def until_waiting(store: InMemoryCommandStatusStore) -> None:
+    while not store.waiting:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_returns_the_current_status_without_waiting():
+    """
+    Test that without `wait` the use case answers with the status it has.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.accept(command_id)
+
+    status = await GetCommandStatusUseCase(store, max_wait=5).execute(command_id)
+
+    assert status.state == CommandState.PENDING
+
+
+@pytest.mark.asyncio
+async def test_unknown_command_raises_not_found():
+    """
+    Test that a command the store never saw is reported as not found.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+
+    with pytest.raises(CommandNotFoundException):
+        await GetCommandStatusUseCase(store, max_wait=5).execute(uuid.uuid4())
+
+
+@pytest.mark.asyncio
+async def test_long_poll_returns_as_soon_as_the_command_is_final():
+    """
+    Test that a waiting request skips intermediate states and returns the
+    final status right after it arrives, well before `wait` runs out.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.accept(command_id)
+    use_case = GetCommandStatusUseCase(store, max_wait=30)
+
+    waiting = asyncio.create_task(use_case.execute(command_id, wait=10))
+    await until_waiting(store)
+    store.update(CommandStatus(command_id=command_id, state=CommandState.RETRYING))
+    await until_waiting(store)
+    assert not waiting.done()
+    resource_id = uuid.uuid4()
+    store.update(
+        CommandStatus(
+            command_id=command_id,
+            state=CommandState.SUCCEEDED,
+            resource_id=resource_id,
+        )
+    )
+
+    status = await asyncio.wait_for(waiting, timeout=1)
+    assert status.state == CommandState.SUCCEEDED
+    assert status.resource_id == resource_id
+
+
+@pytest.mark.asyncio
+async def test_long_poll_gives_up_after_wait():
+    """
+    Test that a command that stays pending is returned as pending once
+    `wait` has passed.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.accept(command_id)
+
+    status = await GetCommandStatusUseCase(store, max_wait=30).execute(
+        command_id, wait=0.01
+    )
+
+    assert status.state == CommandState.PENDING
+    assert store.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_every_change_until_final():
+    """
+    Test that the stream emits the current status and then each change,
+    and stops after the final one.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.accept(command_id)
+    use_case = GetCommandStatusUseCase(store, max_wait=30)
+
+    async def collect():
+        return [status.state async for status in use_case.stream(command_id, 10)]
+
+    streaming = asyncio.create_task(collect())
+    await until_waiting(store)
+    store.update(CommandStatus(command_id=command_id, state=CommandState.RETRYING))
+    await until_waiting(store)
+    store.update(CommandStatus(command_id=command_id, state=CommandState.FAILED))
+
+    states = await asyncio.wait_for(streaming, timeout=1)
+    assert states == [CommandState.PENDING, CommandState.RETRYING, CommandState.FAILED]
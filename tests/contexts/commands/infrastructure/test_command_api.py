@@ -0,0 +1,73 @@
+import json
+import uuid
+
+import httpx
+import pytest
+
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.commands.infrastructure.command_dependencies import (
+    get_command_status_store,
+)
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.main import app
+
+EVENT_STREAM = {"Accept": "text/event-stream"}
+
+
+@pytest.fixture
+async def client():
+    """Yields a client on the real app, its status store and a succeeded command."""
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.update(
+        CommandStatus(
+            command_id=command_id,
+            state=CommandState.SUCCEEDED,
+            resource_id=uuid.uuid4(),
+            resource_key="new@example.com",
+        )
+    )
+    app.dependency_overrides[get_command_status_store] = lambda: store
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as c:
+            yield c, command_id
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, EVENT_STREAM])
+async def test_unknown_command_is_not_found(client, headers):
+    """
+    Test that an unknown command answers 404 both as JSON and as an event
+    stream, instead of opening an empty stream.
+    """
+    c, _ = client
+
+    response = await c.get(f"/commands/{uuid.uuid4()}", headers=headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, EVENT_STREAM])
+async def test_long_wait_is_capped_and_internal_fields_are_hidden(client, headers):
+    """
+    Test that a `wait` above the maximum is capped rather than rejected, and
+    that the email carried for the API workers is never returned.
+    """
+    c, command_id = client
+
+    response = await c.get(f"/commands/{command_id}?wait=3600", headers=headers)
+
+    assert response.status_code == 200
+    if headers:
+        body = response.text.split("data: ", 1)[1]
+    else:
+        body = response.text
+    status = json.loads(body)
+    assert status["state"] == "succeeded"
+    assert "resource_key" not in status
@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.contexts.commands.application.command_status_publisher import (
+    CommandStatusPublisher,
+)
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+
+
+class RecordingStatusPublisher(CommandStatusPublisher):
+    def __init__(self):
+        self.published: list[CommandStatus] = []
+
+    def publish(self, status: CommandStatus) -> None:
+        self.published.append(status)
+
+
+def test_final_status_is_not_overwritten():
+    """
+    Test that a late status (e.g. a retry reported after the success) does
+    not replace a final one, and that accept does not reset a known command.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.update(CommandStatus(command_id=command_id, state=CommandState.SUCCEEDED))
+
+    store.update(CommandStatus(command_id=command_id, state=CommandState.RETRYING))
+    store.accept(command_id)
+
+    assert store.get(command_id).state == CommandState.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_update_wakes_every_waiter_of_the_command():
+    """
+    Test that all requests waiting on a command are woken by its update,
+    while waiters of other commands keep waiting.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    other_id = uuid.uuid4()
+    store.accept(command_id)
+    store.accept(other_id)
+    seen = store.get(command_id)
+
+    waiters = [
+        asyncio.create_task(store.wait_for_change(command_id, seen, timeout=10))
+        for _ in range(3)
+    ]
+    other = asyncio.create_task(
+        store.wait_for_change(other_id, store.get(other_id), timeout=10)
+    )
+    await asyncio.sleep(0)
+    assert store.waiting == 4
+
+    store.update(CommandStatus(command_id=command_id, state=CommandState.FAILED))
+    results = await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+
+    assert [status.state for status in results] == [CommandState.FAILED] * 3
+    assert not other.done()
+    other.cancel()
+    await asyncio.gather(other, return_exceptions=True)
+    assert store.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_status_already_changed():
+    """
+    Test that a waiter holding a stale status gets the current one at once.
+    """
+    store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+    store.accept(command_id)
+    stale = store.get(command_id)
+    store.update(CommandStatus(command_id=command_id, state=CommandState.SUCCEEDED))
+
+    status = await store.wait_for_change(command_id, stale, timeout=10)
+
+    assert status.state == CommandState.SUCCEEDED
+    assert store.waiting == 0
+
+
+def test_accepted_command_is_known_by_other_workers():
+    """
+    Test that accept broadcasts the pending status once, so a worker that
+    did not take the POST answers pending instead of 404, and that a late
+    pending broadcast does not hide progress the consumer already reported.
+    """
+    publisher = RecordingStatusPublisher()
+    accepting = InMemoryCommandStatusStore(
+        max_size=10, ttl=60, status_publisher=publisher
+    )
+    other = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    late = InMemoryCommandStatusStore(max_size=10, ttl=60)
+    command_id = uuid.uuid4()
+
+    accepting.accept(command_id)
+    accepting.accept(command_id)
+    late.on_command_status(
+        CommandStatus(command_id=command_id, state=CommandState.RETRYING)
+    )
+    for status in publisher.published:
+        other.on_command_status(status)
+        late.on_command_status(status)
+
+    assert [status.state for status in publisher.published] == [CommandState.PENDING]
+    assert other.get(command_id).state == CommandState.PENDING
+    assert late.get(command_id).state == CommandState.RETRYING
@@ -0,0 +1,127 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.contexts.users.application.bulk_create_users_use_case import (
+    BulkCreateUsersUseCase,
+)
+from src.contexts.users.domain.bulk_create_users_result import line_command_id
+
+
+async def lines_of(*lines):
+    for line in lines:
+        yield line
+
+
+def user_line(index: int) -> bytes:
+    return (
+        f'{{"name": "User {index}", "email": "user{index}@example.com", '
+        f'"password": "pw"}}'
+    ).encode()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_publishes_valid_lines_in_batches():
+    """
+    Test that valid lines are published in batches and invalid ones are counted.
+    """
+    mock_publisher = AsyncMock()
+    use_case = BulkCreateUsersUseCase(
+        mock_publisher, batch_size=2, max_reported_errors=10
+    )
+
+    result = await use_case.execute(
+        lines_of(
+            user_line(1),
+            b'{"name": "No email"}',
+            user_line(2),
+            b"",
+            user_line(3),
+            None,
+        )
+    )
+
+    assert result.accepted == 3
+    assert result.rejected == 2
+    assert [error.line for error in result.errors] == [2, 6]
+
+    published = [
+        [command.email for command in call.args[0]]
+        for call in mock_publisher.publish_create_users.call_args_list
+    ]
+    assert published == [
+        ["user1@example.com", "user2@example.com"],
+        ["user3@example.com"],
+    ]
+    # Every batch is published under the id returned to the client, and each
+    # command under the id derived from its line
+    calls = mock_publisher.publish_create_users.call_args_list
+    assert {call.args[2] for call in calls} == {result.batch_id}
+    assert [command_id for call in calls for command_id in call.args[1]] == [
+        line_command_id(result.batch_id, line) for line in (1, 3, 5)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_caps_reported_errors():
+    """
+    Test that only the first errors are reported while all of them are counted.
+    """
+    mock_publisher = AsyncMock()
+    use_case = BulkCreateUsersUseCase(
+        mock_publisher, batch_size=10, max_reported_errors=1
+    )
+
+    result = await use_case.execute(lines_of(b"not json", b"[]", b"{}"))
+
+    assert result.accepted == 0
+    assert result.rejected == 3
+    assert len(result.errors) == 1
+    mock_publisher.publish_create_users.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_returns_the_partial_result():
+    """
+    Test that a publish failing mid-stream stops the upload and reports what
+    was already enqueued and from which line on it was not, instead of a 500.
+    """
+    mock_publisher = AsyncMock()
+    mock_publisher.publish_create_users.side_effect = [
+        None,
+        ConnectionError("broker down"),
+    ]
+    use_case = BulkCreateUsersUseCase(
+        mock_publisher, batch_size=2, max_reported_errors=10
+    )
+
+    result = await use_case.execute(
+        lines_of(*(user_line(i) for i in range(1, 4)), b"{}", user_line(5))
+    )
+
+    assert result.accepted == 2
+    assert result.rejected == 1
+    assert result.failed_line == 3
+    assert "broker down" in result.detail
+    assert mock_publisher.publish_create_users.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_same_batch_id_reuses_the_command_ids():
+    """
+    Test that re-sending an upload under the same batch id republishes the
+    same command ids, which the consumer deduplicates.
+    """
+    batch_id = uuid.uuid4()
+    mock_publisher = AsyncMock()
+    use_case = BulkCreateUsersUseCase(
+        mock_publisher, batch_size=10, max_reported_errors=10
+    )
+
+    for _ in range(2):
+        result = await use_case.execute(lines_of(user_line(1), user_line(2)), batch_id)
+        assert result.batch_id == batch_id
+
+    first, retry = mock_publisher.publish_create_users.call_args_list
+    assert first.args[1] == retry.args[1]
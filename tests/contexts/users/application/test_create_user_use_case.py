@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -23,22 +23,24 @@ async def test_create_user_successfully():
     # Simulate that the user does NOT exist. `find_by_email` returns None.
     mock_user_repository.find_by_email.return_value = None
 
+    # Create a mock for the password hasher
+    mock_password_hasher = AsyncMock()
+    mock_password_hasher.hash.return_value = "hashed_password_from_mock"
+
     # Instantiate the use case
-    use_case = CreateUserUseCase(user_repository=mock_user_repository)
+    use_case = CreateUserUseCase(
+        user_repository=mock_user_repository, password_hasher=mock_password_hasher
+    )
 
     # Act
-    # Use patch to intercept the call to User.hash_password
-    with patch.object(
-        User, "hash_password", return_value="hashed_password_from_mock"
-    ) as mock_hash:
-        await use_case.execute(command)
+    created_user = await use_case.execute(command)
 
     # Assert
     # Verify that we tried to find the user by email
     mock_user_repository.find_by_email.assert_called_once_with(command.email)
 
     # Verify that the hashing method was called with the correct password
-    mock_hash.assert_called_once_with("strong_password")
+    mock_password_hasher.hash.assert_called_once_with("strong_password")
 
     # Verify that the `save` method was called once
     mock_user_repository.save.assert_called_once()
@@ -51,6 +53,9 @@ async def test_create_user_successfully():
     assert saved_user_arg.email == command.email
     assert saved_user_arg.hashed_password == "hashed_password_from_mock"
 
+    # Verify that the created user is returned to the caller
+    assert created_user is saved_user_arg
+
 
 @pytest.mark.asyncio
 async def test_create_user_fails_if_email_already_exists():
@@ -72,8 +77,13 @@ async def test_create_user_fails_if_email_already_exists():
     # Simulate that the user DOES exist. `find_by_email` returns the mocked user.
     mock_user_repository.find_by_email.return_value = mock_existing_user
 
+    # Create a mock for the password hasher
+    mock_password_hasher = AsyncMock()
+
     # Instantiate the use case
-    use_case = CreateUserUseCase(user_repository=mock_user_repository)
+    use_case = CreateUserUseCase(
+        user_repository=mock_user_repository, password_hasher=mock_password_hasher
+    )
 
     # Act & Assert
     # Verify that the correct exception is raised
@@ -86,5 +96,6 @@ async def test_create_user_fails_if_email_already_exists():
     # Verify that we tried to find the user
     mock_user_repository.find_by_email.assert_called_once_with(command.email)
 
-    # Verify that the `save` method was NEVER called
+    # Verify that neither hashing nor `save` were ever called
+    mock_password_hasher.hash.assert_not_called()
     mock_user_repository.save.assert_not_called()
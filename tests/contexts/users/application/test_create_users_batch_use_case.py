@@ -0,0 +1,94 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.contexts.users.application.create_users_batch_use_case import (
+    CreateUsersBatchUseCase,
+)
+from src.contexts.users.domain.create_user import CreateUser
+
+
+@pytest.mark.asyncio
+async def test_create_users_batch_skips_existing_and_repeated_emails():
+    """
+    Test that a batch runs one duplicate check and one insert, and reports
+    per command whether its user was created.
+    """
+    # Arrange
+    commands = [
+        CreateUser(name="New", email="new@example.com", password="pw1"),
+        CreateUser(name="Old", email="old@example.com", password="pw2"),
+        CreateUser(name="New again", email="new@example.com", password="pw3"),
+    ]
+
+    mock_user_repository = AsyncMock()
+    mock_user_repository.find_existing_emails.return_value = {"old@example.com"}
+    mock_user_repository.save_many.return_value = {"new@example.com"}
+
+    mock_password_hasher = AsyncMock()
+    mock_password_hasher.hash.return_value = "hashed"
+
+    use_case = CreateUsersBatchUseCase(
+        user_repository=mock_user_repository, password_hasher=mock_password_hasher
+    )
+
+    # Act
+    created = await use_case.execute(commands)
+
+    # Assert
+    assert [user is not None for user in created] == [True, False, False]
+    assert created[0].email == "new@example.com"
+
+    mock_user_repository.find_existing_emails.assert_called_once()
+    checked_emails = mock_user_repository.find_existing_emails.call_args[0][0]
+    assert sorted(checked_emails) == ["new@example.com", "old@example.com"]
+
+    # Only the first command for the free email is hashed and saved
+    mock_password_hasher.hash.assert_called_once_with("pw1")
+    saved_users = mock_user_repository.save_many.call_args[0][0]
+    assert [user.email for user in saved_users] == ["new@example.com"]
+    assert saved_users[0].hashed_password == "hashed"
+
+
+@pytest.mark.asyncio
+async def test_create_users_batch_reports_rows_lost_to_a_concurrent_insert():
+    """
+    Test that a user skipped by the insert (ON CONFLICT) is not reported as created.
+    """
+    commands = [CreateUser(name="Racy", email="racy@example.com", password="pw")]
+
+    mock_user_repository = AsyncMock()
+    mock_user_repository.find_existing_emails.return_value = set()
+    mock_user_repository.save_many.return_value = set()
+
+    mock_password_hasher = AsyncMock()
+    mock_password_hasher.hash.return_value = "hashed"
+
+    use_case = CreateUsersBatchUseCase(
+        user_repository=mock_user_repository, password_hasher=mock_password_hasher
+    )
+    created = await use_case.execute(commands)
+
+    assert created == [None]
+
+
+@pytest.mark.asyncio
+async def test_create_users_batch_does_not_insert_when_all_exist():
+    """
+    Test that no insert is issued when every email is already taken.
+    """
+    commands = [CreateUser(name="Old", email="old@example.com", password="pw")]
+
+    mock_user_repository = AsyncMock()
+    mock_user_repository.find_existing_emails.return_value = {"old@example.com"}
+
+    mock_password_hasher = AsyncMock()
+
+    use_case = CreateUsersBatchUseCase(
+        user_repository=mock_user_repository, password_hasher=mock_password_hasher
+    )
+    created = await use_case.execute(commands)
+
+    assert created == [None]
+    mock_password_hasher.hash.assert_not_called()
+    mock_user_repository.save_many.assert_not_called()
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock
 import pytest
 
 from src.contexts.users.application.get_user_use_case import GetUserUseCase
-from src.contexts.users.domain.user import User
+from src.contexts.users.domain.read_user import ReadUser
 from src.core.exceptions.custom_exceptions import UserNotFoundException
 
 
@@ -15,13 +15,8 @@ async def test_get_user_by_id_when_user_exists():
     Verify that the repository is called and a UserReadModel is returned.
     """
     user_id = uuid.uuid4()
-    # Create a mock user entity
-    mock_user = User(
-        id=user_id,
-        name="Test User",
-        email="test@example.com",
-        hashed_password="hashed_password_value",
-    )
+    # Create the read model the query repository returns
+    mock_user = ReadUser(id=user_id, name="Test User", email="test@example.com")
 
     # Create a mock query repository
     mock_query_repository = AsyncMock()
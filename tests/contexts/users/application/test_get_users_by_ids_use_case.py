@@ -0,0 +1,46 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.contexts.users.application.get_users_by_ids_use_case import (
+    GetUsersByIdsUseCase,
+)
+from src.contexts.users.domain.read_user import ReadUser
+from src.core.exceptions.custom_exceptions import BatchLimitExceededException
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_ids_preserves_order_and_reports_missing():
+    """
+    Test that users come back in request order, in a single repository call,
+    and that unknown ids are reported instead of failing the batch.
+    """
+    first, second, unknown = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    mock_query_repository = AsyncMock()
+    # The repository returns rows in arbitrary order
+    mock_query_repository.find_by_ids.return_value = [
+        ReadUser(id=second, name="Second", email="second@example.com"),
+        ReadUser(id=first, name="First", email="first@example.com"),
+    ]
+
+    use_case = GetUsersByIdsUseCase(mock_query_repository, max_ids=10)
+    result = await use_case.execute([first, unknown, second, first])
+
+    mock_query_repository.find_by_ids.assert_called_once_with([first, unknown, second])
+    assert [user.id for user in result.users] == [first, second]
+    assert result.missing == [unknown]
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_ids_rejects_too_many_ids():
+    """
+    Test that a request over the configured limit is rejected before any query.
+    """
+    mock_query_repository = AsyncMock()
+    use_case = GetUsersByIdsUseCase(mock_query_repository, max_ids=2)
+
+    with pytest.raises(BatchLimitExceededException):
+        await use_case.execute([uuid.uuid4() for _ in range(3)])
+
+    mock_query_repository.find_by_ids.assert_not_called()
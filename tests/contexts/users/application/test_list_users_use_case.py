@@ -0,0 +1,77 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.contexts.users.application.list_users_use_case import ListUsersUseCase
+from src.contexts.users.application.user_page_cursor import encode_cursor
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.users_page import UserSortKey
+from src.core.exceptions.custom_exceptions import InvalidCursorException
+
+
+def make_users(count: int) -> list[ReadUser]:
+    return [
+        ReadUser(id=uuid.uuid4(), name=f"User {i}", email=f"user{i}@example.com")
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_users_returns_cursor_after_the_last_user_of_a_full_page():
+    """
+    Test that one extra row is requested and turned into a next-page cursor.
+    """
+    users = make_users(3)
+    mock_query_repository = AsyncMock()
+    mock_query_repository.find_page.return_value = users
+
+    use_case = ListUsersUseCase(mock_query_repository)
+    page = await use_case.execute(UserSortKey.EMAIL, cursor=None, limit=2)
+
+    mock_query_repository.find_page.assert_called_once_with(UserSortKey.EMAIL, None, 3)
+    assert page.users == users[:2]
+    assert page.next_cursor == encode_cursor(UserSortKey.EMAIL, "user1@example.com")
+
+
+@pytest.mark.asyncio
+async def test_list_users_resumes_after_the_cursor_and_stops_on_the_last_page():
+    """
+    Test that the cursor is decoded into the seek key and that the last page has no cursor.
+    """
+    last_id = uuid.uuid4()
+    users = make_users(1)
+    mock_query_repository = AsyncMock()
+    mock_query_repository.find_page.return_value = users
+
+    use_case = ListUsersUseCase(mock_query_repository)
+    cursor = encode_cursor(UserSortKey.ID, str(last_id))
+    page = await use_case.execute(UserSortKey.ID, cursor=cursor, limit=2)
+
+    mock_query_repository.find_page.assert_called_once_with(
+        UserSortKey.ID, str(last_id), 3
+    )
+    assert page.users == users
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        encode_cursor(UserSortKey.EMAIL, "user@example.com"),
+        encode_cursor(UserSortKey.ID, "garbage"),
+    ],
+)
+async def test_list_users_rejects_invalid_or_mismatched_cursors(cursor):
+    """
+    Test that garbage cursors, forged ids and cursors of another order are rejected.
+    """
+    mock_query_repository = AsyncMock()
+    use_case = ListUsersUseCase(mock_query_repository)
+
+    with pytest.raises(InvalidCursorException):
+        await use_case.execute(UserSortKey.ID, cursor=cursor, limit=10)
+
+    mock_query_repository.find_page.assert_not_called()
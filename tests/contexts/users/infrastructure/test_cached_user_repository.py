@@ -0,0 +1,80 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.contexts.users.domain.read_user import ReadUser
+from src.contexts.users.domain.user import User
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.infrastructure.cached_user_repository import (
+    CachedUserQueryRepository,
+    CachedUserRepository,
+    UserCaches,
+)
+
+
+@pytest.fixture
+def caches():
+    return UserCaches(max_size=100, ttl=60, negative_ttl=5)
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_is_read_through(caches):
+    """
+    Test that only the first lookup of an id reaches the wrapped repository.
+    """
+    user_id = uuid.uuid4()
+    read_user = ReadUser(id=user_id, name="Test User", email="test@example.com")
+    mock_query_repository = AsyncMock()
+    mock_query_repository.find_by_id.return_value = read_user
+
+    repository = CachedUserQueryRepository(mock_query_repository, caches.by_id)
+
+    assert await repository.find_by_id(user_id) == read_user
+    assert await repository.find_by_id(user_id) == read_user
+    mock_query_repository.find_by_id.assert_called_once_with(user_id)
+    assert caches.by_id.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_email_is_cached_until_the_user_is_created(caches):
+    """
+    Test that a negative email lookup is cached and dropped by a UserCreated event.
+    """
+    mock_user_repository = AsyncMock()
+    mock_user_repository.find_by_email.return_value = None
+    repository = CachedUserRepository(mock_user_repository, caches.by_email)
+
+    assert await repository.find_by_email("new@example.com") is None
+    assert await repository.find_by_email("new@example.com") is None
+    mock_user_repository.find_by_email.assert_called_once()
+
+    user = User(name="New", email="new@example.com", hashed_password="hash")
+    caches.on_user_created(UserCreated(id=user.id, name=user.name, email=user.email))
+    mock_user_repository.find_by_email.return_value = user
+
+    assert await repository.find_by_email("new@example.com") == user
+    # The read side is primed with the new user as well
+    assert caches.by_id.get(user.id).email == "new@example.com"
+
+
+@pytest.mark.asyncio
+async def test_find_by_ids_only_queries_uncached_ids(caches):
+    """
+    Test that cached hits and cached misses are not looked up again.
+    """
+    cached_id, unknown_id, new_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cached_user = ReadUser(id=cached_id, name="Cached", email="cached@example.com")
+    new_user = ReadUser(id=new_id, name="New", email="new@example.com")
+    caches.by_id.set(cached_id, cached_user)
+    caches.by_id.set(unknown_id, None)
+
+    mock_query_repository = AsyncMock()
+    mock_query_repository.find_by_ids.return_value = [new_user]
+    repository = CachedUserQueryRepository(mock_query_repository, caches.by_id)
+
+    users = await repository.find_by_ids([cached_id, unknown_id, new_id])
+
+    mock_query_repository.find_by_ids.assert_called_once_with([new_id])
+    assert users == [cached_user, new_user]
+    assert caches.by_id.get(new_id) == new_user
@@ -0,0 +1,271 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.contexts.auth.application.login_use_case import LoginUseCase
+from src.contexts.auth.domain.login import Login
+from src.contexts.commands.domain.command_status import CommandState, CommandStatus
+from src.contexts.users.domain.user import User
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.infrastructure.cached_user_repository import (
+    CachedUserRepository,
+    UserCaches,
+)
+from src.contexts.users.infrastructure.email_existence_filter import (
+    EmailExistenceFilter,
+    FilteredUserRepository,
+)
+from src.core.cache.bloom_filter import BloomFilter
+from src.core.exceptions.custom_exceptions import (
+    InvalidCredentialsException,
+    UserAlreadyExistsException,
+)
+
+
+def session_factory(user_count: int):
+    session = MagicMock()
+    session.scalar = AsyncMock(return_value=user_count)
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+def loaded_filter(emails, **kwargs) -> EmailExistenceFilter:
+    email_filter = EmailExistenceFilter(capacity=100, error_rate=0.01, **kwargs)
+    email_filter._bloom = BloomFilter(capacity=100, error_rate=0.01)
+    for email in emails:
+        email_filter.on_user_created(
+            UserCreated(id=uuid.uuid4(), name="Test User", email=email)
+        )
+    return email_filter
+
+
+@pytest.mark.asyncio
+async def test_unknown_email_skips_the_database():
+    """
+    Test that a definite negative is answered without querying the repository.
+    """
+    mock_user_repository = AsyncMock()
+    repository = FilteredUserRepository(
+        mock_user_repository, loaded_filter(["known@example.com"])
+    )
+
+    assert await repository.find_by_email("unknown@example.com") is None
+    mock_user_repository.find_by_email.assert_not_called()
+
+    await repository.find_by_email("known@example.com")
+    mock_user_repository.find_by_email.assert_called_once_with("known@example.com")
+
+
+@pytest.mark.asyncio
+async def test_only_possible_duplicates_are_checked():
+    """
+    Test that the duplicate check of a batch only queries emails in the filter.
+    """
+    mock_user_repository = AsyncMock()
+    mock_user_repository.find_existing_emails.return_value = {"known@example.com"}
+    repository = FilteredUserRepository(
+        mock_user_repository, loaded_filter(["known@example.com"])
+    )
+
+    existing = await repository.find_existing_emails(
+        ["known@example.com", "new@example.com"]
+    )
+
+    assert existing == {"known@example.com"}
+    mock_user_repository.find_existing_emails.assert_called_once_with(
+        ["known@example.com"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_saved_users_are_added_to_the_filter():
+    """
+    Test that a user saved through the decorator is no longer a definite negative.
+    """
+    email_filter = loaded_filter([])
+    repository = FilteredUserRepository(AsyncMock(), email_filter)
+
+    await repository.save(
+        User(name="New", email="new@example.com", hashed_password="hash")
+    )
+
+    assert email_filter.might_exist("new@example.com")
+
+
+def test_every_email_might_exist_until_the_filter_is_loaded():
+    """
+    Test that an unloaded filter never short-circuits a lookup.
+    """
+    email_filter = EmailExistenceFilter(capacity=100, error_rate=0.01)
+
+    assert not email_filter.ready
+    assert email_filter.might_exist("anyone@example.com")
+
+
+@pytest.mark.asyncio
+async def test_matching_snapshot_is_loaded_without_a_rebuild(tmp_path):
+    """
+    Test that startup uses the snapshot when it covers every user of the table.
+    """
+    snapshot_path = str(tmp_path / "emails.bloom")
+    await loaded_filter(
+        ["a@example.com", "b@example.com"], snapshot_path=snapshot_path
+    ).save_snapshot()
+
+    email_filter = EmailExistenceFilter(
+        capacity=100, error_rate=0.01, snapshot_path=snapshot_path
+    )
+    email_filter.rebuild = AsyncMock()
+    await email_filter.load(session_factory(user_count=2))
+
+    email_filter.rebuild.assert_not_called()
+    assert email_filter.might_exist("a@example.com")
+    assert not email_filter.might_exist("c@example.com")
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_triggers_a_rebuild(tmp_path):
+    """
+    Test that a snapshot missing users created since it was written is not used.
+    """
+    snapshot_path = str(tmp_path / "emails.bloom")
+    await loaded_filter(["a@example.com"], snapshot_path=snapshot_path).save_snapshot()
+
+    email_filter = EmailExistenceFilter(
+        capacity=100, error_rate=0.01, snapshot_path=snapshot_path
+    )
+    email_filter.rebuild = AsyncMock()
+    await email_filter.load(session_factory(user_count=2))
+
+    email_filter.rebuild.assert_called_once()
+    assert not email_filter.ready
+
+
+@pytest.mark.asyncio
+async def test_users_created_while_the_snapshot_loads_are_kept(tmp_path):
+    """
+    Test that an event arriving during load is in the filter it swaps in.
+    """
+    snapshot_path = str(tmp_path / "emails.bloom")
+    await loaded_filter(["a@example.com"], snapshot_path=snapshot_path).save_snapshot()
+    email_filter = EmailExistenceFilter(
+        capacity=100, error_rate=0.01, snapshot_path=snapshot_path
+    )
+    factory = session_factory(user_count=1)
+
+    async def count_then_receive_event(*args):
+        email_filter.on_user_created(
+            UserCreated(id=uuid.uuid4(), name="Test User", email="new@example.com")
+        )
+        return 1
+
+    factory.return_value.__aenter__.return_value.scalar = count_then_receive_event
+    await email_filter.load(factory)
+
+    assert email_filter.ready
+    assert email_filter.might_exist("new@example.com")
+
+
+@pytest.mark.asyncio
+async def test_invalidated_filter_trusts_no_negative_until_rebuilt():
+    """
+    Test that after missed events every email might exist until a rebuild.
+    """
+    email_filter = loaded_filter(["known@example.com"])
+
+    email_filter.invalidate()
+
+    assert email_filter.stale
+    assert email_filter.might_exist("missed@example.com")
+
+    factory = session_factory(user_count=0)
+    stream = factory.return_value.__aenter__.return_value.stream = AsyncMock()
+
+    async def partitions():
+        yield [("known@example.com",), ("missed@example.com",)]
+
+    stream.return_value.partitions = partitions
+    await email_filter.rebuild(factory)
+
+    assert not email_filter.stale
+    assert email_filter.might_exist("missed@example.com")
+    assert not email_filter.might_exist("unknown@example.com")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_wakes_up_maintain():
+    """
+    Test that an invalidation triggers a rebuild without waiting the interval.
+    """
+    email_filter = loaded_filter([])
+    email_filter.load = AsyncMock()
+    rebuilt = asyncio.Event()
+    email_filter.rebuild = AsyncMock(side_effect=lambda _: rebuilt.set())
+    task = asyncio.create_task(email_filter.maintain(MagicMock(), 3600))
+
+    email_filter.invalidate()
+    await asyncio.wait_for(rebuilt.wait(), 1)
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_email_found_taken_on_save_is_added_to_the_filter():
+    """
+    Test that a duplicate caught by the unique index fixes the filter's negative.
+    """
+    email_filter = loaded_filter([])
+    mock_user_repository = AsyncMock()
+    mock_user_repository.save.side_effect = UserAlreadyExistsException("taken")
+    repository = FilteredUserRepository(mock_user_repository, email_filter)
+
+    with pytest.raises(UserAlreadyExistsException):
+        await repository.save(
+            User(name="New", email="taken@example.com", hashed_password="hash")
+        )
+
+    assert email_filter.might_exist("taken@example.com")
+
+
+@pytest.mark.asyncio
+async def test_login_works_as_soon_as_the_command_succeeded():
+    """
+    Test that create -> succeeded -> login logs the user in, although
+    user.created has not come through the outbox yet: the succeeded status
+    adds the email to the filter and drops a cached "unknown email".
+    """
+    email_filter = loaded_filter([])
+    caches = UserCaches(max_size=10, ttl=60, negative_ttl=60)
+    database = AsyncMock()
+    database.find_by_email.return_value = None
+    login = LoginUseCase(
+        user_repository=FilteredUserRepository(
+            CachedUserRepository(database, caches.by_email), email_filter
+        ),
+        password_hasher=AsyncMock(verify=AsyncMock(return_value=True)),
+        token_service=MagicMock(),
+    )
+    credentials = Login(email="new@example.com", password="secret-pass")
+    # Looked up once while the filter could not answer, so cached as unknown
+    caches.by_email.set("new@example.com", None)
+    with pytest.raises(InvalidCredentialsException):
+        await login.execute(credentials)
+
+    user = User(name="New", email="new@example.com", hashed_password="hash")
+    database.find_by_email.return_value = user
+    status = CommandStatus(
+        command_id=uuid.uuid4(),
+        state=CommandState.SUCCEEDED,
+        resource_id=user.id,
+        resource_key=user.email,
+    )
+    caches.on_command_status(status)
+    email_filter.on_command_status(status)
+
+    await login.execute(credentials)
+    database.find_by_email.assert_called_once_with("new@example.com")
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.contexts.users.infrastructure.idempotency_keys import (
+    IdempotencyKeys,
+    idempotent_command_id,
+)
+
+
+def test_same_key_gives_the_same_command_id():
+    """
+    Test that every worker derives the same command id from a key.
+    """
+    assert idempotent_command_id("key-1") == idempotent_command_id("key-1")
+    assert idempotent_command_id("key-1") != idempotent_command_id("key-2")
+
+
+def test_claim_returns_the_first_claim_for_a_reused_key():
+    """
+    Test that only the first claim of a key is new.
+    """
+    keys = IdempotencyKeys(max_size=10, ttl=60)
+
+    assert keys.claim("key-1", "fingerprint-a") is None
+    assert keys.claim("key-1", "fingerprint-a").fingerprint == "fingerprint-a"
+    assert keys.claim("key-1", "fingerprint-b").fingerprint == "fingerprint-a"
+
+
+@pytest.mark.asyncio
+async def test_retry_waits_for_the_first_publish():
+    """
+    Test that a claim taken while the first request is still publishing
+    resolves only when that publish is accepted or released.
+    """
+    keys = IdempotencyKeys(max_size=10, ttl=60)
+    keys.claim("key-1", "fingerprint-a")
+    keys.claim("key-2", "fingerprint-a")
+    accepted = asyncio.create_task(keys.claim("key-1", "fingerprint-a").wait())
+    released = asyncio.create_task(keys.claim("key-2", "fingerprint-a").wait())
+    await asyncio.sleep(0)
+    assert not accepted.done() and not released.done()
+
+    keys.accept("key-1")
+    keys.release("key-2")
+
+    assert await accepted is True
+    assert await released is False
+
+
+def test_released_key_can_be_claimed_again():
+    """
+    Test that a key whose publish failed is forgotten.
+    """
+    keys = IdempotencyKeys(max_size=10, ttl=60)
+    keys.claim("key-1", "fingerprint-a")
+
+    keys.release("key-1")
+
+    assert keys.claim("key-1", "fingerprint-a") is None
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from src.contexts.users.infrastructure.password_hasher import (
+    ProcessPoolPasswordHasher,
+    operation_seconds,
+)
+
+
+@pytest.fixture
+def password_hasher():
+    hasher = ProcessPoolPasswordHasher(max_workers=2)
+    yield hasher
+    hasher.close()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_in_worker_processes(password_hasher):
+    """
+    Test that hashing and verification go through the process pool and are
+    measured, each operation in its own latency histogram.
+    """
+    verifies = operation_seconds.labels("verify", "hash").count
+    hashed_password = await password_hasher.hash("secret")
+
+    assert hashed_password.startswith("$2b$")
+    assert await password_hasher.verify("secret", hashed_password) is True
+    assert await password_hasher.verify("wrong", hashed_password) is False
+
+    metrics = password_hasher.metrics
+    assert metrics.completed == 3
+    assert metrics.in_flight == 0
+    assert metrics.queue_depth == 0
+    assert metrics.average_hash_seconds > 0
+    assert operation_seconds.labels("verify", "hash").count == verifies + 2
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_while_hashing(password_hasher):
+    """
+    Test that the event loop is not blocked while bcrypt runs.
+    """
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    # Warm up the workers so process start-up is not measured
+    await password_hasher.hash("warm-up")
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.gather(*(password_hasher.hash("secret") for _ in range(4)))
+    ticking.cancel()
+
+    assert ticks > 10
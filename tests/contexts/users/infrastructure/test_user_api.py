@@ -0,0 +1,141 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.contexts.commands.domain.command_status import CommandState
+from src.contexts.commands.infrastructure.command_dependencies import (
+    get_command_status_store,
+)
+from src.contexts.commands.infrastructure.in_memory_command_status_store import (
+    InMemoryCommandStatusStore,
+)
+from src.contexts.users.application.user_command_publisher import (
+    UserCommandPublisher,
+)
+from src.contexts.users.infrastructure.idempotency_keys import (
+    IdempotencyKeys,
+    idempotent_command_id,
+)
+from src.contexts.users.infrastructure.user_api import router
+from src.contexts.users.infrastructure.user_dependencies import (
+    get_idempotency_keys,
+    get_user_command_publisher,
+)
+
+BODY = {"name": "John Doe", "email": "john@example.com", "password": "secret-pass"}
+HEADERS = {"Idempotency-Key": "key-1"}
+
+
+class GatedPublisher(UserCommandPublisher):
+    """Holds each publish until released; the first one fails if told to."""
+
+    def __init__(self, fail_first: bool):
+        self.fail_first = fail_first
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.attempts = 0
+        self.published = []
+
+    async def publish_create_user(self, command, command_id) -> None:
+        self.attempts += 1
+        attempt = self.attempts
+        self.started.set()
+        await self.release.wait()
+        if attempt == 1 and self.fail_first:
+            raise ConnectionError("broker unavailable")
+        self.published.append(command_id)
+
+    async def publish_create_users(self, commands, command_ids, batch_id) -> None:
+        raise NotImplementedError
+
+
+def make_app(publisher: GatedPublisher, status_store: InMemoryCommandStatusStore):
+    app = FastAPI()
+    app.include_router(router, prefix="/users")
+    idempotency_keys = IdempotencyKeys(max_size=10, ttl=60)
+    app.dependency_overrides[get_user_command_publisher] = lambda: publisher
+    app.dependency_overrides[get_idempotency_keys] = lambda: idempotency_keys
+    app.dependency_overrides[get_command_status_store] = lambda: status_store
+    return app
+
+
+async def post_twice(publisher: GatedPublisher, status_store):
+    """Sends the retry while the first POST is still publishing."""
+    transport = httpx.ASGITransport(
+        app=make_app(publisher, status_store), raise_app_exceptions=False
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        first = asyncio.create_task(client.post("/users/", json=BODY, headers=HEADERS))
+        await publisher.started.wait()
+        retry = asyncio.create_task(client.post("/users/", json=BODY, headers=HEADERS))
+        await asyncio.sleep(0.05)
+        assert not retry.done()
+
+        publisher.release.set()
+        return await first, await retry
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retry_is_accepted_only_after_the_publish():
+    """
+    Test that a retry arriving while the first POST publishes waits for it,
+    then answers 202 with the same command id without publishing again.
+    """
+    publisher = GatedPublisher(fail_first=False)
+    status_store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+
+    first, retry = await post_twice(publisher, status_store)
+
+    assert first.status_code == retry.status_code == 202
+    assert first.json()["command_id"] == retry.json()["command_id"]
+    assert len(publisher.published) == 1
+    assert status_store.get(publisher.published[0]).state == CommandState.PENDING
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retry_publishes_when_the_first_publish_fails():
+    """
+    Test that a retry waiting on a failed first publish is not told the
+    command was accepted before it is enqueued: it publishes the command.
+    """
+    publisher = GatedPublisher(fail_first=True)
+    status_store = InMemoryCommandStatusStore(max_size=10, ttl=60)
+
+    first, retry = await post_twice(publisher, status_store)
+
+    assert first.status_code == 500
+    assert retry.status_code == 202
+    assert publisher.attempts == 2
+    assert [str(command_id) for command_id in publisher.published] == [
+        retry.json()["command_id"]
+    ]
+    assert status_store.get(publisher.published[0]).state == CommandState.PENDING
+
+
+@pytest.mark.asyncio
+async def test_bulk_publish_failure_returns_the_partial_result():
+    """
+    Test that a bulk upload whose publish fails answers 503 with the batch id
+    derived from its Idempotency-Key and the line the failure starts at.
+    """
+    publisher = GatedPublisher(fail_first=False)
+    publisher.publish_create_users = AsyncMock(side_effect=ConnectionError("down"))
+    transport = httpx.ASGITransport(
+        app=make_app(publisher, InMemoryCommandStatusStore(max_size=10, ttl=60))
+    )
+    body = "\n".join(
+        json.dumps({**BODY, "email": f"u{i}@example.com"}) for i in range(3)
+    )
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        response = await client.post("/users/bulk", content=body, headers=HEADERS)
+
+    assert response.status_code == 503
+    result = response.json()
+    assert result["batch_id"] == str(idempotent_command_id("key-1"))
+    assert result["accepted"] == 0
+    assert result["failed_line"] == 1
@@ -0,0 +1,79 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.contexts.users.domain.create_user import CreateUser
+from src.contexts.users.infrastructure.user_command_publisher import (
+    RabbitMQUserCommandPublisher,
+)
+from src.core.messaging.codecs import codec_named
+
+
+def command(email: str) -> CreateUser:
+    return CreateUser(name="Test User", email=email, password="a_strong_password")
+
+
+@pytest.mark.asyncio
+async def test_commands_for_the_same_email_go_to_the_same_shard():
+    """
+    Test that the shard queue is chosen by the email, whatever its case.
+    """
+    mock_publisher = AsyncMock()
+    publisher = RabbitMQUserCommandPublisher(
+        mock_publisher, "q", codec_named("json"), shards=4
+    )
+
+    await publisher.publish_create_user(command("Test@Example.com"), uuid.uuid4())
+    await publisher.publish_create_user(command("test@example.com"), uuid.uuid4())
+
+    first, second = mock_publisher.publish.await_args_list
+    assert first.args[1] == second.args[1] == publisher.queue_for("test@example.com")
+    assert first.args[1].endswith("-of-4")
+
+
+@pytest.mark.asyncio
+async def test_bulk_commands_are_published_as_one_batch_per_shard():
+    """
+    Test that a bulk publish is split by shard, keeping each shard's order
+    and the command id given for each command.
+    """
+    mock_publisher = AsyncMock()
+    publisher = RabbitMQUserCommandPublisher(
+        mock_publisher, "q", codec_named("json"), shards=4
+    )
+    commands = [command(f"user{i}@example.com") for i in range(20)]
+
+    command_ids = [uuid.uuid4() for _ in commands]
+    await publisher.publish_create_users(commands, command_ids, uuid.uuid4())
+
+    published = {
+        call.args[1]: [
+            codec_named("json").decode(m.body, CreateUser) for m in call.args[0]
+        ]
+        for call in mock_publisher.publish_batch.await_args_list
+    }
+    assert len(mock_publisher.publish_batch.await_args_list) == len(published) > 1
+    for queue_name, batch in published.items():
+        assert batch == [
+            c for c in commands if publisher.queue_for(c.email) == queue_name
+        ]
+    # Each command keeps the id it was given
+    assert {
+        message.message_id
+        for call in mock_publisher.publish_batch.await_args_list
+        for message in call.args[0]
+    } == {str(command_id) for command_id in command_ids}
+
+
+@pytest.mark.asyncio
+async def test_unsharded_publisher_uses_the_queue_as_is():
+    """
+    Test that with a single shard commands go to the configured queue.
+    """
+    mock_publisher = AsyncMock()
+    publisher = RabbitMQUserCommandPublisher(mock_publisher, "q", codec_named("json"))
+
+    await publisher.publish_create_user(command("test@example.com"), uuid.uuid4())
+
+    assert mock_publisher.publish.await_args.args[1] == "q"
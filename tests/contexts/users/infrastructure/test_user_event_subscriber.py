@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.contexts.users.infrastructure.user_event_subscriber import (
+    UserEventSubscriber,
+)
+
+
+def make_connection(channel_error=None) -> MagicMock:
+    connection = MagicMock()
+    connection.close = AsyncMock()
+    connection.channel = AsyncMock(side_effect=channel_error)
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_failed_start_closes_its_connection_and_can_be_retried():
+    """
+    Test that a start failing halfway leaves no connection behind, so the
+    warm-up can retry it, and that starting again once up is a no-op.
+    """
+    failing = make_connection(ConnectionError("channel refused"))
+    working = make_connection()
+    connect_robust = AsyncMock(side_effect=[failing, working])
+    subscriber = UserEventSubscriber("amqp://test", "user_events", on_user_created=[])
+
+    with patch(
+        "src.contexts.users.infrastructure.user_event_subscriber.aio_pika.connect_robust",
+        connect_robust,
+    ):
+        with pytest.raises(ConnectionError):
+            await subscriber.start()
+        await subscriber.start()
+        await subscriber.start()
+
+    failing.close.assert_awaited_once()
+    assert connect_robust.await_count == 2
+    working.reconnect_callbacks.add.assert_called_once()
+    await subscriber.stop()
+    working.close.assert_awaited_once()
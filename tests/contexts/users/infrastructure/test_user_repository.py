@@ -0,0 +1,76 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.contexts.users.domain.user import User
+from src.contexts.users.domain.user_created import UserCreated
+from src.contexts.users.infrastructure.user import User as UserOrmModel
+from src.contexts.users.infrastructure.user_outbox import USER_CREATED_EVENT
+from src.contexts.users.infrastructure.user_repository import UserRepository
+from src.core.exceptions.custom_exceptions import UserAlreadyExistsException
+from src.core.outbox.outbox_message import OutboxMessage
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(UserOrmModel.__table__.create)
+        await connection.run_sync(OutboxMessage.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_save_writes_the_user_created_event_to_the_outbox(session_factory):
+    """
+    Test that saving a user adds its event to the outbox in the same transaction.
+    """
+    user = User(name="Test User", email="test@example.com", hashed_password="hashed")
+
+    async with session_factory() as session:
+        await UserRepository(session, events_exchange="user_events").save(user)
+        await session.commit()
+
+    async with session_factory() as session:
+        message = (await session.scalars(select(OutboxMessage))).one()
+    assert message.exchange == "user_events"
+    assert message.message_type == USER_CREATED_EVENT
+    assert UserCreated.model_validate_json(message.body).id == user.id
+    assert message.sent_at is None
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_save_leaves_no_event(session_factory):
+    """
+    Test that no event is left behind when the user is not committed.
+    """
+    user = User(name="Test User", email="test@example.com", hashed_password="hashed")
+
+    async with session_factory() as session:
+        await UserRepository(session).save(user)
+        await session.rollback()
+
+    async with session_factory() as session:
+        assert (await session.scalars(select(OutboxMessage))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_save_of_a_taken_email_raises_user_already_exists(session_factory):
+    """
+    Test that losing the race to the unique index is a duplicate, not a retryable error.
+    """
+    async with session_factory() as session:
+        await UserRepository(session).save(
+            User(name="First", email="test@example.com", hashed_password="hashed")
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        with pytest.raises(UserAlreadyExistsException):
+            await UserRepository(session).save(
+                User(name="Second", email="test@example.com", hashed_password="hashed")
+            )
+        await session.rollback()
@@ -0,0 +1,52 @@
+import pytest
+
+from src.core.cache.bloom_filter import BloomFilter
+
+
+def test_added_items_are_always_found():
+    """
+    Test that the filter has no false negatives.
+    """
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    emails = [f"user{i}@example.com" for i in range(1000)]
+    bloom.update(emails)
+
+    assert all(email in bloom for email in emails)
+    assert bloom.count == pytest.approx(1000, abs=20)
+
+
+def test_false_positive_rate_stays_close_to_the_target():
+    """
+    Test that the measured and the estimated false-positive rates match the target.
+    """
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    bloom.update(f"user{i}@example.com" for i in range(5000))
+
+    false_positives = sum(f"other{i}@example.com" in bloom for i in range(10000))
+
+    assert false_positives / 10000 < 0.02
+    assert bloom.false_positive_rate() == pytest.approx(0.01, abs=0.005)
+
+
+def test_filter_survives_a_round_trip_through_bytes():
+    """
+    Test that a deserialized filter answers like the original one.
+    """
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    bloom.update(["a@example.com", "b@example.com"])
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+    assert "a@example.com" in restored and "b@example.com" in restored
+    assert restored.count == bloom.count
+    assert restored.to_bytes() == bloom.to_bytes()
+
+
+def test_corrupted_bytes_are_rejected():
+    """
+    Test that truncated data is not mistaken for a filter.
+    """
+    data = BloomFilter(capacity=100, error_rate=0.01).to_bytes()
+
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(data[:-1])
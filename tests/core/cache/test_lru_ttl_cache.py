@@ -0,0 +1,68 @@
+from src.core.cache.lru_ttl_cache import MISSING, LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hits_and_misses_are_counted():
+    """
+    Test that lookups are served from the cache and counted.
+    """
+    cache = LRUTTLCache(max_size=10, ttl=60, negative_ttl=5)
+
+    assert cache.get("a") is MISSING
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Test that the entry not read for the longest time is evicted first.
+    """
+    cache = LRUTTLCache(max_size=2, ttl=60, negative_ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_negative_entries_expire_before_positive_ones():
+    """
+    Test that a cached None uses the shorter negative TTL.
+    """
+    clock = FakeClock()
+    cache = LRUTTLCache(max_size=10, ttl=60, negative_ttl=5, clock=clock)
+    cache.set("known", 1)
+    cache.set("unknown", None)
+
+    assert cache.get("unknown") is None
+
+    clock.now = 10
+    assert cache.get("unknown") is MISSING
+    assert cache.get("known") == 1
+
+    clock.now = 61
+    assert cache.get("known") is MISSING
+
+
+def test_zero_size_disables_caching():
+    """
+    Test that a cache without capacity never stores anything.
+    """
+    cache = LRUTTLCache(max_size=0, ttl=60, negative_ttl=5)
+    cache.set("a", 1)
+
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
@@ -0,0 +1,127 @@
+import inspect
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.contexts.auth.infrastructure.auth_dependencies import get_login_use_case
+from src.contexts.users.infrastructure.user_dependencies import (
+    get_list_users_use_case,
+    get_user_query_use_case,
+    get_users_by_ids_use_case,
+)
+from src.core.config.settings import settings
+from src.core.container import Container
+from src.core.database import database
+from src.core.database.database import create_read_engine, create_write_engine
+from src.core.dependencies.common import get_read_db, get_write_db
+from src.core.metrics.database import TimedAsyncAdaptedQueuePool
+
+PRIMARY_URL = "postgresql+asyncpg://app@primary/app"
+REPLICA_URL = "postgresql+asyncpg://app@replica/app"
+
+
+@pytest.fixture
+def engine_factory():
+    """Patches engine creation; yields the mock standing in for create_async_engine."""
+    with patch.object(database, "DATABASE_URL", PRIMARY_URL), patch.object(
+        database, "DATABASE_READ_URL", REPLICA_URL
+    ), patch.object(database, "instrument_engine"), patch.object(
+        database, "create_async_engine", MagicMock()
+    ) as create_async_engine_mock:
+        yield create_async_engine_mock
+
+
+def test_write_engine_uses_the_primary_pool_settings(engine_factory):
+    """
+    Test that the write engine connects to the primary with the write pool
+    settings and is not marked read-only.
+    """
+    engine = create_write_engine()
+
+    engine_factory.assert_called_once_with(
+        PRIMARY_URL,
+        echo=settings.DB_ECHO,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_logging_name="write",
+        pool_size=settings.DB_WRITE_POOL_SIZE,
+        max_overflow=settings.DB_WRITE_MAX_OVERFLOW,
+        pool_timeout=settings.DB_WRITE_POOL_TIMEOUT,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_WRITE_STATEMENT_CACHE_SIZE
+        },
+    )
+    assert engine is engine_factory.return_value
+    engine.execution_options.assert_not_called()
+
+
+def test_read_engine_uses_the_replica_read_only(engine_factory):
+    """
+    Test that the read engine connects to DATABASE_READ_URL with its own
+    pool settings and runs every transaction as read-only.
+    """
+    engine = create_read_engine()
+
+    engine_factory.assert_called_once_with(
+        REPLICA_URL,
+        echo=settings.DB_ECHO,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_logging_name="read",
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW,
+        pool_timeout=settings.DB_READ_POOL_TIMEOUT,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_READ_STATEMENT_CACHE_SIZE
+        },
+    )
+    engine_factory.return_value.execution_options.assert_called_once_with(
+        postgresql_readonly=True
+    )
+    assert engine is engine_factory.return_value.execution_options.return_value
+
+
+@pytest.mark.asyncio
+async def test_session_dependencies_are_bound_to_their_engine(tmp_path):
+    """
+    Test that get_read_db hands out read engine sessions and get_write_db
+    write engine sessions, like the container's command sessions.
+    """
+    container = Container(
+        write_engine=create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'w.db'}"),
+        read_engine=create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r.db'}"),
+        publisher=AsyncMock(),
+        password_hasher=AsyncMock(close=MagicMock()),
+        user_caches=MagicMock(),
+        email_filter=MagicMock(),
+    )
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+    request.app.state.container = container
+
+    async for session in get_read_db(request):
+        assert session.bind is container.read_engine
+    async for session in get_write_db(request):
+        assert session.bind is container.write_engine
+    async with container.sessions() as session:
+        assert session.bind is container.write_engine
+    await container.write_engine.dispose()
+    await container.read_engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "dependency",
+    [
+        get_login_use_case,
+        get_user_query_use_case,
+        get_users_by_ids_use_case,
+        get_list_users_use_case,
+    ],
+)
+def test_queries_and_login_depend_on_the_read_session(dependency):
+    """
+    Test that login and the user queries get their session from the read
+    engine, so API reads never load the primary.
+    """
+    session = inspect.signature(dependency).parameters["session"].default
+
+    assert session.dependency is get_read_db
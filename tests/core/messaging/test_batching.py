@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from src.core.messaging.batching import iterate_batches
+
+
+class QueueIterator:
+    """Async iterator over an asyncio.Queue; `None` ends the iteration."""
+
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self._queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+
+@pytest.mark.asyncio
+async def test_batches_are_flushed_when_full():
+    """
+    Test that a batch is emitted as soon as it reaches `max_size` items.
+    """
+    queue = asyncio.Queue()
+    for item in [1, 2, 3, 4, 5, None]:
+        queue.put_nowait(item)
+
+    batches = [
+        batch
+        async for batch in iterate_batches(QueueIterator(queue), max_size=2, timeout=1)
+    ]
+
+    assert batches == [[1, 2], [3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_on_timeout():
+    """
+    Test that a partial batch is emitted once the timeout expires.
+    """
+    queue = asyncio.Queue()
+    queue.put_nowait(1)
+    batches = iterate_batches(QueueIterator(queue), max_size=10, timeout=0.01)
+
+    assert await batches.__anext__() == [1]
+
+    queue.put_nowait(2)
+    queue.put_nowait(None)
+    assert await batches.__anext__() == [2]
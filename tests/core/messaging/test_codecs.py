@@ -0,0 +1,124 @@
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from src.contexts.users.domain.create_user import CreateUser
+from src.core.messaging.codecs import (
+    CODECS,
+    SCHEMA_VERSION_HEADER,
+    MessageFormatError,
+    codec_named,
+    decode_message,
+)
+
+COMMAND = CreateUser(
+    name="Test User", email="test@example.com", password="a_strong_password"
+)
+
+
+def make_message(
+    body: bytes, content_type: Optional[str], headers: Optional[dict] = None
+) -> MagicMock:
+    message = MagicMock()
+    message.body = body
+    message.content_type = content_type
+    message.headers = headers
+    return message
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack"])
+def test_codecs_round_trip_a_command(name):
+    """
+    Test that each codec decodes what it encoded, picked by content type.
+    """
+    codec = codec_named(name)
+    message = make_message(
+        codec.encode(COMMAND), codec.content_type, {SCHEMA_VERSION_HEADER: 1}
+    )
+
+    assert decode_message(message, CreateUser, schema_version=1) == COMMAND
+
+
+def test_msgpack_is_more_compact_than_json():
+    """
+    Test that the binary format actually saves bytes on the wire.
+    """
+    assert len(codec_named("msgpack").encode(COMMAND)) < len(
+        codec_named("json").encode(COMMAND)
+    )
+
+
+def test_legacy_message_decodes_as_json():
+    """
+    Test that messages published before codecs, with no content type and no
+    schema version, keep decoding during a rollout.
+    """
+    message = make_message(COMMAND.model_dump_json().encode(), None, None)
+
+    assert decode_message(message, CreateUser, schema_version=1) == COMMAND
+
+
+def test_newer_schema_version_is_rejected():
+    """
+    Test that a message from a newer publisher is refused as a format error,
+    which the consumer dead-letters instead of retrying.
+    """
+    codec = CODECS["application/json"]
+    message = make_message(
+        codec.encode(COMMAND), codec.content_type, {SCHEMA_VERSION_HEADER: 2}
+    )
+
+    with pytest.raises(MessageFormatError):
+        decode_message(message, CreateUser, schema_version=1)
+
+
+def test_unknown_content_type_is_rejected():
+    """
+    Test that a content type without a codec is a format error.
+    """
+    message = make_message(b"<user/>", "application/xml")
+
+    with pytest.raises(MessageFormatError):
+        decode_message(message, CreateUser, schema_version=1)
+
+
+def test_invalid_payload_raises_a_value_error():
+    """
+    Test that validation errors surface as pydantic's ValidationError, which
+    the consumer dead-letters instead of retrying.
+    """
+    message = make_message(b'{"name": "Test User"}', "application/json")
+
+    with pytest.raises(ValidationError) as error:
+        decode_message(message, CreateUser, schema_version=1)
+    assert isinstance(error.value, ValueError)
+
+
+@pytest.mark.parametrize(
+    "body, content_type, error",
+    [
+        (b"{not json", "application/json", ValidationError),
+        (b"\xc1\xc1", "application/msgpack", MessageFormatError),
+        (b"\x92\x01\x02", "application/msgpack", ValidationError),
+    ],
+)
+def test_undecodable_body_is_a_format_or_validation_error(body, content_type, error):
+    """
+    Test that a body the codec cannot parse raises MessageFormatError or
+    ValidationError, not whatever the parser raises, so the consumer can
+    tell it apart from transient errors.
+    """
+    message = make_message(body, content_type)
+
+    with pytest.raises(error):
+        decode_message(message, CreateUser, schema_version=1)
+
+
+def test_unknown_codec_name_is_rejected():
+    """
+    Test that a typo in MESSAGE_CODEC fails loudly.
+    """
+    with pytest.raises(ValueError):
+        codec_named("protobuf")
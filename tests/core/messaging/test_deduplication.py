@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.messaging.deduplication import CommandDeduplicator
+from src.core.messaging.processed_command import ProcessedCommand
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(ProcessedCommand.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_remembered_ids_are_reported_as_processed(session_factory):
+    """
+    Test that ids remembered in memory are found without a table.
+    """
+    deduplicator = CommandDeduplicator(max_size=10, ttl=60, use_table=False)
+    done, pending = str(uuid.uuid4()), str(uuid.uuid4())
+    deduplicator.remember([done])
+
+    async with session_factory() as session:
+        found = await deduplicator.processed(session, [done, pending, None, "x"])
+
+    assert found == {done}
+
+
+@pytest.mark.asyncio
+async def test_committed_ids_survive_a_restart_with_the_table(session_factory):
+    """
+    Test that an id recorded with the command's transaction is found by a new process.
+    """
+    command_id = str(uuid.uuid4())
+    async with session_factory() as session:
+        CommandDeduplicator(10, 60, use_table=True).record(session, [command_id])
+        await session.commit()
+
+    restarted = CommandDeduplicator(max_size=10, ttl=60, use_table=True)
+    async with session_factory() as session:
+        found = await restarted.processed(session, [command_id, str(uuid.uuid4())])
+
+    assert found == {command_id}
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_ids_are_not_processed(session_factory):
+    """
+    Test that an id whose transaction rolled back can still be processed.
+    """
+    deduplicator = CommandDeduplicator(max_size=10, ttl=60, use_table=True)
+    command_id = str(uuid.uuid4())
+    async with session_factory() as session:
+        deduplicator.record(session, [command_id])
+        await session.rollback()
+
+    async with session_factory() as session:
+        assert await deduplicator.processed(session, [command_id]) == set()
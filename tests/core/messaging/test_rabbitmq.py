@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aio_pika
+import pytest
+
+from src.core.messaging.rabbitmq import RabbitMQPublisher
+
+
+class FakeBroker:
+    """Hands out mocked confirm-mode channels and records what they publish."""
+
+    def __init__(self):
+        self.channels: list[MagicMock] = []
+        self.confirmed: list[bytes] = []
+        self.connection = MagicMock()
+        self.connection.is_closed = False
+        self.connection.close = AsyncMock()
+        self.connection.channel = AsyncMock(side_effect=self._open_channel)
+
+    async def _open_channel(self, publisher_confirms: bool) -> MagicMock:
+        assert publisher_confirms
+        exchange = MagicMock()
+        exchange.publish = self._publish
+        channel = MagicMock()
+        channel.is_closed = False
+        channel.close = AsyncMock()
+        channel.declare_queue = AsyncMock()
+        channel.declare_exchange = AsyncMock()
+        channel.get_exchange = AsyncMock(return_value=exchange)
+        channel.default_exchange = exchange
+        self.channels.append(channel)
+        return channel
+
+    async def _publish(self, message: aio_pika.Message, routing_key: str) -> None:
+        # Confirms come back in a different order than the messages went out
+        await asyncio.sleep(0.01 * (int(message.body) % 3))
+        self.confirmed.append(message.body)
+
+    def declared_queues(self) -> int:
+        return sum(channel.declare_queue.await_count for channel in self.channels)
+
+
+@pytest.fixture
+def broker():
+    fake = FakeBroker()
+    with patch(
+        "src.core.messaging.rabbitmq.aio_pika.connect_robust",
+        AsyncMock(return_value=fake.connection),
+    ):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_queue_is_declared_once(broker):
+    """
+    Test that a queue and an exchange are declared on the broker only the
+    first time, and that close forgets them so a reconnect declares again.
+    """
+    publisher = RabbitMQPublisher("amqp://test")
+    await publisher.connect(queues=["q", "q"])
+    await publisher.declare_queue("q")
+    await publisher.declare_exchange("events")
+    await publisher.declare_exchange("events")
+
+    assert broker.declared_queues() == 1
+    assert sum(c.declare_exchange.await_count for c in broker.channels) == 1
+
+    await publisher.close()
+    await publisher.connect(queues=["q"])
+
+    assert broker.declared_queues() == 2
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_one_channel_and_waits_for_every_confirm(broker):
+    """
+    Test that a batch is published on a single pooled channel and only
+    returns once the broker confirmed all of its messages.
+    """
+    publisher = RabbitMQPublisher("amqp://test")
+    await publisher.connect()
+    messages = [aio_pika.Message(body=str(i).encode()) for i in range(6)]
+
+    await publisher.publish_batch(messages, routing_key="q")
+
+    assert len(broker.channels) == 1
+    assert sorted(broker.confirmed) == sorted(message.body for message in messages)
+    await publisher.close()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_pools(broker):
+    """
+    Test that close closes the pooled channels and connections and that
+    the publisher refuses to publish until it is connected again.
+    """
+    publisher = RabbitMQPublisher("amqp://test")
+    await publisher.connect()
+    await publisher.warm_up(channels=3)
+
+    await publisher.close()
+
+    assert len(broker.channels) == 3
+    assert all(channel.close.await_count == 1 for channel in broker.channels)
+    assert broker.connection.close.await_count >= 1
+    with pytest.raises(RuntimeError):
+        await publisher.publish(aio_pika.Message(body=b"1"), routing_key="q")
@@ -0,0 +1,59 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aio_pika.exceptions import ChannelNotFoundEntity
+
+from src.core.messaging.resharding import pending_messages, queue_depth
+from src.core.messaging.retry import RetryTopology
+
+
+def make_connection(depths: dict[str, tuple[int, int]]) -> MagicMock:
+    """A connection whose queues report these (messages, consumers); others are missing."""
+
+    async def declare_queue(name, passive):
+        if name not in depths:
+            raise ChannelNotFoundEntity(name)
+        queue = MagicMock()
+        queue.declaration_result.message_count = depths[name][0]
+        queue.declaration_result.consumer_count = depths[name][1]
+        return queue
+
+    channel = MagicMock()
+    channel.is_closed = False
+    channel.close = AsyncMock()
+    channel.declare_queue = declare_queue
+    connection = MagicMock()
+    connection.channel = AsyncMock(return_value=channel)
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_missing_queue_counts_as_empty():
+    """
+    Test that a queue that was never declared holds nothing to drain.
+    """
+    assert await queue_depth(make_connection({}), "q.shard.0-of-2") == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_pending_messages_include_retry_queues():
+    """
+    Test that messages waiting out a retry delay keep a layout from being drained.
+    """
+    topology = RetryTopology("q", [1.0])
+    connection = make_connection({"q": (0, 1), topology.retry_queue(1.0): (2, 0)})
+
+    assert await pending_messages(connection, [topology]) == 2
+
+
+@pytest.mark.asyncio
+async def test_consumers_count_when_waiting_for_other_workers():
+    """
+    Test that a queue still consumed may hold unacked messages, so it is not drained.
+    """
+    connection = make_connection({"q": (0, 1)})
+
+    topologies = [RetryTopology("q", [])]
+
+    assert await pending_messages(connection, topologies) == 0
+    assert await pending_messages(connection, topologies, count_consumers=True) == 1
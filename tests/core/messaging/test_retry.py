@@ -0,0 +1,148 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from src.contexts.users.domain.create_user import CreateUser
+from src.core.messaging.codecs import MessageFormatError
+from src.core.messaging.retry import (
+    ATTEMPT_HEADER,
+    ERROR_TYPE_HEADER,
+    MessageRetrier,
+    RetryTopology,
+    backoff_delays,
+    replay_copy,
+)
+from src.user_consumer import NON_RETRYABLE_ERRORS
+
+
+class PermanentError(Exception):
+    pass
+
+
+def make_message(headers: dict) -> MagicMock:
+    message = MagicMock()
+    message.body = b"{}"
+    message.headers = headers
+    message.content_type = "application/json"
+    message.message_id = "cmd-1"
+    message.correlation_id = "cmd-1"
+    message.timestamp = None
+    message.type = None
+    return message
+
+
+def make_retrier() -> tuple[MessageRetrier, AsyncMock]:
+    publisher = MagicMock()
+    publisher.publish = AsyncMock()
+    topology = RetryTopology("work", backoff_delays(3, base_delay=1, factor=4))
+    return MessageRetrier(publisher, topology, (PermanentError,)), publisher
+
+
+def test_backoff_delays_grow_by_the_factor():
+    """
+    Test that there is one delay per retry, each `factor` times the previous.
+    """
+    assert backoff_delays(4, base_delay=0.5, factor=2) == (0.5, 1.0, 2.0)
+
+
+@pytest.mark.asyncio
+async def test_retryable_error_goes_to_the_retry_queue_of_its_attempt():
+    """
+    Test that a failed second attempt waits in the second retry queue as attempt 3.
+    """
+    retrier, publisher = make_retrier()
+
+    outcome = await retrier.retry_or_dead_letter(
+        make_message({ATTEMPT_HEADER: 2}), ConnectionError("db down")
+    )
+
+    assert outcome == "retried"
+    message, routing_key = publisher.publish.call_args.args
+    assert routing_key == "work.retry.4000ms"
+    assert message.headers[ATTEMPT_HEADER] == 3
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_is_dead_lettered_on_first_attempt():
+    """
+    Test that a non-retryable error skips the retry queues.
+    """
+    retrier, publisher = make_retrier()
+
+    outcome = await retrier.retry_or_dead_letter(
+        make_message({}), PermanentError("bad")
+    )
+
+    assert outcome == "dead_lettered"
+    message = publisher.publish.call_args.args[0]
+    assert publisher.publish.call_args.kwargs["exchange_name"] == "work.dlx"
+    assert message.headers[ERROR_TYPE_HEADER] == "PermanentError"
+
+
+@pytest.mark.asyncio
+async def test_message_out_of_attempts_is_dead_lettered():
+    """
+    Test that the last allowed attempt is dead-lettered instead of retried.
+    """
+    retrier, publisher = make_retrier()
+
+    outcome = await retrier.retry_or_dead_letter(
+        make_message({ATTEMPT_HEADER: 3}), ConnectionError("db down")
+    )
+
+    assert outcome == "dead_lettered"
+    assert publisher.publish.call_args.kwargs["exchange_name"] == "work.dlx"
+
+
+def test_replay_copy_starts_over_as_a_first_attempt():
+    """
+    Test that a replayed message drops its attempt and error headers but keeps the rest.
+    """
+    replayed = replay_copy(
+        make_message(
+            {ATTEMPT_HEADER: 3, ERROR_TYPE_HEADER: "PermanentError", "x-other": "1"}
+        )
+    )
+
+    assert replayed.headers == {"x-other": "1"}
+    assert replayed.message_id == "cmd-1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("attempt", ["two", b"\xff", None, [], 0, -5])
+async def test_malformed_attempt_header_counts_as_a_first_attempt(attempt):
+    """
+    Test that an attempt header that is not a positive integer neither fails
+    the retry (which would requeue the message forever) nor skips the backoff.
+    """
+    retrier, publisher = make_retrier()
+
+    outcome = await retrier.retry_or_dead_letter(
+        make_message({ATTEMPT_HEADER: attempt}), ConnectionError("db down")
+    )
+
+    assert outcome == "retried"
+    message, routing_key = publisher.publish.call_args.args
+    assert routing_key == "work.retry.1000ms"
+    assert message.headers[ATTEMPT_HEADER] == 2
+
+
+def test_only_decode_and_validation_errors_skip_the_retries():
+    """
+    Test that the consumer dead-letters undecodable and invalid commands at
+    once, but retries a ValueError or TypeError raised on a transient path.
+    """
+    publisher = MagicMock()
+    retrier = MessageRetrier(
+        publisher, RetryTopology("work", [1]), NON_RETRYABLE_ERRORS
+    )
+    try:
+        CreateUser.model_validate({})
+    except ValidationError as e:
+        invalid = e
+
+    assert not retrier.is_retryable(MessageFormatError("not json"))
+    assert not retrier.is_retryable(invalid)
+    assert retrier.is_retryable(ValueError("connection was closed"))
+    assert retrier.is_retryable(TypeError("driver bug"))
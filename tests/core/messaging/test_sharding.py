@@ -0,0 +1,58 @@
+from src.core.messaging.sharding import (
+    owned_shards,
+    shard_for,
+    shard_key,
+    shard_queue_arguments,
+    shard_queue_name,
+    shard_queue_names,
+)
+
+
+def test_same_email_always_maps_to_the_same_shard():
+    """
+    Test that the shard depends only on the normalized email.
+    """
+    shard = shard_for(shard_key("Test@Example.com "), 8)
+
+    assert shard == shard_for(shard_key("test@example.com"), 8)
+    assert 0 <= shard < 8
+
+
+def test_emails_spread_over_every_shard():
+    """
+    Test that the hash spreads keys roughly evenly.
+    """
+    counts = [0] * 4
+    for i in range(4000):
+        counts[shard_for(shard_key(f"user{i}@example.com"), 4)] += 1
+
+    assert all(800 < count < 1200 for count in counts)
+
+
+def test_single_shard_keeps_the_original_queue():
+    """
+    Test that K=1 publishes to and declares the unsharded queue as before.
+    """
+    assert shard_for("test@example.com", 1) == 0
+    assert shard_queue_names("user_creation_queue", 1) == ["user_creation_queue"]
+    assert shard_queue_arguments(1) is None
+
+
+def test_shard_queues_have_a_single_active_consumer():
+    """
+    Test that shard queues are named per shard and consumed one at a time.
+    """
+    assert shard_queue_name("q", 2, 4) == "q.shard.2-of-4"
+    assert not set(shard_queue_names("q", 4)) & set(shard_queue_names("q", 8))
+    assert shard_queue_arguments(4) == {"x-single-active-consumer": True}
+
+
+def test_every_shard_is_owned_by_exactly_one_worker():
+    """
+    Test that the shards are split across workers without overlap.
+    """
+    owned = [owned_shards(8, worker, 3) for worker in range(3)]
+
+    assert sorted(shard for shards in owned for shard in shards) == list(range(8))
+    assert owned_shards(8, None, 1) == list(range(8))
+    assert owned_shards(1, 2, 3) == [0]
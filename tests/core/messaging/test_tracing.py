@@ -0,0 +1,71 @@
+import uuid
+from unittest.mock import MagicMock
+
+from src.core.messaging.tracing import (
+    PUBLISHED_AT_HEADER,
+    CommandTrace,
+    trace_properties,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_message(headers: dict, message_id: str = "cmd-1") -> MagicMock:
+    message = MagicMock()
+    message.headers = headers
+    message.message_id = message_id
+    message.correlation_id = "batch-1"
+    message.timestamp = None
+    return message
+
+
+def test_trace_properties_default_the_correlation_id_to_the_message_id():
+    """
+    Test that a single command is correlated with itself and carries its publish time.
+    """
+    command_id = uuid.uuid4()
+
+    properties = trace_properties(command_id)
+
+    assert properties["message_id"] == str(command_id)
+    assert properties["correlation_id"] == str(command_id)
+    assert isinstance(properties["headers"][PUBLISHED_AT_HEADER], float)
+
+
+def test_finish_reports_queue_wait_processing_and_total_latency():
+    """
+    Test that the trace splits the command latency into queue wait and processing.
+    """
+    clock = FakeClock(100.0)
+    message = make_message({PUBLISHED_AT_HEADER: 99.5})
+    trace = CommandTrace.start(message, "test_queue", clock=clock)
+    clock.now = 100.25
+
+    record = trace.finish("created")
+
+    assert record["command_id"] == "cmd-1"
+    assert record["correlation_id"] == "batch-1"
+    assert record["queue_wait_ms"] == 500.0
+    assert record["processing_ms"] == 250.0
+    assert record["total_ms"] == 750.0
+
+
+def test_finish_without_a_publish_time_only_reports_processing():
+    """
+    Test that messages from older publishers are traced without a queue wait.
+    """
+    clock = FakeClock(100.0)
+    trace = CommandTrace.start(make_message({}), "test_queue", clock=clock)
+    clock.now = 100.1
+
+    record = trace.finish("invalid")
+
+    assert "queue_wait_ms" not in record
+    assert "total_ms" not in record
+    assert round(record["processing_ms"]) == 100
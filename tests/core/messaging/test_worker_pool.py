@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.messaging.consumer_metrics import in_flight_messages, settled_messages
+from src.core.messaging.worker_pool import OrderedAckWorkerPool
+
+
+def make_message(name: str, acks: list) -> MagicMock:
+    message = MagicMock()
+    message.name = name
+    message.ack = AsyncMock(side_effect=lambda: acks.append(("ack", name)))
+    message.reject = AsyncMock(
+        side_effect=lambda requeue: acks.append(("reject", name))
+    )
+    return message
+
+
+@pytest.mark.asyncio
+async def test_messages_are_acked_in_order_when_handlers_finish_out_of_order():
+    """
+    Test that a slow first message holds back the acks of faster later messages.
+    """
+    acks = []
+    delays = {"first": 0.05, "second": 0.0, "third": 0.01}
+
+    async def handler(message):
+        await asyncio.sleep(delays[message.name])
+
+    pool = OrderedAckWorkerPool(handler, concurrency=3)
+    for name in delays:
+        await pool.submit(make_message(name, acks))
+    await pool.drain()
+
+    assert acks == [("ack", "first"), ("ack", "second"), ("ack", "third")]
+    assert pool.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """
+    Test that no more than `concurrency` handlers run at the same time.
+    """
+    running = 0
+    max_running = 0
+
+    async def handler(message):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    pool = OrderedAckWorkerPool(handler, concurrency=2)
+    for i in range(6):
+        await pool.submit(make_message(str(i), []))
+    await pool.drain()
+
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_rejects_message_without_blocking_others():
+    """
+    Test that an unexpected handler error rejects only that message.
+    """
+    acks = []
+
+    async def handler(message):
+        if message.name == "bad":
+            raise RuntimeError("boom")
+
+    pool = OrderedAckWorkerPool(handler, concurrency=2)
+    for name in ("bad", "good"):
+        await pool.submit(make_message(name, acks))
+    await pool.drain()
+
+    assert acks == [("reject", "bad"), ("ack", "good")]
+
+
+@pytest.mark.asyncio
+async def test_settled_messages_are_counted_by_action():
+    """
+    Test that acks and rejects are counted and nothing is left in flight.
+    """
+    acks = []
+    ack_counter = settled_messages.labels("ack")
+    reject_counter = settled_messages.labels("reject")
+    acked_before, rejected_before = ack_counter.value, reject_counter.value
+
+    async def handler(message):
+        if message.name == "bad":
+            raise ValueError("boom")
+
+    pool = OrderedAckWorkerPool(handler, concurrency=2)
+    for name in ("good", "bad", "also good"):
+        await pool.submit(make_message(name, acks))
+    await pool.drain()
+
+    assert ack_counter.value - acked_before == 2
+    assert reject_counter.value - rejected_before == 1
+    assert in_flight_messages.labels().value == 0
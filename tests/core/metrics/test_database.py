@@ -0,0 +1,66 @@
+import gc
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.metrics.database import collect_pools, instrument_engine
+from src.core.metrics.registry import registry
+
+
+@pytest.mark.asyncio
+async def test_pools_of_every_engine_form_one_family():
+    """
+    Test that /metrics has a single db_pool_connections family for all engines.
+    """
+    engines = [
+        create_async_engine("sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool)
+        for _ in range(2)
+    ]
+    instrument_engine(engines[0], "test_write")
+    instrument_engine(engines[1], "test_read")
+
+    lines = registry.render().splitlines()
+
+    assert lines.count("# TYPE db_pool_connections gauge") == 1
+    assert any('engine="test_write"' in line for line in lines)
+    assert any('engine="test_read"' in line for line in lines)
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_dropped_engines_are_no_longer_collected():
+    """
+    Test that the pools of engines that were thrown away are not exported.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool)
+    instrument_engine(engine, "test_dropped")
+    await engine.dispose()
+    del engine
+    gc.collect()
+
+    samples = [sample for family in collect_pools() for sample in family[3]]
+
+    assert all(labels["engine"] != "test_dropped" for _, labels, _ in samples)
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_timing_state_behind():
+    """
+    Test that a statement that errors does not grow per-connection state.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool)
+    instrument_engine(engine, "test_errors")
+
+    async with engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await connection.execute(text("SELECT * FROM missing_table"))
+        await connection.execute(text("SELECT 1"))
+        info = (await connection.get_raw_connection()).info
+
+    assert "query_started_at" not in info
+    await engine.dispose()
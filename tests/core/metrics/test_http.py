@@ -0,0 +1,35 @@
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from src.core.metrics.http import MetricsMiddleware, http_request_seconds
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_with_the_matched_route_template():
+    """
+    Test that requests are labelled with the full template of the route they
+    matched, prefix included, and that unknown paths share a single label.
+    """
+    router = APIRouter()
+
+    @router.get("/{item_id}/tags")
+    async def tags(item_id: str) -> list:
+        return []
+
+    app = FastAPI()
+    app.include_router(router, prefix="/metric-test-items")
+    app.add_middleware(MetricsMiddleware)
+    matched = http_request_seconds.labels(
+        "GET", "/metric-test-items/{item_id}/tags", "200"
+    )
+    unmatched = http_request_seconds.labels("GET", "unmatched", "404")
+    before = matched.count, unmatched.count
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        await client.get("/metric-test-items/1/tags")
+        await client.get("/metric-test-items/2/tags")
+        await client.get("/nowhere/3")
+
+    assert (matched.count, unmatched.count) == (before[0] + 2, before[1] + 1)
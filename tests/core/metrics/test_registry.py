@@ -0,0 +1,117 @@
+import pytest
+
+from src.core.metrics.registry import MetricsRegistry, merge_families
+from src.core.metrics.use_cases import timed_use_case, use_case_seconds
+
+
+def test_histogram_is_rendered_with_cumulative_buckets():
+    """
+    Test that observations land in cumulative buckets with their sum and count.
+    """
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "request_seconds", "Request latency.", ["route"], buckets=(0.1, 1.0)
+    )
+    histogram.labels("/users").observe(0.05)
+    histogram.labels("/users").observe(0.5)
+    histogram.labels("/users").observe(2)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE request_seconds histogram" in lines
+    assert 'request_seconds_bucket{route="/users",le="0.1"} 1' in lines
+    assert 'request_seconds_bucket{route="/users",le="1"} 2' in lines
+    assert 'request_seconds_bucket{route="/users",le="+Inf"} 3' in lines
+    assert 'request_seconds_sum{route="/users"} 2.55' in lines
+    assert 'request_seconds_count{route="/users"} 3' in lines
+
+
+def test_counters_gauges_and_collectors_are_rendered():
+    """
+    Test that counters, gauges and scrape-time collectors are all exported.
+    """
+    registry = MetricsRegistry()
+    registry.counter("messages_total", "Messages.", ["queue"]).labels("q").inc(3)
+    registry.gauge("in_flight", "In flight.").set(2)
+    registry.register_collector(
+        lambda: [("queue_depth", "gauge", "Depth.", [("queue_depth", {}, 7)])]
+    )
+
+    lines = registry.render().splitlines()
+
+    assert 'messages_total{queue="q"} 3' in lines
+    assert "in_flight 2" in lines
+    assert "queue_depth 7" in lines
+
+
+def test_registering_a_metric_twice_returns_the_same_metric():
+    """
+    Test that a metric declared by two modules is shared, not duplicated.
+    """
+    registry = MetricsRegistry()
+
+    assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+    with pytest.raises(ValueError):
+        registry.gauge("a_total", "A.")
+
+
+@pytest.mark.asyncio
+async def test_use_case_timing_records_success_and_error():
+    """
+    Test that timed use cases are labelled with their class and outcome.
+    """
+
+    class FailingUseCase:
+        async def execute(self, fail: bool) -> str:
+            if fail:
+                raise ValueError("boom")
+            return "done"
+
+    use_case = timed_use_case(FailingUseCase())
+
+    assert await use_case.execute(False) == "done"
+    with pytest.raises(ValueError):
+        await use_case.execute(True)
+
+    assert use_case_seconds.labels("FailingUseCase", "success").count == 1
+    assert use_case_seconds.labels("FailingUseCase", "error").count == 1
+
+
+def test_merge_families_adds_up_processes_by_label_set():
+    """
+    Test that snapshots of several processes are summed per sample and label
+    set, including label sets only one of them has seen.
+    """
+    first = MetricsRegistry()
+    second = MetricsRegistry()
+    first.counter("messages_total", "Messages.", ["outcome"]).labels("created").inc(3)
+    second_counter = second.counter("messages_total", "Messages.", ["outcome"])
+    second_counter.labels("created").inc(2)
+    second_counter.labels("failed").inc()
+
+    [(name, kind, _, samples)] = merge_families([first.collect(), second.collect()])
+
+    assert (name, kind) == ("messages_total", "counter")
+    assert sorted((labels["outcome"], value) for _, labels, value in samples) == [
+        ("created", 5.0),
+        ("failed", 1.0),
+    ]
+
+
+def test_families_of_the_same_name_are_rendered_once():
+    """
+    Test that two collectors of one family produce a single HELP and TYPE line.
+    """
+    registry = MetricsRegistry()
+    for engine in ("write", "read"):
+        registry.register_collector(
+            lambda engine=engine: [
+                ("pool", "gauge", "Pool.", [("pool", {"engine": engine}, 1)])
+            ]
+        )
+
+    lines = registry.render().splitlines()
+
+    assert lines.count("# TYPE pool gauge") == 1
+    assert 'pool{engine="write"} 1' in lines
+    assert 'pool{engine="read"} 1' in lines
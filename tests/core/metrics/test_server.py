@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from src.core.metrics.registry import MetricsRegistry
+from src.core.metrics.server import MetricsServer
+
+
+async def get(port: int, path: str) -> tuple[str, bytes]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), body
+
+
+@pytest.mark.asyncio
+async def test_serves_the_registry_on_metrics():
+    """
+    Test that GET /metrics returns the rendered registry.
+    """
+    metrics = MetricsRegistry()
+    metrics.counter("jobs_total", "Jobs.").inc(3)
+    server = MetricsServer("127.0.0.1", 0, metrics=metrics)
+    await server.start()
+    try:
+        status, body = await get(server.port, "/metrics")
+    finally:
+        await server.stop()
+
+    assert status == "HTTP/1.1 200 OK"
+    assert b"jobs_total 3" in body
+
+
+@pytest.mark.asyncio
+async def test_health_reflects_the_check_and_unknown_paths_are_404():
+    """
+    Test that /health answers 503 while the check fails and that other paths are 404.
+    """
+    healthy = False
+    server = MetricsServer("127.0.0.1", 0, is_healthy=lambda: healthy)
+    await server.start()
+    try:
+        down, _ = await get(server.port, "/health")
+        healthy = True
+        up, _ = await get(server.port, "/health")
+        missing, _ = await get(server.port, "/nope")
+    finally:
+        await server.stop()
+
+    assert down == "HTTP/1.1 503 Service Unavailable"
+    assert up == "HTTP/1.1 200 OK"
+    assert missing == "HTTP/1.1 404 Not Found"
@@ -0,0 +1,58 @@
+from src.core.metrics.throughput import ThroughputMeter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_is_events_per_second_over_the_window():
+    """
+    Test that the rate averages the recorded events over the window once
+    the meter is older than it.
+    """
+    clock = FakeClock()
+    meter = ThroughputMeter(window=10, clock=clock)
+    meter.record(100)
+    clock.now += 20
+    for _ in range(5):
+        meter.record(4)
+        clock.now += 1
+
+    assert meter.rate() == 2.0
+
+
+def test_events_older_than_the_window_are_dropped():
+    """
+    Test that events leave the rate once they fall out of the window.
+    """
+    clock = FakeClock()
+    meter = ThroughputMeter(window=10, clock=clock)
+    meter.record(50)
+    clock.now += 5
+    meter.record(10)
+    clock.now += 6
+
+    assert meter.rate() == 1.0
+
+
+def test_young_meter_is_measured_over_its_lifetime():
+    """
+    Test that a meter younger than the window divides by its own age,
+    instead of reporting a fraction of the real rate until the window fills.
+    """
+    clock = FakeClock()
+    meter = ThroughputMeter(window=60, clock=clock)
+    assert meter.rate() == 0.0
+
+    meter.record(3)
+    assert meter.rate() == 3.0
+
+    for _ in range(5):
+        meter.record(4)
+        clock.now += 1
+
+    assert meter.rate() == 23 / 5
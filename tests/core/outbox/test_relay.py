@@ -0,0 +1,132 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.outbox.outbox_message import OutboxMessage
+from src.core.outbox.relay import OutboxRelay
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(OutboxMessage.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_messages(session_factory, destinations: list[tuple[str, str]]):
+    async with session_factory() as session:
+        await session.execute(
+            insert(OutboxMessage).values(
+                [
+                    {
+                        "message_id": uuid.uuid4(),
+                        "exchange": exchange,
+                        "routing_key": routing_key,
+                        "message_type": "test.event",
+                        "body": f'{{"n": {n}}}',
+                    }
+                    for n, (exchange, routing_key) in enumerate(destinations)
+                ]
+            )
+        )
+        await session.commit()
+
+
+def make_publisher() -> MagicMock:
+    publisher = MagicMock()
+    publisher.declare_exchange = AsyncMock()
+    publisher.publish_batch = AsyncMock()
+    return publisher
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_order_and_marks_sent(session_factory):
+    """
+    Test that consecutive messages for one destination go out as one batch, in id order.
+    """
+    await add_messages(
+        session_factory, [("events", "a"), ("events", "a"), ("other", "b")]
+    )
+    publisher = make_publisher()
+    relay = OutboxRelay(session_factory, publisher, batch_size=10, poll_interval=1)
+
+    relayed = await relay.relay_batch()
+
+    assert relayed == 3
+    batches = [
+        (call.kwargs["exchange_name"], [m.body for m in call.args[0]])
+        for call in publisher.publish_batch.call_args_list
+    ]
+    assert batches == [
+        ("events", [b'{"n": 0}', b'{"n": 1}']),
+        ("other", [b'{"n": 2}']),
+    ]
+    assert await relay.backlog() == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_relay_takes_one_batch_at_a_time(session_factory):
+    """
+    Test that a backlog larger than the batch size is relayed over several calls.
+    """
+    await add_messages(session_factory, [("events", "a")] * 5)
+    relay = OutboxRelay(
+        session_factory, make_publisher(), batch_size=2, poll_interval=1
+    )
+
+    assert [await relay.relay_batch() for _ in range(4)] == [2, 2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_leaves_messages_unsent(session_factory):
+    """
+    Test that messages whose publish fails are relayed again on the next batch.
+    """
+    await add_messages(session_factory, [("events", "a"), ("events", "a")])
+    publisher = make_publisher()
+    publisher.publish_batch.side_effect = [ConnectionError("broker down"), None]
+    relay = OutboxRelay(session_factory, publisher, batch_size=10, poll_interval=1)
+
+    with pytest.raises(ConnectionError):
+        await relay.relay_batch()
+    count, age = await relay.backlog()
+    assert count == 2
+    assert age is not None
+
+    assert await relay.relay_batch() == 2
+    async with session_factory() as session:
+        sent = await session.scalars(select(OutboxMessage.sent_at))
+        assert all(sent_at is not None for sent_at in sent)
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_old_sent_messages_in_batches(session_factory):
+    """
+    Test that only expired sent messages are deleted, a batch at a time.
+    """
+    await add_messages(session_factory, [("events", "a")] * 5)
+    async with session_factory() as session:
+        ids = list(await session.scalars(select(OutboxMessage.id)))
+        long_ago = datetime.now(timezone.utc) - timedelta(days=2)
+        await session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids[:4]))
+            .values(sent_at=long_ago)
+        )
+        await session.commit()
+    relay = OutboxRelay(
+        session_factory, make_publisher(), batch_size=10, poll_interval=1
+    )
+
+    assert await relay.purge_sent(retention=3600, batch_size=3) == 4
+
+    async with session_factory() as session:
+        assert list(await session.scalars(select(OutboxMessage.id))) == ids[4:]
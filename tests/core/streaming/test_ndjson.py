@@ -0,0 +1,36 @@
+import pytest
+
+from src.core.streaming.ndjson import iter_ndjson_lines
+
+
+async def chunks_of(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(lines) -> list:
+    return [line async for line in lines]
+
+
+@pytest.mark.asyncio
+async def test_lines_are_split_across_chunk_boundaries():
+    """
+    Test that lines split over several chunks are reassembled.
+    """
+    lines = iter_ndjson_lines(
+        chunks_of(b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}'), max_line_bytes=100
+    )
+
+    assert await collect(lines) == [b'{"a": 1}', b'{"b": 2}', b"", b'{"c": 3}']
+
+
+@pytest.mark.asyncio
+async def test_oversized_lines_are_reported_as_none():
+    """
+    Test that an oversized line is skipped without buffering it, and later lines still parse.
+    """
+    lines = iter_ndjson_lines(
+        chunks_of(b"x" * 6, b"x" * 6, b"xx\nok\n", b"y" * 20), max_line_bytes=10
+    )
+
+    assert await collect(lines) == [None, b"ok", None]
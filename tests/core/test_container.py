@@ -0,0 +1,116 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.container import Container
+from src.core.database.database import warm_up_engine
+
+
+def make_engine(tmp_path, name: str):
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}", pool_size=3)
+
+
+def make_container(tmp_path, publisher=None) -> Container:
+    return Container(
+        write_engine=make_engine(tmp_path, "write.db"),
+        read_engine=make_engine(tmp_path, "read.db"),
+        publisher=publisher or AsyncMock(),
+        password_hasher=AsyncMock(close=MagicMock()),
+        user_caches=MagicMock(),
+        email_filter=MagicMock(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_warm_up_engine_leaves_connections_open_in_the_pool(tmp_path):
+    """
+    Test that warming up opens several connections at once, no more than
+    the pool keeps, and leaves them checked in for the first requests.
+    """
+    engine = make_engine(tmp_path, "warm.db")
+
+    await warm_up_engine(engine, connections=10)
+
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_container_is_ready_only_after_warm_up(tmp_path):
+    """
+    Test that the container reports ready once the database, the broker and
+    the hashing workers have been warmed up, and not before.
+    """
+    container = make_container(tmp_path)
+    assert not container.ready
+
+    await container.warm_up(
+        read_connections=2, queues=["user_creation_queue"], channels=4
+    )
+
+    assert container.ready
+    assert container.read_engine.pool.checkedin() == 2
+    container.publisher.warm_up.assert_awaited_once_with(4)
+    container.publisher.declare_queue.assert_awaited_once_with(
+        "user_creation_queue", None
+    )
+    container.password_hasher.warm_up.assert_awaited_once()
+    await container.close()
+    assert not container.ready
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_until_the_broker_is_up(tmp_path):
+    """
+    Test that a failing step is retried instead of leaving the process
+    half-started, and that the container stays not ready meanwhile.
+    """
+    publisher = AsyncMock()
+    publisher.warm_up.side_effect = [ConnectionError("broker down"), None]
+    container = make_container(tmp_path, publisher)
+
+    await container.warm_up(channels=1, retry_interval=0)
+
+    assert publisher.warm_up.await_count == 2
+    assert container.ready
+    await container.close()
+
+
+@pytest.mark.asyncio
+async def test_subscribers_start_under_the_warm_up_retry(tmp_path):
+    """
+    Test that an event subscriber whose broker is not up yet is retried with
+    the rest of the warm-up, and that /ready waits for it.
+    """
+    subscriber = AsyncMock(side_effect=[ConnectionError("broker down"), None])
+    container = make_container(tmp_path)
+
+    await container.warm_up(subscribers=[subscriber], retry_interval=0)
+
+    assert subscriber.await_count == 2
+    assert container.ready
+    await container.close()
+
+
+@pytest.mark.asyncio
+async def test_container_without_a_read_engine(tmp_path):
+    """
+    Test that a consumer's container, built without a read engine, warms up
+    and closes its write engine alone.
+    """
+    container = Container(
+        write_engine=make_engine(tmp_path, "write.db"),
+        read_engine=None,
+        publisher=AsyncMock(),
+        password_hasher=AsyncMock(close=MagicMock()),
+        user_caches=MagicMock(),
+        email_filter=MagicMock(),
+    )
+
+    await container.warm_up(read_connections=2, write_connections=2)
+
+    assert container.read_sessions is None
+    assert container.write_engine.pool.checkedin() == 2
+    await container.close()
@@ -0,0 +1,87 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+from src.core.supervisor import WorkerSupervisor
+
+FORK = multiprocessing.get_context("fork")
+
+
+def reporting_worker(index, stats_queue):
+    families = [("jobs_total", "counter", "Jobs.", [("jobs_total", {}, 5.0)])]
+    stats_queue.put((index, os.getpid(), True, families))
+    while True:
+        time.sleep(0.1)
+
+
+def crashing_worker(index, stats_queue):
+    sys.exit(3)
+
+
+async def wait_until(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.05)
+
+
+def test_restart_delay_backs_off_up_to_the_maximum():
+    """
+    Test that each consecutive crash doubles the wait before the restart,
+    without going over the configured maximum.
+    """
+    supervisor = WorkerSupervisor(
+        crashing_worker, 1, restart_base_delay=1, restart_max_delay=5, context=FORK
+    )
+
+    delays = [supervisor.restart_delay(failures) for failures in range(1, 6)]
+
+    assert delays == [1, 2, 4, 5, 5]
+
+
+@pytest.mark.asyncio
+async def test_supervisor_sums_worker_metrics_and_stops_them():
+    """
+    Test that every worker's metrics are added up, that the supervisor is
+    healthy once all of them reported, and that stopping terminates them.
+    """
+    supervisor = WorkerSupervisor(reporting_worker, 2, shutdown_timeout=5, context=FORK)
+    stop = asyncio.Event()
+    running = asyncio.create_task(supervisor.run(stop))
+
+    await wait_until(supervisor.is_healthy)
+    rendered = supervisor.metrics.render()
+    stop.set()
+    await asyncio.wait_for(running, timeout=10)
+
+    assert "jobs_total 10" in rendered
+    assert "consumer_workers_alive 2" in rendered
+    assert not any(slot.alive for slot in supervisor.slots)
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_is_restarted():
+    """
+    Test that a worker that exits is started again after its backoff delay,
+    and that the supervisor reports unhealthy meanwhile.
+    """
+    supervisor = WorkerSupervisor(
+        crashing_worker,
+        1,
+        restart_base_delay=0.01,
+        restart_max_delay=0.01,
+        context=FORK,
+    )
+    stop = asyncio.Event()
+    running = asyncio.create_task(supervisor.run(stop))
+
+    await wait_until(lambda: supervisor.slots[0].restarts >= 2)
+    assert not supervisor.is_healthy()
+    stop.set()
+    await asyncio.wait_for(running, timeout=10)
+
+    assert 'consumer_worker_restarts_total{worker="0"}' in supervisor.metrics.render()
@@ -0,0 +1,37 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.messaging.sharding import shard_queue_name
+from src.core.messaging.tracing import command_processing_seconds
+from src.user_consumer import ConsumerDependencies, handle_create_user
+
+
+@pytest.mark.asyncio
+async def test_traces_are_labelled_with_the_consumed_shard_queue():
+    """
+    Test that a command is traced under the shard queue it was consumed
+    from, not the base creation queue every shard shares.
+    """
+    queue = shard_queue_name("user_creation_queue", 1, 4)
+    message = MagicMock(headers={}, timestamp=None, body=b"not json")
+    message.message_id = message.correlation_id = str(uuid.uuid4())
+    message.content_type = "application/json"
+    retrier = MagicMock(retry_or_dead_letter=AsyncMock(return_value="dead_lettered"))
+    dependencies = ConsumerDependencies(
+        queue=queue,
+        password_hasher=MagicMock(),
+        email_filter=MagicMock(),
+        retrier=retrier,
+        deduplicator=MagicMock(),
+        status_publisher=MagicMock(),
+        sessions=MagicMock(),
+    )
+    processed = command_processing_seconds.labels(queue, "dead_lettered")
+    before = processed.count
+
+    await handle_create_user(message, dependencies)
+
+    assert processed.count == before + 1
+    retrier.retry_or_dead_letter.assert_awaited_once()